@@ -113,7 +113,7 @@ SKILL_TO_SCRIPTS = {
     "create_proposal": ["create_proposal.py"],
     "video_editor": [
         "video_editor_pipeline.py", "jump_cut_vad_singlepass.py",
-        "insert_3d_transition.py"
+        "insert_3d_transition.py", "model_registry.py"
     ],
     "jump_cut_vad": [],
     "business_planning": [
@@ -125,7 +125,7 @@ SKILL_TO_SCRIPTS = {
         "compile_review_paper.py"
     ],
     "meeting_minutes": [
-        "transcribe_audio.py", "generate_meeting_minutes.py",
+        "transcribe_audio.py", "model_registry.py", "generate_meeting_minutes.py",
         "create_google_doc.py", "update_google_doc.py"
     ],
     "indian_legal_compliance": [
@@ -149,7 +149,7 @@ SKILL_TO_SCRIPTS = {
         "instantly_create_campaigns.py", "instantly_autoreply.py",
         "welcome_client_emails.py", "generate_pdf.py"
     ],
-    "memory_management": ["memory_db.py", "memory_bank.py"],
+    "memory_management": ["memory_db.py", "memory_db_client.py", "memory_bank.py"],
     "infrastructure_tools": [
         "tool_registry.py", "tool_registry.json", "task_graph.py",
         "execution_trace.py", "confirm_action.py"
@@ -239,7 +239,7 @@ def copy_shared_scripts(ws: Path) -> int:
             shutil.copy2(src, dest / sname)
             copied += 1
     # Also copy core infra scripts
-    for sname in ["memory_db.py", "memory_bank.py", "tool_registry.py",
+    for sname in ["memory_db.py", "memory_db_client.py", "memory_bank.py", "tool_registry.py",
                    "task_graph.py", "execution_trace.py", "confirm_action.py"]:
         src = EXECUTION_DIR / sname
         if src.exists() and not (dest / sname).exists():
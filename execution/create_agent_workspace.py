@@ -1035,7 +1035,7 @@ def create_agent_workspace(
     if scripts != "ALL":
         scripts = scripts.copy()
         # Always include core infrastructure scripts
-        for infra_script in ["memory_db.py", "memory_bank.py", "tool_registry.py", "task_graph.py", "confirm_action.py", "execution_trace.py"]:
+        for infra_script in ["memory_db.py", "memory_db_client.py", "memory_bank.py", "tool_registry.py", "task_graph.py", "confirm_action.py", "execution_trace.py"]:
             if infra_script not in scripts:
                 scripts.append(infra_script)
         if additional_scripts:
@@ -14,10 +14,13 @@ Usage:
 """
 
 import os
+import re
 import sys
 import json
+import sqlite3
 import argparse
 import hashlib
+import threading
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
@@ -41,6 +44,9 @@ SCOPES = [
 # Default sheet name for leads
 DEFAULT_SHEET_NAME = "GMaps Lead Database"
 
+# Local lead_id index (SQLite), kept in step with the sheet so dedup never re-reads column A
+LEAD_INDEX_PATH = os.getenv("GMAPS_LEAD_INDEX", ".tmp/gmaps_lead_index.db")
+
 # Lead schema - columns for the Google Sheet
 LEAD_COLUMNS = [
     "lead_id",
@@ -309,14 +315,126 @@ def get_or_create_sheet(sheet_url: str = None, sheet_name: str = None) -> tuple:
     return spreadsheet, worksheet, is_new
 
 
+_lead_index_conn = None
+_lead_index_lock = threading.Lock()
+
+
+def _lead_index() -> sqlite3.Connection:
+    """Open (once) the local lead_id index. Shared across threads under _lead_index_lock."""
+    global _lead_index_conn
+    if _lead_index_conn is None:
+        os.makedirs(os.path.dirname(LEAD_INDEX_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(LEAD_INDEX_PATH, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS lead_ids (
+                sheet_key TEXT NOT NULL,
+                lead_id TEXT NOT NULL,
+                PRIMARY KEY (sheet_key, lead_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS sync_state (
+                sheet_key TEXT PRIMARY KEY,
+                synced_rows INTEGER NOT NULL,  -- last sheet row reflected in lead_ids
+                last_value TEXT NOT NULL       -- column A value of that row, to detect edits/deletions
+            );
+        """)
+        _lead_index_conn = conn
+    return _lead_index_conn
+
+
+def _sheet_key(worksheet) -> str:
+    return f"{worksheet.spreadsheet.id}/{worksheet.id}"
+
+
+def _column_a_from(worksheet, start_row: int) -> list[str]:
+    """Column A values from start_row to the last non-empty row."""
+    return [row[0] if row else "" for row in worksheet.get(f"A{start_row}:A")]
+
+
+def sync_lead_index(worksheet) -> set:
+    """
+    Bring the local index up to date with the sheet and return its lead_ids.
+
+    Only rows after the last synced one are read (plus that row, as a check).
+    If it no longer matches - rows were deleted or re-sorted - the index for
+    this worksheet is rebuilt from a full column read.
+    """
+    key = _sheet_key(worksheet)
+    with _lead_index_lock:
+        conn = _lead_index()
+        state = conn.execute(
+            "SELECT synced_rows, last_value FROM sync_state WHERE sheet_key = ?", (key,)
+        ).fetchone()
+
+        values = None
+        start = 1
+        if state and state[0] > 1:
+            start = state[0]
+            values = _column_a_from(worksheet, start)
+            if not values or values[0] != state[1]:
+                print("Lead index out of step with sheet, rebuilding")
+                values = None
+                start = 1
+        if values is None:
+            values = _column_a_from(worksheet, 1)
+            conn.execute("DELETE FROM lead_ids WHERE sheet_key = ?", (key,))
+
+        # Row 1 is the header; on incremental reads the first row is already indexed
+        new_ids = [v for v in values[1:] if v]
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO lead_ids (sheet_key, lead_id) VALUES (?, ?)",
+                ((key, lead_id) for lead_id in new_ids),
+            )
+            if values:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (sheet_key, synced_rows, last_value) VALUES (?, ?, ?)",
+                    (key, start + len(values) - 1, values[-1]),
+                )
+        print(f"Lead index synced: {len(new_ids)} new rows read from sheet")
+        return {row[0] for row in conn.execute("SELECT lead_id FROM lead_ids WHERE sheet_key = ?", (key,))}
+
+
 def get_existing_lead_ids(worksheet) -> set:
-    """Get all existing lead IDs from the sheet to avoid duplicates."""
+    """Get all existing lead IDs from the sheet to avoid duplicates (via the local index)."""
     try:
-        # Get all values in column A (lead_id)
-        lead_ids = worksheet.col_values(1)
-        return set(lead_ids[1:])  # Skip header
-    except Exception:
-        return set()
+        return sync_lead_index(worksheet)
+    except Exception as e:
+        # Sheet unreachable: fall back to whatever the index last saw
+        print(f"Lead index sync failed ({e}), using local index only")
+        try:
+            with _lead_index_lock:
+                rows = _lead_index().execute(
+                    "SELECT lead_id FROM lead_ids WHERE sheet_key = ?", (_sheet_key(worksheet),)
+                )
+                return {row[0] for row in rows}
+        except Exception:
+            return set()
+
+
+def record_appended_leads(worksheet, lead_ids: list[str], response: dict) -> None:
+    """
+    Add freshly appended lead_ids to the index. The synced row marker only
+    advances when the append landed directly after it (per updatedRange);
+    otherwise someone else wrote in between and the next sync picks it up.
+    """
+    key = _sheet_key(worksheet)
+    updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$", updated_range)
+    with _lead_index_lock:
+        conn = _lead_index()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO lead_ids (sheet_key, lead_id) VALUES (?, ?)",
+                ((key, lead_id) for lead_id in lead_ids),
+            )
+            if match and lead_ids:
+                first_row = int(match.group(1))
+                last_row = int(match.group(2) or first_row)
+                conn.execute(
+                    "UPDATE sync_state SET synced_rows = ?, last_value = ? WHERE sheet_key = ? AND synced_rows = ?",
+                    (last_row, lead_ids[-1], key, first_row - 1),
+                )
 
 
 def append_leads_to_sheet(worksheet, leads: list[dict], existing_ids: set) -> int:
@@ -340,7 +458,8 @@ def append_leads_to_sheet(worksheet, leads: list[dict], existing_ids: set) -> in
         rows.append(row)
 
     # Batch append
-    worksheet.append_rows(rows, value_input_option='RAW')
+    response = worksheet.append_rows(rows, value_input_option='RAW')
+    record_appended_leads(worksheet, [lead["lead_id"] for lead in new_leads], response)
 
     print(f"Added {len(new_leads)} new leads to sheet")
     return len(new_leads)
@@ -2,32 +2,47 @@
 """
 Parallelized Google Maps Lead Pipeline - Incremental Save
 
-Enriches businesses and saves to Google Sheet incrementally (every few leads).
+Enrichment workers push finished leads onto a queue; a single writer thread
+de-duplicates them and appends to the Google Sheet in batches (every
+--flush-rows leads or --flush-seconds, whichever comes first), backing off
+on Sheets API rate limits.
 """
 
 import os
 import sys
 import json
+import time
+import queue
+import random
 import argparse
+import threading
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
 from dotenv import load_dotenv
 
+import gspread
+
 # Add execution dir to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from scrape_google_maps import scrape_google_maps
 from extract_website_contacts import scrape_website_contacts
 from gmaps_lead_pipeline import (
-    flatten_lead, get_or_create_sheet, get_existing_lead_ids,
+    flatten_lead, get_or_create_sheet, get_existing_lead_ids, record_appended_leads,
     LEAD_COLUMNS
 )
 
 load_dotenv()
 
-# Global lock for sheet writes
-sheet_lock = Lock()
+# Writer batching: flush when this many rows are pending or the oldest has waited this long
+FLUSH_ROWS = 50
+FLUSH_SECONDS = 5.0
+
+# Retry policy for rate-limited / transient Sheets API errors
+WRITE_MAX_RETRIES = 6
+WRITE_BACKOFF_BASE = 2.0
+WRITE_BACKOFF_MAX = 64.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
 
 
 def enrich_single(args: tuple) -> dict:
@@ -49,16 +64,125 @@ def enrich_single(args: tuple) -> dict:
     return flatten_lead(business, contacts, search_query)
 
 
-def append_single_lead(worksheet, lead: dict, existing_ids: set) -> bool:
-    """Append a single lead to the sheet if not duplicate. Thread-safe."""
-    if lead["lead_id"] in existing_ids:
-        return False
+def append_rows_with_retry(worksheet, rows: list[list]) -> dict:
+    """append_rows with exponential backoff (plus jitter) on 429 / 5xx responses."""
+    for attempt in range(WRITE_MAX_RETRIES + 1):
+        try:
+            return worksheet.append_rows(rows, value_input_option='RAW')
+        except gspread.exceptions.APIError as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status not in RETRYABLE_STATUS or attempt == WRITE_MAX_RETRIES:
+                raise
+            delay = min(WRITE_BACKOFF_MAX, WRITE_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.75, 1.25)
+            print(f"  ⏳ Sheets API {status}, retrying {len(rows)} rows in {delay:.1f}s")
+            time.sleep(delay)
 
-    with sheet_lock:
-        row = [lead.get(col, "") for col in LEAD_COLUMNS]
-        worksheet.append_row(row, value_input_option='RAW')
-        existing_ids.add(lead["lead_id"])
-    return True
+
+class SheetWriter:
+    """
+    Single consumer that owns all sheet writes. Producers call put(lead) from
+    any thread; the writer drops duplicates against existing_ids and flushes
+    append_rows batches by size or time.
+    """
+
+    _STOP = object()
+
+    def __init__(self, worksheet, existing_ids: set, flush_rows: int = FLUSH_ROWS,
+                 flush_seconds: float = FLUSH_SECONDS):
+        self.worksheet = worksheet
+        self.existing_ids = existing_ids
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue()
+        self.added = 0
+        self.skipped = 0
+        self.batches = 0
+        self.failed = 0
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, lead: dict) -> None:
+        self.queue.put(lead)
+
+    def close(self) -> None:
+        """Flush whatever is pending and wait for the writer to finish."""
+        self.queue.put(self._STOP)
+        self._thread.join()
+        # If the writer died, whatever it never dequeued was not written
+        lost = 0
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                lost += 1
+        if lost:
+            self.failed += lost
+            self.errors.append(f"Sheet writer stopped early; {lost} queued leads not written")
+            print(f"  ✗ Sheet writer stopped early; {lost} queued leads not written")
+
+    def _run(self) -> None:
+        pending = []
+        try:
+            self._loop(pending)
+        except BaseException as e:
+            self.failed += len(pending)
+            self.errors.append(f"Sheet writer crashed with {len(pending)} leads pending: {e!r}")
+            print(f"  ✗ Sheet writer crashed with {len(pending)} leads pending: {e!r}")
+
+    def _loop(self, pending: list[dict]) -> None:
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(pending)
+                pending.clear()
+                return
+            if item is not None:
+                try:
+                    lead_id = item["lead_id"]
+                    if lead_id in self.existing_ids:
+                        self.skipped += 1
+                        print(f"  - Skipped (duplicate): {item.get('business_name', lead_id)}")
+                    else:
+                        self.existing_ids.add(lead_id)
+                        pending.append(item)
+                        if deadline is None:
+                            deadline = time.monotonic() + self.flush_seconds
+                except Exception as e:
+                    self.failed += 1
+                    self.errors.append(f"Sheet writer rejected lead: {e!r}")
+
+            if pending and (len(pending) >= self.flush_rows or time.monotonic() >= deadline):
+                self._flush(pending)
+                pending.clear()
+                deadline = None
+
+    def _flush(self, leads: list[dict]) -> None:
+        if not leads:
+            return
+        rows = [[lead.get(col, "") for col in LEAD_COLUMNS] for lead in leads]
+        try:
+            response = append_rows_with_retry(self.worksheet, rows)
+        except Exception as e:
+            self.failed += len(rows)
+            self.errors.append(f"Sheet append failed for {len(rows)} leads: {e}")
+            print(f"  ✗ Sheet append failed for {len(rows)} leads: {e}")
+            return
+        self.added += len(rows)
+        try:
+            record_appended_leads(self.worksheet, [lead["lead_id"] for lead in leads], response)
+        except Exception as e:  # Rows are written; only the row-index bookkeeping is lost
+            self.errors.append(f"Recording appended rows failed: {e!r}")
+        self.batches += 1
+        print(f"  ✓ Saved batch of {len(rows)} ({self.added} added)")
 
 
 def run_incremental_pipeline(
@@ -68,15 +192,18 @@ def run_incremental_pipeline(
     sheet_url: str = None,
     sheet_name: str = None,
     workers: int = 10,
+    flush_rows: int = FLUSH_ROWS,
+    flush_seconds: float = FLUSH_SECONDS,
 ) -> dict:
     """
-    Run pipeline with incremental saves after each enrichment.
+    Run pipeline with incremental, batched saves as enrichments complete.
     """
     results = {
         "search_query": search_query,
         "started_at": datetime.now().isoformat(),
         "businesses_found": 0,
         "leads_added": 0,
+        "leads_per_sec": 0.0,
         "sheet_url": None,
         "errors": []
     }
@@ -129,28 +256,35 @@ def run_incremental_pipeline(
     total = len(businesses)
     tasks = [(b, search_query, i+1, total) for i, b in enumerate(businesses)]
 
-    added_count = 0
     all_leads = []
+    writer = SheetWriter(worksheet, existing_ids, flush_rows=flush_rows, flush_seconds=flush_seconds)
+    started = time.monotonic()
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {executor.submit(enrich_single, task): task for task in tasks}
+    def enrich_and_queue(task: tuple) -> dict:
+        lead = enrich_single(task)
+        writer.put(lead)
+        return lead
 
-        for future in as_completed(futures):
-            try:
-                lead = future.result()
-                all_leads.append(lead)
-
-                # Save immediately to sheet
-                if append_single_lead(worksheet, lead, existing_ids):
-                    added_count += 1
-                    print(f"  ✓ Saved: {lead['business_name']} ({added_count} added)")
-                else:
-                    print(f"  - Skipped (duplicate): {lead['business_name']}")
-
-            except Exception as e:
-                task = futures[future]
-                print(f"  ✗ Error: {task[0].get('title', 'Unknown')} - {e}")
-                results["errors"].append(str(e))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(enrich_and_queue, task): task for task in tasks}
+
+            for future in as_completed(futures):
+                try:
+                    all_leads.append(future.result())
+                except Exception as e:
+                    task = futures[future]
+                    print(f"  ✗ Error: {task[0].get('title', 'Unknown')} - {e}")
+                    results["errors"].append(str(e))
+    finally:
+        writer.close()
+
+    elapsed = time.monotonic() - started
+    results["errors"].extend(writer.errors)
+    added_count = writer.added
+    results["leads_per_sec"] = round(added_count / elapsed, 2) if elapsed else 0.0
+    print(f"Enriched {len(all_leads)} in {elapsed:.1f}s; wrote {added_count} leads in {writer.batches} "
+          f"batches ({results['leads_per_sec']} leads/sec, {writer.skipped} duplicates, {writer.failed} failed)")
 
     # Save local backup
     with open(f".tmp/leads_enriched_{timestamp}.json", "w") as f:
@@ -163,7 +297,7 @@ def run_incremental_pipeline(
     print("PIPELINE COMPLETE")
     print(f"{'='*60}")
     print(f"Businesses found: {results['businesses_found']}")
-    print(f"Leads added: {results['leads_added']}")
+    print(f"Leads added: {results['leads_added']} ({results['leads_per_sec']} leads/sec)")
     print(f"Sheet URL: {results['sheet_url']}")
 
     return results
@@ -177,6 +311,10 @@ def main():
     parser.add_argument("--sheet-url", help="Existing sheet URL")
     parser.add_argument("--sheet-name", help="New sheet name")
     parser.add_argument("--workers", type=int, default=10, help="Parallel workers (default: 10)")
+    parser.add_argument("--flush-rows", type=int, default=FLUSH_ROWS,
+                        help=f"Append to the sheet once this many leads are pending (default: {FLUSH_ROWS})")
+    parser.add_argument("--flush-seconds", type=float, default=FLUSH_SECONDS,
+                        help=f"...or once the oldest pending lead has waited this long (default: {FLUSH_SECONDS})")
 
     args = parser.parse_args()
 
@@ -187,6 +325,8 @@ def main():
         sheet_url=args.sheet_url,
         sheet_name=args.sheet_name,
         workers=args.workers,
+        flush_rows=args.flush_rows,
+        flush_seconds=args.flush_seconds,
     )
 
     if results["leads_added"] == 0 and results["errors"]:
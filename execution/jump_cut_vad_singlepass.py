@@ -8,15 +8,29 @@ then concatenates them in a single pipeline.
 
 Much faster than segment-by-segment approach for large files since
 it avoids repeated file seeking overhead.
+
+With --render parallel the segment list is split into groups that start
+on keyframes; each group is encoded by its own ffmpeg process and the
+parts are stream-copied together with the concat demuxer.
+
+Pass a directory as input (and output) to process every video in it: the
+VAD model is loaded once, and VAD for the next clip runs while the
+previous one is still rendering.
 """
 
 import subprocess
 import tempfile
 import os
+import json
 import argparse
 import time
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from model_registry import get_silero_vad
+
 # Video encoding settings - H.265/HEVC at 17Mbps, 30fps
 HARDWARE_ENCODER = "hevc_videotoolbox"
 SOFTWARE_ENCODER = "libx265"
@@ -24,6 +38,17 @@ HARDWARE_BITRATE = "17M"
 SOFTWARE_CRF = "18"
 TARGET_FPS = 30
 
+# VAD settings - Silero expects 16 kHz mono in 512-sample windows
+VAD_SAMPLE_RATE = 16000
+VAD_WINDOW_SAMPLES = 512
+VAD_READ_WINDOWS = 64  # Windows per ffmpeg pipe read (~2s of audio, 64 KB)
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v"}
+
+# Parallel render settings
+RENDER_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+RENDER_GROUPS_PER_WORKER = 2  # Smaller groups even out the tail when segment lengths vary
+
 # Cache for hardware encoder availability
 _hardware_encoder_available = None
 
@@ -69,18 +94,11 @@ def extract_audio(input_path: str, output_path: str, sample_rate: int = 16000):
 
 def get_speech_timestamps_silero(audio_path: str, min_speech_duration: float = 0.25, min_silence_duration: float = 0.5):
     """Use Silero VAD to detect speech segments."""
-    import torch
-
-    model, utils = torch.hub.load(
-        repo_or_dir='snakers4/silero-vad',
-        model='silero_vad',
-        force_reload=False,
-        trust_repo=True
-    )
+    model, utils = get_silero_vad()
 
     (get_speech_timestamps, save_audio, read_audio, VADIterator, collect_chunks) = utils
 
-    SAMPLE_RATE = 16000
+    SAMPLE_RATE = VAD_SAMPLE_RATE
     wav = read_audio(audio_path, sampling_rate=SAMPLE_RATE)
 
     speech_timestamps = get_speech_timestamps(
@@ -102,6 +120,81 @@ def get_speech_timestamps_silero(audio_path: str, min_speech_duration: float = 0
     return segments
 
 
+def iter_speech_segments_streaming(input_path: str, min_speech_duration: float = 0.25,
+                                   min_silence_duration: float = 0.5, speech_pad_ms: int = 100):
+    """
+    Stream 16 kHz mono PCM from ffmpeg's stdout through Silero's VADIterator
+    and yield (start_sec, end_sec) speech segments as they close.
+
+    Memory stays constant in video length: only one read buffer of
+    VAD_READ_WINDOWS windows is held at a time, and no WAV touches disk.
+    """
+    import torch
+
+    model, utils = get_silero_vad()
+    VADIterator = utils[3]
+    vad = VADIterator(
+        model,
+        threshold=0.5,
+        sampling_rate=VAD_SAMPLE_RATE,
+        min_silence_duration_ms=int(min_silence_duration * 1000),
+        speech_pad_ms=speech_pad_ms,
+    )
+
+    cmd = [
+        "ffmpeg", "-i", input_path,
+        "-vn", "-ar", str(VAD_SAMPLE_RATE), "-ac", "1",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-loglevel", "error", "pipe:1"
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    window_bytes = VAD_WINDOW_SAMPLES * 2
+    read_bytes = window_bytes * VAD_READ_WINDOWS
+
+    def to_segment(start_sample: int, end_sample: int):
+        start_sec = start_sample / VAD_SAMPLE_RATE
+        end_sec = end_sample / VAD_SAMPLE_RATE
+        return (start_sec, end_sec) if end_sec - start_sec >= min_speech_duration else None
+
+    speech_start = None
+    samples_read = 0
+    try:
+        with torch.no_grad():
+            while True:
+                buf = proc.stdout.read(read_bytes)
+                if not buf:
+                    break
+                if len(buf) % window_bytes:
+                    buf += b"\0" * (window_bytes - len(buf) % window_bytes)  # Pad the final window
+                audio = torch.frombuffer(bytearray(buf), dtype=torch.int16).float() / 32768.0
+                for offset in range(0, len(audio), VAD_WINDOW_SAMPLES):
+                    event = vad(audio[offset:offset + VAD_WINDOW_SAMPLES])
+                    if not event:
+                        continue
+                    if "start" in event:
+                        speech_start = event["start"]
+                    elif "end" in event and speech_start is not None:
+                        segment = to_segment(speech_start, event["end"])
+                        speech_start = None
+                        if segment:
+                            yield segment
+                samples_read += len(audio)
+
+        # Speech running into the end of the file
+        if speech_start is not None:
+            segment = to_segment(speech_start, samples_read)
+            if segment:
+                yield segment
+    finally:
+        vad.reset_states()
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode(errors="replace")
+        proc.stderr.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+
 def merge_close_segments(segments: list, max_gap: float) -> list:
     """Merge segments that are very close together."""
     if not segments:
@@ -242,66 +335,216 @@ def concatenate_singlepass(input_path: str, segments: list, output_path: str):
             os.remove(filter_script_path)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Jump cut editor - single pass version (trim+concat)")
-    parser.add_argument("input", help="Input video file")
-    parser.add_argument("output", help="Output video file")
-    parser.add_argument("--min-silence", type=float, default=0.5,
-                        help="Minimum silence duration to cut (default: 0.5s)")
-    parser.add_argument("--min-speech", type=float, default=0.25,
-                        help="Minimum speech duration to keep (default: 0.25s)")
-    parser.add_argument("--padding", type=int, default=100,
-                        help="Padding around speech in ms (default: 100)")
-    parser.add_argument("--merge-gap", type=float, default=0.3,
-                        help="Merge segments closer than this (default: 0.3s)")
-    parser.add_argument("--keep-start", action="store_true", default=True,
-                        help="Always start from 0:00 (default: True)")
-    parser.add_argument("--no-keep-start", action="store_false", dest="keep_start")
+def get_keyframe_times(input_path: str) -> list[float]:
+    """Keyframe timestamps of the first video stream (packet scan, no decoding)."""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", input_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            keyframes.append(float(pts))
+    return sorted(keyframes)
 
-    args = parser.parse_args()
 
-    input_path = args.input
-    output_path = args.output
+def split_segments_into_groups(segments: list, n_groups: int, keyframes: list[float]) -> list[tuple]:
+    """
+    Split segments into up to n_groups runs of roughly equal output duration.
 
-    print(f"🎬 Jump Cut Editor (Single-Pass, trim+concat)")
-    print(f"   Input: {input_path}")
-    print(f"   Output: {output_path}")
-    print()
+    Returns (seek, group_segments) pairs where seek is the last keyframe at or
+    before the group's first segment, so each group's ffmpeg can input-seek
+    straight to a keyframe without decoding anything it throws away.
+    """
+    n_groups = max(1, min(n_groups, len(segments)))
+    total = sum(end - start for start, end in segments)
+    groups, current, acc = [], [], 0.0
+    for start, end in segments:
+        current.append((start, end))
+        acc += end - start
+        if len(groups) < n_groups - 1 and acc >= total * (len(groups) + 1) / n_groups:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+
+    result = []
+    for group in groups:
+        first_start = group[0][0]
+        seek = 0.0
+        for kf in keyframes:
+            if kf > first_start:
+                break
+            seek = kf
+        result.append((seek, group))
+    return result
+
+
+def _encode_group(input_path: str, seek: float, segments: list, part_path: str, encoder_args: list[str]) -> tuple:
+    """Encode one keyframe-aligned group of segments to part_path. Returns (ok, stderr)."""
+    local = [(start - seek, end - seek) for start, end in segments]
+    filter_path = part_path + ".filter.txt"
+    with open(filter_path, "w") as f:
+        f.write(build_trim_concat_filter(local))
 
-    overall_start = time.time()
+    cmd = [
+        "ffmpeg", "-y",
+        "-ss", f"{seek:.6f}", "-t", f"{local[-1][1] + 1:.6f}",
+        "-i", input_path,
+        "-filter_complex_script", filter_path,
+        "-map", "[outv]", "-map", "[outa]",
+    ]
+    cmd.extend(encoder_args)
+    cmd.extend([
+        "-c:a", "aac", "-b:a", "192k",
+        "-loglevel", "error",
+        part_path
+    ])
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    os.remove(filter_path)
+    return result.returncode == 0, result.stderr
 
-    duration = get_duration(input_path)
-    print(f"📏 Video duration: {duration:.2f}s ({duration/60:.1f} min)")
 
-    # Extract audio for VAD
-    print(f"🎵 Extracting audio...")
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        audio_path = tmp.name
+def concatenate_parallel(input_path: str, segments: list, output_path: str,
+                         workers: int = None, groups: int = None) -> bool:
+    """
+    Parallel render: encode keyframe-aligned segment groups in separate ffmpeg
+    processes, then join the parts with the concat demuxer (stream copy).
+    """
+    workers = workers or RENDER_WORKERS
+    groups = groups or workers * RENDER_GROUPS_PER_WORKER
+    start_time = time.time()
+
+    keyframes = get_keyframe_times(input_path)
+    plan = split_segments_into_groups(segments, groups, keyframes)
+    print(f"⚡ Parallel processing {len(segments)} segments in {len(plan)} groups ({workers} workers)...")
 
+    encoder_args = get_cached_encoder_args()
+    work_dir = tempfile.mkdtemp(prefix="jumpcut_parts_")
     try:
-        extract_audio(input_path, audio_path)
+        part_paths = [os.path.join(work_dir, f"part_{i:04d}.mp4") for i in range(len(plan))]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each task only waits on its own ffmpeg process, so threads are enough
+            futures = [
+                pool.submit(_encode_group, input_path, seek, group, part_path, encoder_args)
+                for (seek, group), part_path in zip(plan, part_paths)
+            ]
+            for i, future in enumerate(futures):
+                ok, stderr = future.result()
+                if not ok:
+                    print(f"   FFmpeg error in group {i}: {stderr[:1000]}")
+                    for pending in futures:
+                        pending.cancel()
+                    return False
+        print(f"   Encoded {len(plan)} parts in {time.time() - start_time:.1f}s, joining...")
+
+        list_path = os.path.join(work_dir, "parts.txt")
+        with open(list_path, "w") as f:
+            f.writelines(f"file '{path}'\n" for path in part_paths)
+        cmd = [
+            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy", "-movflags", "+faststart",
+            "-loglevel", "error", output_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"   FFmpeg concat error: {result.stderr[:1000]}")
+            return False
 
-        print(f"🎯 Running Silero VAD...")
-        speech_segments = get_speech_timestamps_silero(
-            audio_path,
-            min_speech_duration=args.min_speech,
-            min_silence_duration=args.min_silence
-        )
-        print(f"   Found {len(speech_segments)} speech segments")
+        elapsed = time.time() - start_time
+        print(f"   Done in {elapsed:.1f}s!")
+        return True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
-        # Debug: show first few segments
-        for i, (start, end) in enumerate(speech_segments[:5]):
-            print(f"     {i+1}. {start:.2f}s - {end:.2f}s ({end-start:.2f}s)")
-        if len(speech_segments) > 5:
-            print(f"     ... and {len(speech_segments) - 5} more")
 
+def benchmark_render(duration: float = 600, cuts: int = 300, workers: int = None) -> dict:
+    """
+    Compare single-pass and parallel rendering on a synthetic lavfi video
+    (testsrc2 + sine, 2s GOP) with `cuts` evenly spread speech segments.
+    """
+    work_dir = tempfile.mkdtemp(prefix="jumpcut_bench_")
+    try:
+        source = os.path.join(work_dir, "source.mp4")
+        print(f"🧪 Generating {duration:.0f}s synthetic test video...")
+        subprocess.run([
+            "ffmpeg", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate={TARGET_FPS}",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+            "-t", str(duration), "-c:v", "libx264", "-preset", "ultrafast", "-g", str(TARGET_FPS * 2),
+            "-c:a", "aac", "-loglevel", "error", source
+        ], check=True)
+
+        # Keep ~60% of each slot so every cut removes a real gap
+        slot = duration / cuts
+        segments = [(i * slot, i * slot + slot * 0.6) for i in range(cuts)]
+        expected = sum(end - start for start, end in segments)
+
+        results = {"duration": duration, "cuts": cuts, "expected_output": round(expected, 2)}
+        for mode, render in (("single", concatenate_singlepass), ("parallel", concatenate_parallel)):
+            output = os.path.join(work_dir, f"{mode}.mp4")
+            started = time.time()
+            ok = render(input_path=source, segments=segments, output_path=output, **(
+                {"workers": workers} if mode == "parallel" else {}
+            ))
+            results[mode] = {
+                "ok": ok,
+                "seconds": round(time.time() - started, 2),
+                "output_duration": round(get_duration(output), 2) if ok else None,
+            }
+
+        if results["single"]["ok"] and results["parallel"]["ok"]:
+            results["speedup"] = round(results["single"]["seconds"] / results["parallel"]["seconds"], 2)
+        print(json.dumps(results, indent=2))
+        return results
     finally:
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def detect_speech_segments(input_path: str, duration: float, args) -> list:
+    """Run VAD on one video and return merged, padded segments ready to render."""
+    if args.vad_mode == "stream":
+        print(f"🎯 Running Silero VAD (streaming from ffmpeg)...")
+        speech_segments = []
+        for start, end in iter_speech_segments_streaming(
+            input_path,
+            min_speech_duration=args.min_speech,
+            min_silence_duration=args.min_silence
+        ):
+            speech_segments.append((start, end))
+            if len(speech_segments) % 100 == 0:
+                print(f"   ... {len(speech_segments)} segments, at {end/60:.1f} min")
+    else:
+        # Extract audio for VAD
+        print(f"🎵 Extracting audio...")
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            audio_path = tmp.name
+
+        try:
+            extract_audio(input_path, audio_path)
+
+            print(f"🎯 Running Silero VAD...")
+            speech_segments = get_speech_timestamps_silero(
+                audio_path,
+                min_speech_duration=args.min_speech,
+                min_silence_duration=args.min_silence
+            )
+        finally:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    print(f"   Found {len(speech_segments)} speech segments")
+
+    # Debug: show first few segments
+    for i, (start, end) in enumerate(speech_segments[:5]):
+        print(f"     {i+1}. {start:.2f}s - {end:.2f}s ({end-start:.2f}s)")
+    if len(speech_segments) > 5:
+        print(f"     ... and {len(speech_segments) - 5} more")
 
     if not speech_segments:
-        print("⚠️  No speech detected!")
-        return
+        return []
 
     # Merge close segments
     speech_segments = merge_close_segments(speech_segments, args.merge_gap)
@@ -322,9 +565,18 @@ def main():
     total_speech = sum(end - start for start, end in speech_segments)
     print(f"📊 Expected output: {total_speech:.1f}s ({total_speech/60:.1f} min)")
     print()
+    return speech_segments
 
-    # Single-pass concatenation using trim+concat
-    success = concatenate_singlepass(input_path, speech_segments, output_path)
+
+def render_and_report(input_path: str, speech_segments: list, output_path: str, duration: float,
+                      overall_start: float, args) -> bool:
+    """Render the cut video and print before/after stats."""
+    if args.render == "parallel":
+        success = concatenate_parallel(input_path, speech_segments, output_path,
+                                       workers=args.render_workers, groups=args.render_groups)
+    else:
+        # Single-pass concatenation using trim+concat
+        success = concatenate_singlepass(input_path, speech_segments, output_path)
 
     if success:
         new_duration = get_duration(output_path)
@@ -332,11 +584,139 @@ def main():
         overall_time = time.time() - overall_start
 
         print()
-        print(f"📊 Stats:")
+        print(f"📊 Stats ({Path(output_path).name}):")
         print(f"   Original: {duration:.2f}s ({duration/60:.1f} min)")
         print(f"   New: {new_duration:.2f}s ({new_duration/60:.1f} min)")
         print(f"   Removed: {removed:.2f}s ({100*removed/duration:.1f}%)")
         print(f"   ⚡ Total processing time: {overall_time:.1f}s")
+    return success
+
+
+def process_video(input_path: str, output_path: str, args) -> bool:
+    """Jump-cut a single video."""
+    print(f"🎬 Jump Cut Editor (Single-Pass, trim+concat)")
+    print(f"   Input: {input_path}")
+    print(f"   Output: {output_path}")
+    print()
+
+    overall_start = time.time()
+
+    duration = get_duration(input_path)
+    print(f"📏 Video duration: {duration:.2f}s ({duration/60:.1f} min)")
+
+    speech_segments = detect_speech_segments(input_path, duration, args)
+    if not speech_segments:
+        print("⚠️  No speech detected!")
+        return False
+
+    return render_and_report(input_path, speech_segments, output_path, duration, overall_start, args)
+
+
+def process_directory(input_dir: str, output_dir: str, args) -> dict:
+    """
+    Jump-cut every video in input_dir into output_dir (same file names).
+
+    Two-stage pipeline: VAD runs in this thread with the one cached model
+    while a background thread renders the previous clip with ffmpeg.
+    """
+    inputs = sorted(p for p in Path(input_dir).iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+    out_dir = Path(output_dir)
+    if out_dir.resolve() == Path(input_dir).resolve():
+        raise SystemExit("Output directory must differ from the input directory")
+    stems = Counter(p.stem.lower() for p in inputs)
+    clashes = [p.name for p in inputs if stems[p.stem.lower()] > 1]
+    if clashes:  # clip.mov and clip.mp4 would both render to clip.mp4
+        raise SystemExit(f"Inputs share a file name and would overwrite each other's output: {', '.join(clashes)}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"🎬 Batch jump cut: {len(inputs)} videos from {input_dir} -> {output_dir}")
+    batch_start = time.time()
+    get_silero_vad()  # Load once up front, reused for every clip
+
+    results = {"processed": 0, "failed": [], "no_speech": []}
+    renders = []
+    with ThreadPoolExecutor(max_workers=1) as renderer:
+        for i, input_path in enumerate(inputs, 1):
+            print(f"\n[{i}/{len(inputs)}] {input_path.name}")
+            clip_start = time.time()
+            try:
+                duration = get_duration(str(input_path))
+                speech_segments = detect_speech_segments(str(input_path), duration, args)
+            except Exception as e:
+                print(f"   ❌ VAD failed: {e}")
+                results["failed"].append(input_path.name)
+                continue
+            if not speech_segments:
+                print("⚠️  No speech detected!")
+                results["no_speech"].append(input_path.name)
+                continue
+            output_path = str(out_dir / f"{input_path.stem}.mp4")
+            renders.append((input_path.name, renderer.submit(
+                render_and_report, str(input_path), speech_segments, output_path, duration, clip_start, args
+            )))
+
+        for name, future in renders:
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"   ❌ Render failed for {name}: {e}")
+                ok = False
+            if ok:
+                results["processed"] += 1
+            else:
+                results["failed"].append(name)
+
+    elapsed = time.time() - batch_start
+    print(f"\n✅ Batch complete: {results['processed']}/{len(inputs)} videos in {elapsed:.1f}s")
+    if results["failed"]:
+        print(f"   Failed: {', '.join(results['failed'])}")
+    if results["no_speech"]:
+        print(f"   No speech: {', '.join(results['no_speech'])}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jump cut editor - single pass version (trim+concat)")
+    parser.add_argument("input", nargs="?", help="Input video file, or a directory of videos")
+    parser.add_argument("output", nargs="?", help="Output video file, or output directory for a batch")
+    parser.add_argument("--min-silence", type=float, default=0.5,
+                        help="Minimum silence duration to cut (default: 0.5s)")
+    parser.add_argument("--min-speech", type=float, default=0.25,
+                        help="Minimum speech duration to keep (default: 0.25s)")
+    parser.add_argument("--padding", type=int, default=100,
+                        help="Padding around speech in ms (default: 100)")
+    parser.add_argument("--merge-gap", type=float, default=0.3,
+                        help="Merge segments closer than this (default: 0.3s)")
+    parser.add_argument("--keep-start", action="store_true", default=True,
+                        help="Always start from 0:00 (default: True)")
+    parser.add_argument("--no-keep-start", action="store_false", dest="keep_start")
+    parser.add_argument("--vad-mode", choices=["stream", "file"], default="stream",
+                        help="stream: pipe PCM from ffmpeg through VADIterator (constant memory); "
+                             "file: extract a temp WAV and run get_speech_timestamps (default: stream)")
+    parser.add_argument("--render", choices=["single", "parallel"], default="single",
+                        help="single: one trim+concat ffmpeg pass; parallel: keyframe-aligned groups "
+                             "encoded concurrently, then stream-copied together (default: single)")
+    parser.add_argument("--render-workers", type=int, default=RENDER_WORKERS,
+                        help=f"Concurrent ffmpeg encoders for --render parallel (default: {RENDER_WORKERS})")
+    parser.add_argument("--render-groups", type=int,
+                        help="Segment groups for --render parallel (default: 2x workers)")
+    parser.add_argument("--benchmark", type=float, metavar="SECONDS",
+                        help="Benchmark single vs parallel rendering on a synthetic video of this length")
+    parser.add_argument("--benchmark-cuts", type=int, default=300,
+                        help="Speech segments in the benchmark video (default: 300)")
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_render(args.benchmark, args.benchmark_cuts, workers=args.render_workers)
+        return
+    if not args.input or not args.output:
+        parser.error("input and output are required (unless --benchmark)")
+
+    if os.path.isdir(args.input):
+        process_directory(args.input, args.output, args)
+    else:
+        process_video(args.input, args.output, args)
 
 
 if __name__ == "__main__":
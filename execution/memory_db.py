@@ -14,6 +14,8 @@ Usage:
     python memory_db.py search "customer onboarding"
     python memory_db.py search "API rate limit" --type facts
     python memory_db.py search "project deadline" --after 2026-01-01
+    python memory_db.py search "onboarding" --workers 4       # Query tables concurrently
+    python memory_db.py search-bench --rows 100000            # Compare with the legacy engine
 
     # === SHORT-TERM MEMORY (session/task context) ===
     python memory_db.py stm set "current_task" "Processing batch 3 of lead enrichment"
@@ -60,10 +62,25 @@ Usage:
     python memory_db.py profile set "agent.type" "lead_generation"
     python memory_db.py profile show
 
+    # === SEMANTIC SEARCH (optional: pip install sentence-transformers) ===
+    python memory_db.py embed-sync
+    python memory_db.py embed-search "rate limiting" --top-k 5
+    python memory_db.py embed-bench --rows 50000     # NumPy matrix vs. Python scan
+    python memory_db.py embed-reindex --report       # Build IVF index, show recall@k vs latency
+
+    # === SERVER MODE (keep DB + embedding model warm between calls) ===
+    python memory_db.py serve &                     # Unix socket at memory/agent_memory.sock
+    python memory_db_client.py search "API rate limit"   # Same verbs, forwarded to the server
+    python memory_db.py serve --stdio               # JSON lines on stdin/stdout
+
     # === MAINTENANCE ===
     python memory_db.py status
     python memory_db.py rebuild-fts
+    python memory_db.py deduplicate-facts --dry-run   # Show duplicate clusters only
     python memory_db.py export --format json          # Export all memory as JSON
+    python memory_db.py import dump.json --defer-fts  # Bulk import (also .jsonl, memory_bank dirs)
+    python memory_db.py snapshot .tmp/snapshots [--incremental]  # Streaming JSONL.gz export
+    python memory_db.py restore .tmp/snapshots        # Replay full + incremental snapshots
 """
 
 import os
@@ -71,9 +88,25 @@ import sys
 import json
 import sqlite3
 import argparse
+import copy
+import gzip
+import io
 import re
+import signal
+import socket
+import socketserver
+import traceback
 import struct
 import hashlib
+import heapq
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 from textwrap import dedent
@@ -90,6 +123,8 @@ DB_PATH = MEMORY_DIR / "agent_memory.db"
 # ---------------------------------------------------------------------------
 _EMBEDDER = None
 _EMBED_DIM = 0
+_EMBED_MODEL_NAME = os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBED_QUERY_CACHE_SIZE = int(os.environ.get("MEMORY_EMBED_CACHE_SIZE", "1024"))
 
 def _get_embedder():
     """Lazy-load the embedding model. Returns None if unavailable."""
@@ -98,8 +133,7 @@ def _get_embedder():
         return _EMBEDDER
     try:
         from sentence_transformers import SentenceTransformer
-        model_name = os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-        _EMBEDDER = SentenceTransformer(model_name)
+        _EMBEDDER = SentenceTransformer(_EMBED_MODEL_NAME)
         _EMBED_DIM = _EMBEDDER.get_sentence_embedding_dimension()
         return _EMBEDDER
     except ImportError:
@@ -113,6 +147,39 @@ def _embed_text(text):
     vec = model.encode(text, normalize_embeddings=True)
     return struct.pack(f"{len(vec)}f", *vec)
 
+@lru_cache(maxsize=EMBED_QUERY_CACHE_SIZE)
+def _embed_query_cached(model_name, text):
+    return _embed_text(text)
+
+def _embed_query(text):
+    """Embed a search query, reusing recent embeddings of the same text (LRU)."""
+    if _get_embedder() is None:
+        return None
+    return _embed_query_cached(_EMBED_MODEL_NAME, text)
+
+def _embed_texts(texts, batch_size=64):
+    """Embed a list of texts in one model call. Returns a list of bytes or None."""
+    model = _get_embedder()
+    if model is None:
+        return None
+    vecs = model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return [struct.pack(f"{len(vec)}f", *vec) for vec in vecs]
+
+# ---------------------------------------------------------------------------
+# Optional: NumPy for vectorized similarity over the embedding matrix.
+# Always present alongside sentence-transformers; without it embed_search
+# falls back to the pure-Python scan below.
+# ---------------------------------------------------------------------------
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Approximate (IVF) search kicks in once an index exists (embed-reindex) and
+# the matrix holds at least ANN_MIN_ROWS vectors. NPROBE trades recall for speed.
+ANN_NPROBE = int(os.environ.get("MEMORY_ANN_NPROBE", "8"))
+ANN_MIN_ROWS = int(os.environ.get("MEMORY_ANN_MIN_ROWS", "20000"))
+
 def _cosine_similarity(a_bytes, b_bytes):
     """Compute cosine similarity between two embedding byte blobs."""
     n = len(a_bytes) // 4
@@ -126,11 +193,11 @@ def _cosine_similarity(a_bytes, b_bytes):
 # Database setup
 # ---------------------------------------------------------------------------
 
-def get_db(db_path=None):
+def get_db(db_path=None, check_same_thread=True):
     """Get a connection to the memory database."""
     path = db_path or DB_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(path))
+    conn = sqlite3.connect(str(path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
@@ -152,6 +219,8 @@ def init_db(conn):
             expires_at  TEXT DEFAULT NULL,
             access_count INTEGER DEFAULT 0
         );
+        CREATE INDEX IF NOT EXISTS idx_short_term_expires
+            ON short_term(expires_at) WHERE expires_at IS NOT NULL;
 
         -- =============================================
         -- PROFILE: Key-value store for agent/project identity
@@ -255,6 +324,14 @@ def init_db(conn):
             UNIQUE(source_table, source_id)
         );
 
+        -- Bumped by trigger on every embeddings write, so in-memory
+        -- matrices held by other connections know when to reload
+        CREATE TABLE IF NOT EXISTS embedding_generation (
+            id          INTEGER PRIMARY KEY CHECK (id = 1),
+            generation  INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO embedding_generation (id, generation) VALUES (1, 0);
+
         -- =============================================
         -- EVALUATION LOG: Track task outcomes, costs, quality
         -- =============================================
@@ -422,10 +499,95 @@ def init_db(conn):
             INSERT INTO fts_insights(rowid, content, category)
             VALUES (new.id, new.content, new.category);
         END;
+
+        -- embeddings (generation counter only)
+        CREATE TRIGGER IF NOT EXISTS trg_embeddings_gen_ai AFTER INSERT ON embeddings BEGIN
+            UPDATE embedding_generation SET generation = generation + 1 WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_embeddings_gen_ad AFTER DELETE ON embeddings BEGIN
+            UPDATE embedding_generation SET generation = generation + 1 WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_embeddings_gen_au AFTER UPDATE ON embeddings BEGIN
+            UPDATE embedding_generation SET generation = generation + 1 WHERE id = 1;
+        END;
     """))
     conn.commit()
 
 
+# ---------------------------------------------------------------------------
+# Per-connection state and query result cache
+# Writers bump a per-table generation counter. Cached search results record
+# the generations (plus PRAGMA data_version, which moves when another
+# connection commits) they were computed under and are recomputed as soon
+# as either changes, so a stale result is never served.
+# ---------------------------------------------------------------------------
+QUERY_CACHE_SIZE = int(os.environ.get("MEMORY_QUERY_CACHE_SIZE", "256"))
+
+_GENERATIONS = {}
+_CACHE_STATS = {"result_hits": 0, "result_misses": 0}
+_RESULT_CACHES = {}
+
+def _bump_generation(*tables):
+    """Invalidate cached results that depend on any of `tables`."""
+    for table in tables:
+        _GENERATIONS[table] = _GENERATIONS.get(table, 0) + 1
+
+
+def _per_connection(registry, conn, factory, create=True):
+    """
+    Per-connection singleton stored in `registry`, keyed by id(conn).
+    sqlite3.Connection does not support weak references, so entries of
+    closed connections are pruned whenever a new one is created.
+    """
+    entry = registry.get(id(conn))
+    if entry is not None and entry[0] is conn:
+        return entry[1]
+    if not create:
+        return None
+    for key, (other, _) in list(registry.items()):
+        try:
+            other.total_changes
+        except sqlite3.ProgrammingError:
+            del registry[key]
+    value = factory(conn)
+    registry[id(conn)] = (conn, value)
+    return value
+
+
+def _cached_result(conn, key, tables, compute):
+    """Return compute() from the LRU result cache, tagged by table generations."""
+    if QUERY_CACHE_SIZE <= 0:
+        return compute()
+    cache = _per_connection(_RESULT_CACHES, conn, lambda _: OrderedDict())
+    stamp = (
+        conn.execute("PRAGMA data_version").fetchone()[0],
+        tuple(_GENERATIONS.get(t, 0) for t in tables),
+    )
+    entry = cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        cache.move_to_end(key)
+        _CACHE_STATS["result_hits"] += 1
+        return copy.deepcopy(entry[1])
+    _CACHE_STATS["result_misses"] += 1
+    result = compute()
+    cache[key] = (stamp, copy.deepcopy(result))
+    cache.move_to_end(key)
+    if len(cache) > QUERY_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
+
+
+def cache_stats():
+    """Hit/miss counters for the query-embedding and search-result caches."""
+    info = _embed_query_cached.cache_info()
+    return {
+        **_CACHE_STATS,
+        "embed_query_hits": info.hits,
+        "embed_query_misses": info.misses,
+        "embed_query_size": info.currsize,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Rebuild FTS indexes
 # ---------------------------------------------------------------------------
@@ -442,6 +604,7 @@ def rebuild_fts(conn):
         except sqlite3.OperationalError:
             pass
     conn.commit()
+    _bump_generation(*SEARCH_TABLES)
     print("FTS indexes rebuilt.")
 
 
@@ -473,6 +636,7 @@ def stm_set(conn, key, value, category="session", ttl_seconds=None):
             value=excluded.value, category=excluded.category,
             expires_at=excluded.expires_at, access_count=0
     """, (key, value, category, expires_at))
+    _stm_drop_pending(conn, [key])  # Queued accesses belong to the old value
 
     try:
         conn.execute(
@@ -482,54 +646,129 @@ def stm_set(conn, key, value, category="session", ttl_seconds=None):
     except sqlite3.OperationalError:
         pass
     conn.commit()
+    _bump_generation("short_term")
+    _stm_expire(conn)
     ttl_msg = f" (expires in {ttl_seconds}s)" if ttl_seconds else ""
     print(f"STM set: {key}{ttl_msg}")
 
 
 def stm_get(conn, key):
     """Get a short-term memory value. Returns None if expired."""
-    _stm_cleanup_expired(conn)
-    row = conn.execute("SELECT * FROM short_term WHERE key = ?", (key,)).fetchone()
+    row = conn.execute(
+        "SELECT * FROM short_term WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+        (key, datetime.now().isoformat())
+    ).fetchone()
     if not row:
         return None
-    # Increment access count
-    conn.execute("UPDATE short_term SET access_count = access_count + 1 WHERE key = ?", (key,))
-    conn.commit()
-    return dict(row)
+    entry = dict(row)
+    entry["access_count"] += _stm_note_access(conn, key)
+    return entry
 
 
 def stm_show(conn):
     """Show all short-term memory entries."""
-    _stm_cleanup_expired(conn)
-    rows = conn.execute("SELECT * FROM short_term ORDER BY created_at DESC").fetchall()
-    return [dict(r) for r in rows]
+    rows = conn.execute(
+        "SELECT * FROM short_term WHERE expires_at IS NULL OR expires_at >= ? ORDER BY created_at DESC",
+        (datetime.now().isoformat(),)
+    ).fetchall()
+    pending = _per_connection(_STM_PENDING_ACCESS, conn, None, create=False)
+    entries = [dict(r) for r in rows]
+    if pending:
+        for entry in entries:
+            entry["access_count"] += pending["counts"].get(entry["key"], 0)
+    return entries
 
 
 def stm_clear(conn, clear_all=False):
     """Clear expired entries, or all entries if clear_all=True."""
     if clear_all:
         conn.execute("DELETE FROM short_term")
+        _stm_drop_pending(conn)
         try:
             conn.execute("DELETE FROM fts_short_term")
         except sqlite3.OperationalError:
             pass
         conn.commit()
+        _bump_generation("short_term")
         print("Cleared all short-term memory.")
     else:
-        count = _stm_cleanup_expired(conn)
+        count = _stm_expire(conn, force=True)
         print(f"Cleared {count} expired entries.")
 
 
-def _stm_cleanup_expired(conn):
-    """Remove expired short-term memory entries."""
-    now = datetime.now().isoformat()
-    expired = conn.execute(
-        "SELECT key FROM short_term WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
-    ).fetchall()
-    for row in expired:
-        conn.execute("DELETE FROM short_term WHERE key = ?", (row["key"],))
-    conn.commit()
-    return len(expired)
+# Reads never write: expired rows are filtered by predicate and purged by a
+# throttled ranged DELETE, and access counts are applied in batches.
+STM_EXPIRY_INTERVAL = float(os.environ.get("MEMORY_STM_EXPIRY_INTERVAL", "60"))
+STM_ACCESS_FLUSH_COUNT = int(os.environ.get("MEMORY_STM_ACCESS_FLUSH_COUNT", "64"))
+STM_ACCESS_FLUSH_SECONDS = float(os.environ.get("MEMORY_STM_ACCESS_FLUSH_SECONDS", "30"))
+_STM_LAST_EXPIRY = {}
+_STM_PENDING_ACCESS = {}
+
+
+def _stm_expire(conn, force=False):
+    """Delete expired STM rows (index range scan), at most once per STM_EXPIRY_INTERVAL."""
+    now = time.monotonic()
+    last = _per_connection(_STM_LAST_EXPIRY, conn, lambda _: [float("-inf")])
+    if not force and now - last[0] < STM_EXPIRY_INTERVAL:
+        return 0
+    last[0] = now
+    with conn:
+        pending = _per_connection(_STM_PENDING_ACCESS, conn, None, create=False)
+        if pending and pending["counts"]:
+            _stm_drop_pending(conn, [r[0] for r in conn.execute(
+                "SELECT key FROM short_term WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (datetime.now().isoformat(),)
+            )])
+        deleted = conn.execute(
+            "DELETE FROM short_term WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (datetime.now().isoformat(),)
+        ).rowcount
+        if deleted:
+            try:
+                conn.execute("INSERT INTO fts_short_term(fts_short_term) VALUES('rebuild')")
+            except sqlite3.OperationalError:
+                pass
+    if deleted:
+        _bump_generation("short_term")
+    return deleted
+
+
+def _stm_note_access(conn, key):
+    """Queue an access_count increment; returns this key's count not yet in the row read before it."""
+    pending = _per_connection(
+        _STM_PENDING_ACCESS, conn, lambda _: {"counts": {}, "since": time.monotonic()}
+    )
+    counts = pending["counts"]
+    counts[key] = unflushed = counts.get(key, 0) + 1
+    total = sum(counts.values())
+    if total >= STM_ACCESS_FLUSH_COUNT or time.monotonic() - pending["since"] >= STM_ACCESS_FLUSH_SECONDS:
+        stm_flush_access(conn)
+    return unflushed
+
+
+def _stm_drop_pending(conn, keys=None):
+    """Forget queued access_count increments for `keys` (all keys if None) of deleted/reset rows."""
+    pending = _per_connection(_STM_PENDING_ACCESS, conn, None, create=False)
+    if not pending:
+        return
+    if keys is None:
+        pending["counts"].clear()
+    else:
+        for key in keys:
+            pending["counts"].pop(key, None)
+
+
+def stm_flush_access(conn):
+    """Write queued access_count increments in one transaction."""
+    pending = _per_connection(_STM_PENDING_ACCESS, conn, None, create=False)
+    if not pending or not pending["counts"]:
+        return 0
+    items = [(n, k) for k, n in pending["counts"].items()]
+    pending["counts"], pending["since"] = {}, time.monotonic()
+    with conn:
+        conn.executemany("UPDATE short_term SET access_count = access_count + ? WHERE key = ?", items)
+    _bump_generation("short_term")
+    return len(items)
 
 
 # ---------------------------------------------------------------------------
@@ -562,6 +801,7 @@ def profile_set(conn, key, value, category="general"):
     except sqlite3.OperationalError:
         pass
     conn.commit()
+    _bump_generation("profile")
 
 
 def profile_get(conn, key):
@@ -606,6 +846,7 @@ def context_set(conn, key, value, category="general"):
     except sqlite3.OperationalError:
         pass
     conn.commit()
+    _bump_generation("context")
 
 
 def context_get(conn, key):
@@ -631,6 +872,7 @@ def log_interaction(conn, summary, topics="", advice="", follow_ups="", raw_data
         VALUES (?, ?, ?, ?, ?)
     """, (summary, topics, advice, follow_ups, raw_data))
     conn.commit()
+    _bump_generation("interactions")
     print(f"Logged interaction #{cur.lastrowid}")
     return cur.lastrowid
 
@@ -646,6 +888,7 @@ def log_decision(conn, decision, context="", reasoning="", expected=""):
         VALUES (?, ?, ?, ?)
     """, (decision, context, reasoning, expected))
     conn.commit()
+    _bump_generation("decisions")
     print(f"Logged decision #{cur.lastrowid}")
     return cur.lastrowid
 
@@ -657,6 +900,7 @@ def update_outcome(conn, decision_id, outcome, status="completed"):
         WHERE id = ?
     """, (outcome, status, int(decision_id)))
     conn.commit()
+    _bump_generation("decisions")
     print(f"Updated decision #{decision_id}")
 
 
@@ -671,6 +915,7 @@ def add_fact(conn, content, category="general", entity="", tags="", source="", c
         VALUES (?, ?, ?, ?, ?, ?)
     """, (content, category, entity, tags, source, confidence))
     conn.commit()
+    _bump_generation("facts")
     print(f"Stored fact #{cur.lastrowid}")
     return cur.lastrowid
 
@@ -688,6 +933,7 @@ def add_entity(conn, name, type_="general", details="", tags=""):
             WHERE name = ?
         """, (details, type_, tags, name))
         conn.commit()
+        _bump_generation("entities")
         print(f"Updated entity: {name}")
         return existing["id"]
     else:
@@ -695,6 +941,7 @@ def add_entity(conn, name, type_="general", details="", tags=""):
             INSERT INTO entities (name, type, details, tags) VALUES (?, ?, ?, ?)
         """, (name, type_, details, tags))
         conn.commit()
+        _bump_generation("entities")
         print(f"Stored entity: {name} (#{cur.lastrowid})")
         return cur.lastrowid
 
@@ -709,6 +956,7 @@ def add_insight(conn, content, category="general"):
         INSERT INTO insights (content, category) VALUES (?, ?)
     """, (content, category))
     conn.commit()
+    _bump_generation("insights")
     print(f"Stored insight #{cur.lastrowid}")
     return cur.lastrowid
 
@@ -717,100 +965,268 @@ def add_insight(conn, content, category="general"):
 # UNIVERSAL SEARCH
 # ---------------------------------------------------------------------------
 
-def search(conn, query, type_filter=None, after=None, before=None, limit=20):
+# FTS5 table, source table, date column and display format for each memory type.
+# `rowid_is_key` tables (key-value stores) join on key instead of id.
+SEARCH_TABLES = {
+    "short_term": {
+        "fts": "fts_short_term", "src": "short_term",
+        "date_col": "created_at", "rowid_is_key": True,
+        "display": lambda r: f"[STM - {r['key']}] {r['value'][:200]}"
+    },
+    "interactions": {
+        "fts": "fts_interactions", "src": "interactions",
+        "date_col": "date", "rowid_is_key": False,
+        "display": lambda r: f"[Interaction #{r['id']} - {r['date'][:10]}] {r['summary'][:200]}"
+    },
+    "facts": {
+        "fts": "fts_facts", "src": "facts",
+        "date_col": "created_at", "rowid_is_key": False,
+        "display": lambda r: f"[Fact - {r['category']}] {r['content'][:200]}"
+    },
+    "entities": {
+        "fts": "fts_entities", "src": "entities",
+        "date_col": "first_mentioned", "rowid_is_key": False,
+        "display": lambda r: f"[Entity - {r['type']}] {r['name']}: {r['details'][:150]}"
+    },
+    "decisions": {
+        "fts": "fts_decisions", "src": "decisions",
+        "date_col": "date", "rowid_is_key": False,
+        "display": lambda r: f"[Decision #{r['id']} - {r['status']}] {r['decision'][:200]}"
+    },
+    "insights": {
+        "fts": "fts_insights", "src": "insights",
+        "date_col": "date", "rowid_is_key": False,
+        "display": lambda r: f"[Insight - {r['category']}] {r['content'][:200]}"
+    },
+    "profile": {
+        "fts": "fts_profile", "src": "profile",
+        "date_col": "updated_at", "rowid_is_key": True,
+        "display": lambda r: f"[Profile - {r['key']}] {r['value'][:200]}"
+    },
+    "context": {
+        "fts": "fts_context", "src": "context",
+        "date_col": "updated_at", "rowid_is_key": True,
+        "display": lambda r: f"[Context - {r['key']}] {r['value'][:200]}"
+    },
+}
+
+# Per-table FTS queries run concurrently on read-only connections when > 1.
+SEARCH_WORKERS = int(os.environ.get("MEMORY_SEARCH_WORKERS", "1"))
+
+
+@lru_cache(maxsize=None)
+def _search_sql(stype, has_after, has_before):
+    """FTS query for one table with the date filters pushed into SQL."""
+    cfg = SEARCH_TABLES[stype]
+    join = "s.key = fts.key" if cfg["rowid_is_key"] else "s.id = fts.rowid"
+    where = [f"{cfg['fts']} MATCH ?"]
+    # Rows without a date are never filtered out (matches the old behaviour).
+    if has_after:
+        where.append(f"(COALESCE(s.{cfg['date_col']}, '') = '' OR s.{cfg['date_col']} >= ?)")
+    if has_before:
+        where.append(f"(COALESCE(s.{cfg['date_col']}, '') = '' OR s.{cfg['date_col']} <= ?)")
+    return f"""
+        SELECT s.*, fts.rank FROM {cfg['fts']} fts
+        JOIN {cfg['src']} s ON {join}
+        WHERE {' AND '.join(where)} ORDER BY fts.rank LIMIT ?
     """
-    Search across ALL memory tables using FTS5 ranked search.
-    Returns results sorted by relevance (BM25 score).
-    """
-    results = []
-    fts_query = _sanitize_fts_query(query)
 
-    search_configs = {
-        "short_term": {
-            "fts": "fts_short_term", "src": "short_term",
-            "date_col": "created_at", "rowid_is_key": True,
-            "display": lambda r: f"[STM - {r['key']}] {r['value'][:200]}"
-        },
-        "interactions": {
-            "fts": "fts_interactions", "src": "interactions",
-            "date_col": "date", "rowid_is_key": False,
-            "display": lambda r: f"[Interaction #{r['id']} - {r['date'][:10]}] {r['summary'][:200]}"
-        },
-        "facts": {
-            "fts": "fts_facts", "src": "facts",
-            "date_col": "created_at", "rowid_is_key": False,
-            "display": lambda r: f"[Fact - {r['category']}] {r['content'][:200]}"
-        },
-        "entities": {
-            "fts": "fts_entities", "src": "entities",
-            "date_col": "first_mentioned", "rowid_is_key": False,
-            "display": lambda r: f"[Entity - {r['type']}] {r['name']}: {r['details'][:150]}"
-        },
-        "decisions": {
-            "fts": "fts_decisions", "src": "decisions",
-            "date_col": "date", "rowid_is_key": False,
-            "display": lambda r: f"[Decision #{r['id']} - {r['status']}] {r['decision'][:200]}"
-        },
-        "insights": {
-            "fts": "fts_insights", "src": "insights",
-            "date_col": "date", "rowid_is_key": False,
-            "display": lambda r: f"[Insight - {r['category']}] {r['content'][:200]}"
-        },
-        "profile": {
-            "fts": "fts_profile", "src": "profile",
-            "date_col": "updated_at", "rowid_is_key": True,
-            "display": lambda r: f"[Profile - {r['key']}] {r['value'][:200]}"
-        },
-        "context": {
-            "fts": "fts_context", "src": "context",
-            "date_col": "updated_at", "rowid_is_key": True,
-            "display": lambda r: f"[Context - {r['key']}] {r['value'][:200]}"
-        },
-    }
 
-    types_to_search = [type_filter] if type_filter and type_filter in search_configs else list(search_configs.keys())
+class _ReadPool:
+    """Small pool of read-only connections to one database file."""
 
-    for stype in types_to_search:
-        cfg = search_configs[stype]
-        is_kv = cfg.get("rowid_is_key", False)
+    def __init__(self, path, size):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._idle.put(conn)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="memory-search")
 
+    def run(self, fn, *args):
+        conn = self._idle.get()
         try:
-            if is_kv:
-                sql = f"""
-                    SELECT s.*, fts.rank FROM {cfg['fts']} fts
-                    JOIN {cfg['src']} s ON s.key = fts.key
-                    WHERE {cfg['fts']} MATCH ? ORDER BY fts.rank LIMIT ?
-                """
-            else:
-                sql = f"""
-                    SELECT s.*, fts.rank FROM {cfg['fts']} fts
-                    JOIN {cfg['src']} s ON s.id = fts.rowid
-                    WHERE {cfg['fts']} MATCH ? ORDER BY fts.rank LIMIT ?
-                """
-            rows = conn.execute(sql, (fts_query, limit)).fetchall()
+            return fn(conn, *args)
+        finally:
+            self._idle.put(conn)
+
+
+_READ_POOLS = {}
+_READ_POOLS_LOCK = threading.Lock()
+
+def _get_read_pool(conn, size):
+    """Shared read-only pool for the database behind `conn`, or None for :memory:."""
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not db_file:
+        return None
+    with _READ_POOLS_LOCK:
+        pool = _READ_POOLS.get((db_file, size))
+        if pool is None:
+            pool = _READ_POOLS[(db_file, size)] = _ReadPool(db_file, size)
+        return pool
+
+
+def _search_table(conn, stype, fts_query, after, before, limit):
+    """Run one table's FTS query. Returns [(rank, stype, row)]."""
+    params = [fts_query]
+    if after:
+        params.append(after)
+    if before:
+        params.append(before)
+    params.append(limit)
+    try:
+        rows = conn.execute(_search_sql(stype, bool(after), bool(before)), params).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [(row["rank"], stype, row) for row in rows]
 
-            for row in rows:
-                r = dict(row)
-                date_val = r.get(cfg["date_col"], "")
-                if after and date_val and date_val < after:
-                    continue
-                if before and date_val and date_val > before:
-                    continue
-                results.append({
-                    "type": stype,
-                    "id": r.get("id") or r.get("key"),
-                    "score": abs(r.get("rank", 0)),
-                    "display": cfg["display"](r),
-                    "date": date_val,
-                    "data": {k: v for k, v in r.items() if k != "rank"}
-                })
-        except sqlite3.OperationalError:
-            continue
 
-    results.sort(key=lambda x: x["score"])
+def search(conn, query, type_filter=None, after=None, before=None, limit=20, workers=None):
+    """
+    Search across ALL memory tables using FTS5 ranked search.
+    Returns the `limit` best results, most relevant first (higher score =
+    better BM25 match). Date filters are applied in SQL before LIMIT.
+    With workers > 1 the per-table queries run concurrently on a pool of
+    read-only connections (file-backed databases only).
+    Repeated identical queries are answered from the result cache until a
+    searched table is written.
+    """
+    types_to_search = [type_filter] if type_filter and type_filter in SEARCH_TABLES else list(SEARCH_TABLES)
+    return _cached_result(
+        conn, ("search", query, type_filter, after, before, limit), types_to_search,
+        lambda: _search_uncached(conn, query, types_to_search, after, before, limit, workers),
+    )
+
+
+def _search_uncached(conn, query, types_to_search, after, before, limit, workers):
+    fts_query = _sanitize_fts_query(query)
+    workers = min(workers or SEARCH_WORKERS, len(types_to_search))
+
+    pool = _get_read_pool(conn, workers) if workers > 1 else None
+    if pool is not None:
+        futures = [
+            pool.executor.submit(pool.run, _search_table, stype, fts_query, after, before, limit)
+            for stype in types_to_search
+        ]
+        per_table = [f.result() for f in futures]
+    else:
+        per_table = [_search_table(conn, stype, fts_query, after, before, limit) for stype in types_to_search]
+
+    # FTS5 rank is negative BM25: the k smallest ranks are the k best matches.
+    top = heapq.nsmallest(limit, (hit for hits in per_table for hit in hits), key=lambda hit: hit[0])
+
+    results = []
+    for rank, stype, row in top:
+        cfg = SEARCH_TABLES[stype]
+        r = dict(row)
+        r.pop("rank", None)
+        results.append({
+            "type": stype,
+            "id": r.get("id") or r.get("key"),
+            "score": abs(rank),
+            "display": cfg["display"](r),
+            "date": r.get(cfg["date_col"], ""),
+            "data": r,
+        })
     return results
 
 
+def benchmark_search(rows=100000, queries=20, limit=20, workers=4):
+    """
+    Compare search() against the legacy implementation on a synthetic
+    file-backed database with `rows` rows spread over all eight tables.
+    Half the queries carry an --after filter to show the pushdown effect.
+    Timings bypass the result cache (its key ignores `workers`).
+    """
+    import random
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(3000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]  # Zipf-like term frequencies
+    def text(n=12):
+        return " ".join(rng.choices(vocab, weights, k=n))
+    def date():
+        return f"202{rng.randint(4, 6)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_db(Path(tmp) / "bench.db")
+        init_db(conn)
+        share = {"facts": 0.4, "interactions": 0.2, "entities": 0.1, "decisions": 0.1,
+                 "insights": 0.1, "short_term": 0.04, "profile": 0.03, "context": 0.03}
+        counts = {t: int(rows * f) for t, f in share.items()}
+        with conn:
+            conn.executemany("INSERT INTO facts (content, category, created_at) VALUES (?, 'bench', ?)",
+                             ((text(), date()) for _ in range(counts["facts"])))
+            conn.executemany("INSERT INTO interactions (summary, topics, date) VALUES (?, ?, ?)",
+                             ((text(), text(3), date()) for _ in range(counts["interactions"])))
+            conn.executemany("INSERT INTO entities (name, details, first_mentioned) VALUES (?, ?, ?)",
+                             ((f"entity {i}", text(), date()) for i in range(counts["entities"])))
+            conn.executemany("INSERT INTO decisions (decision, context, date) VALUES (?, ?, ?)",
+                             ((text(), text(6), date()) for _ in range(counts["decisions"])))
+            conn.executemany("INSERT INTO insights (content, date) VALUES (?, ?)",
+                             ((text(), date()) for _ in range(counts["insights"])))
+            for table, date_col in (("short_term", "created_at"), ("profile", "updated_at"), ("context", "updated_at")):
+                kv = [(f"{table}.{i}", text(), "bench", date()) for i in range(counts[table])]
+                conn.executemany(f"INSERT INTO {table} (key, value, category, {date_col}) VALUES (?, ?, ?, ?)", kv)
+                conn.executemany(f"INSERT INTO fts_{table} (key, value, category) VALUES (?, ?, ?)",
+                                 (r[:3] for r in kv))
+
+        plan = [(f"{rng.choice(vocab[:300])} {rng.choice(vocab[:300])}", "2026-01-01" if i % 2 else None)
+                for i in range(queries)]
+
+        def uncached(conn, query, after=None, limit=20, workers=None):
+            return _search_uncached(conn, query, list(SEARCH_TABLES), after, None, limit, workers)
+
+        def legacy(conn, query, after=None, limit=20):
+            # Baseline: the pre-pushdown search, one table after another with
+            # the date filter applied in Python after each table's LIMIT
+            results = []
+            for stype, cfg in SEARCH_TABLES.items():
+                try:
+                    rows = conn.execute(_search_sql(stype, False, False), (_sanitize_fts_query(query), limit))
+                except sqlite3.OperationalError:
+                    continue
+                for row in rows:
+                    r = dict(row)
+                    date_val = r.get(cfg["date_col"], "")
+                    if after and date_val and date_val < after:
+                        continue
+                    results.append({"type": stype, "id": r.get("id") or r.get("key"),
+                                    "score": abs(r.pop("rank", 0)), "display": cfg["display"](r)})
+            results.sort(key=lambda x: x["score"])
+            return results
+
+        def timed(fn, **kwargs):
+            start = time.perf_counter()
+            found = [fn(conn, q, after=after, limit=limit, **kwargs) for q, after in plan]
+            return round((time.perf_counter() - start) * 1000 / queries, 2), found
+
+        legacy_ms, legacy_found = timed(legacy)
+        seq_ms, found = timed(uncached, workers=1)
+        uncached(conn, "warmup", workers=workers)  # Open the read-only pool outside the timing
+        par_ms, _ = timed(uncached, workers=workers)
+        conn.close()
+        for key in [k for k in _READ_POOLS if k[0].startswith(tmp)]:
+            pool = _READ_POOLS.pop(key)
+            pool.executor.shutdown()
+            while not pool._idle.empty():
+                pool._idle.get().close()
+
+    # Best date-filtered matches that the legacy post-LIMIT filtering dropped
+    missed = sum(
+        len({(r["type"], r["id"]) for r in new} - {(r["type"], r["id"]) for r in old})
+        for (_, after), new, old in zip(plan, found, legacy_found) if after
+    )
+    return {
+        "rows": sum(counts.values()),
+        "queries": queries,
+        "legacy_ms": legacy_ms,
+        "sequential_ms": seq_ms,
+        f"concurrent_{workers}_ms": par_ms,
+        "date_filtered_hits_missed_by_legacy": missed,
+    }
+
+
 def _sanitize_fts_query(query):
     """Convert natural language query into valid FTS5 query."""
     if any(op in query for op in [' OR ', ' AND ', ' NOT ', '"', '*']):
@@ -836,6 +1252,7 @@ def get_status(conn):
             status[table] = count
         except sqlite3.OperationalError:
             status[table] = "missing"
+    status["cache"] = cache_stats()
     return status
 
 
@@ -843,10 +1260,16 @@ def get_status(conn):
 # EXPORT (dump entire memory as JSON)
 # ---------------------------------------------------------------------------
 
+EXPORT_TABLES = [
+    "short_term", "profile", "context", "interactions", "decisions",
+    "facts", "entities", "insights", "evaluation_log", "guardrail_log",
+]
+
+
 def export_all(conn):
     """Export all memory as a JSON-serializable dict."""
     output = {}
-    for table in ["short_term", "profile", "context", "interactions", "decisions", "facts", "entities", "insights", "evaluation_log", "guardrail_log"]:
+    for table in EXPORT_TABLES:
         try:
             rows = conn.execute(f"SELECT * FROM {table}").fetchall()
             output[table] = [dict(r) for r in rows]
@@ -855,37 +1278,788 @@ def export_all(conn):
     return output
 
 
+# ---------------------------------------------------------------------------
+# BULK IMPORT (export JSON, JSONL, legacy memory_bank.py files)
+# ---------------------------------------------------------------------------
+
+KV_TABLES = ("short_term", "profile", "context")
+FTS_TRIGGER_TABLES = ("interactions", "facts", "entities", "decisions", "insights")
+IMPORT_BATCH_SIZE = 5000
+
+
+def _open_text(path):
+    """Open a (possibly gzip-compressed) text file for reading."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8-sig")
+
+
+def _iter_export_json(f, chunk_size=1 << 16):
+    """
+    Yield (table, row) from an export_all() JSON object without loading the
+    whole document: the top-level object is scanned incrementally and each
+    row is decoded on its own.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buf, pos = buf[pos:] + data, 0
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                raise ValueError("unexpected end of export JSON")
+            fill()
+
+    def expect(ch):
+        nonlocal pos
+        if peek() != ch:
+            raise ValueError(f"expected {ch!r} at offset {pos} of export JSON")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        while True:
+            peek()
+            try:
+                result, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buf) and not eof and not isinstance(result, (dict, list, str)):
+                fill()  # A number/literal may continue in the next chunk
+                continue
+            pos = end
+            return result
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        table = value()
+        expect(":")
+        if peek() == "[":
+            pos += 1
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield table, value()
+                    if peek() == ",":
+                        pos += 1
+                        continue
+                    expect("]")
+                    break
+        else:
+            value()  # Not a table of rows; skip it
+        if peek() == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+def _iter_jsonl(f, table=None):
+    """Yield (table, row) from JSON lines; rows may name their table in "_table"."""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        row = json.loads(line)
+        yield row.pop("_table", table), row
+
+
+def _flatten_context(data, prefix=""):
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict) and value:
+            yield from _flatten_context(value, path)
+        else:
+            yield path, value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def _iter_legacy_memory_bank(path):
+    """Yield (table, row) from memory_bank.py files (context, logs, insights.md)."""
+    path = Path(path)
+    files = [path / name for name in ("context.json", "interaction_log.json",
+                                      "decision_journal.json", "insights.md")] if path.is_dir() else [path]
+    for file in files:
+        if not file.exists():
+            continue
+        if file.suffix == ".md":
+            date, category = "", "general"
+            for line in file.read_text(encoding="utf-8").splitlines():
+                header = re.match(r"^###\s+(\d{4}-\d{2}-\d{2})(?:\s+\[(.+?)\])?", line)
+                if header:
+                    date, category = header.group(1), header.group(2) or "general"
+                elif line.startswith("- ") and date:
+                    yield "insights", {"content": line[2:].strip(), "category": category, "date": date}
+            continue
+        data = json.loads(file.read_text(encoding="utf-8-sig") or "{}")
+        if "interactions" in data:
+            for e in data["interactions"]:
+                yield "interactions", {
+                    "date": e.get("date", ""), "summary": e.get("summary", ""),
+                    "topics": ",".join(e.get("topics") or []),
+                    "advice": "; ".join(e.get("advice_given") or []),
+                    "follow_ups": ",".join(e.get("follow_ups") or []),
+                }
+        elif "decisions" in data:
+            for e in data["decisions"]:
+                yield "decisions", {
+                    "date": e.get("date", ""), "decision": e.get("decision", ""),
+                    "context": e.get("context") or "", "reasoning": e.get("reasoning") or "",
+                    "expected_outcome": e.get("expected_outcome") or "",
+                    "actual_outcome": e.get("actual_outcome") or "",
+                    "status": e.get("status", "pending"), "outcome_date": e.get("outcome_date"),
+                }
+        else:
+            for key, value in _flatten_context(data):
+                yield "context", {"key": key, "value": value, "category": "imported"}
+
+
+def iter_import_rows(path, table=None):
+    """Pick a reader for `path` by name/shape and yield (table, row) tuples."""
+    path = Path(path)
+    name = path.name.lower()
+    if path.is_dir() or name in ("context.json", "interaction_log.json", "decision_journal.json", "insights.md"):
+        yield from _iter_legacy_memory_bank(path)
+    elif name.endswith((".jsonl", ".jsonl.gz", ".ndjson")):
+        default_table = table or name.split(".")[0]
+        with _open_text(path) as f:
+            yield from _iter_jsonl(f, default_table)
+    else:
+        with _open_text(path) as f:
+            yield from _iter_export_json(f)
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(table, columns, keep_ids, replace=False):
+    cols = ", ".join(columns)
+    marks = ", ".join("?" for _ in columns)
+    if replace:
+        return f"INSERT OR REPLACE INTO {table} ({cols}) VALUES ({marks})"
+    conflict = {"entities": "name", **{t: "key" for t in KV_TABLES}}.get(table)
+    if conflict:
+        updates = ", ".join(f"{c}=excluded.{c}" for c in columns if c not in (conflict, "id"))
+        action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        return f"INSERT INTO {table} ({cols}) VALUES ({marks}) ON CONFLICT({conflict}) {action}"
+    verb = "INSERT OR IGNORE" if keep_ids else "INSERT"
+    return f"{verb} INTO {table} ({cols}) VALUES ({marks})"
+
+
+def bulk_insert(conn, rows, table=None, batch_size=None, defer_fts=False, keep_ids=False,
+                replace=False, progress=True):
+    """
+    Insert many rows with executemany, committing once per `batch_size` rows.
+
+    `rows` yields dicts (all for `table`) or (table, dict) tuples when table
+    is None. Unknown tables/columns are skipped; list/dict values are stored
+    as JSON. Row ids are dropped unless keep_ids=True (then clashing ids are
+    ignored); entities and key-value tables are upserted by name/key.
+    replace=True (used by snapshot restore) overwrites any clashing row; pair
+    it with defer_fts so the FTS rebuild drops the replaced rows' entries.
+    With defer_fts=True the FTS insert/update triggers are suspended and
+    each touched FTS index is rebuilt once at the end.
+    Returns {"rows", "skipped", "tables", "seconds", "rows_per_s"}.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    columns_of = {
+        t: [r["name"] for r in conn.execute(f"PRAGMA table_info({t})")] for t in EXPORT_TABLES
+    }
+    stats = {"rows": 0, "skipped": 0, "tables": {}}
+    pending, pending_rows = {}, 0
+    start = last_report = time.perf_counter()
+
+    def flush():
+        nonlocal pending, pending_rows
+        with conn:
+            for (t, cols), values in pending.items():
+                conn.executemany(_insert_sql(t, cols, keep_ids, replace), values)
+        pending, pending_rows = {}, 0
+
+    suspended = {}
+    if defer_fts:
+        for t in FTS_TRIGGER_TABLES:
+            for suffix in ("ai", "au"):
+                name = f"trg_{t}_{suffix}"
+                row = conn.execute("SELECT sql FROM sqlite_master WHERE type='trigger' AND name=?", (name,)).fetchone()
+                if row:
+                    suspended[name] = row["sql"]
+        with conn:
+            for name in suspended:
+                conn.execute(f"DROP TRIGGER {name}")
+
+    try:
+        for item in rows:
+            t, row = (table, item) if table else item
+            if t not in columns_of or not isinstance(row, dict):
+                stats["skipped"] += 1
+                continue
+            cols = tuple(c for c in columns_of[t] if c in row and (keep_ids or c != "id"))
+            if not cols:
+                stats["skipped"] += 1
+                continue
+            values = tuple(
+                json.dumps(row[c], ensure_ascii=False) if isinstance(row[c], (list, dict)) else row[c]
+                for c in cols
+            )
+            pending.setdefault((t, cols), []).append(values)
+            pending_rows += 1
+            stats["rows"] += 1
+            stats["tables"][t] = stats["tables"].get(t, 0) + 1
+            if pending_rows >= batch_size:
+                flush()
+                now = time.perf_counter()
+                if progress and now - last_report >= 2.0:
+                    last_report = now
+                    print(f"  import: {stats['rows']} rows ({stats['rows'] / (now - start):.0f} rows/s)",
+                          file=sys.stderr)
+        if pending:
+            flush()
+    finally:
+        # Restore triggers and rebuild FTS even if the import stopped half-way.
+        # IF NOT EXISTS: a concurrent init_db may already have recreated them.
+        rebuild = [t for t in stats["tables"] if t in KV_TABLES or (suspended and t in FTS_TRIGGER_TABLES)]
+        with conn:
+            for sql in suspended.values():
+                conn.execute(re.sub(r"^\s*CREATE\s+TRIGGER\s+", "CREATE TRIGGER IF NOT EXISTS ", sql, flags=re.I))
+        for t in rebuild:
+            with conn:
+                conn.execute(f"INSERT INTO fts_{t}(fts_{t}) VALUES('rebuild')")
+        _bump_generation(*stats["tables"])
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_s"] = round(stats["rows"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def import_files(conn, paths, table=None, **kwargs):
+    """Import one or more files/directories in a single bulk_insert pass."""
+    def rows():
+        for path in paths:
+            yield from iter_import_rows(path, table)
+    stats = bulk_insert(conn, rows(), **kwargs)
+    print(f"Imported {stats['rows']} rows in {stats['seconds']}s ({stats['rows_per_s']} rows/s).")
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# SNAPSHOTS (streaming JSONL export / restore, full or incremental)
+# ---------------------------------------------------------------------------
+# A snapshot is a directory <root>/<YYYYmmddTHHMMSSfff>/ holding one
+# <table>.jsonl[.gz] per table plus manifest.json. Incremental snapshots
+# hold rows whose change column is >= the previous snapshot time (minus
+# SNAPSHOT_OVERLAP_SECONDS for writers that were in flight); deletions are
+# not tracked, so take a full snapshot after pruning/deduplication.
+
+SNAPSHOT_CHUNK_SIZE = 5000
+SNAPSHOT_OVERLAP_SECONDS = 60
+SNAPSHOT_GZIP_LEVEL = 6
+SNAPSHOT_CHANGE_COLUMNS = {
+    "profile": "updated_at",
+    "context": "updated_at",
+    "interactions": "date",
+    "decisions": "COALESCE(outcome_date, date)",
+    "facts": "updated_at",
+    "entities": "updated_at",
+    "insights": "date",
+    "evaluation_log": "date",
+    "guardrail_log": "date",
+    # short_term is small and its upsert keeps created_at: always exported in full
+}
+
+
+def _read_manifests(root):
+    """Manifests of the snapshots under `root` (or `root` itself), oldest first."""
+    root = Path(root)
+    paths = [root / "manifest.json"] if (root / "manifest.json").exists() else sorted(root.glob("*/manifest.json"))
+    manifests = []
+    for path in paths:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        manifest["path"] = str(path.parent)
+        manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m["created_at"])
+
+
+def snapshot_export(conn, root, since=None, incremental=False, compress=True,
+                    tables=None, chunk_size=None):
+    """
+    Stream every table to <root>/<timestamp>/<table>.jsonl[.gz] in chunks.
+
+    All tables are read inside one read transaction, so the snapshot is
+    consistent while other processes keep writing. `since` (a SQLite
+    datetime) or incremental=True (use the newest snapshot in `root`)
+    limits the export to rows changed since then. Returns the manifest.
+    """
+    chunk_size = chunk_size or SNAPSHOT_CHUNK_SIZE
+    if incremental and since is None:
+        previous = _read_manifests(root)
+        if previous:
+            since = conn.execute(
+                "SELECT datetime(?, ?)", (previous[-1]["created_at"], f"-{SNAPSHOT_OVERLAP_SECONDS} seconds")
+            ).fetchone()[0]
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN")
+    try:
+        created_at = conn.execute("SELECT strftime('%Y-%m-%d %H:%M:%f', 'now')").fetchone()[0]
+        out_dir = Path(root) / created_at.replace("-", "").replace(":", "").replace(" ", "T").replace(".", "")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {"format": 1, "created_at": created_at, "since": since, "tables": {}}
+        suffix = ".jsonl.gz" if compress else ".jsonl"
+        for table in tables or EXPORT_TABLES:
+            sql, params = f"SELECT * FROM {table}", ()
+            change_col = SNAPSHOT_CHANGE_COLUMNS.get(table)
+            if since and change_col:
+                sql += f" WHERE datetime({change_col}) >= datetime(?) OR datetime({change_col}) IS NULL"
+                params = (since,)
+            path = out_dir / f"{table}{suffix}"
+            if compress:
+                opener = gzip.open(path, "wt", encoding="utf-8", compresslevel=SNAPSHOT_GZIP_LEVEL)
+            else:
+                opener = open(path, "w", encoding="utf-8")
+            count = 0
+            with opener as f:
+                try:
+                    cursor = conn.execute(sql, params)
+                except sqlite3.OperationalError:
+                    cursor = None
+                while cursor:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    f.writelines(json.dumps(dict(r), default=str, ensure_ascii=False) + "\n" for r in rows)
+                    count += len(rows)
+            manifest["tables"][table] = {"file": path.name, "rows": count}
+    finally:
+        conn.rollback()
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    manifest["path"] = str(out_dir)
+    return manifest
+
+
+def snapshot_restore(conn, root, batch_size=None, progress=True):
+    """
+    Replay snapshots into `conn`: the newest full snapshot under `root`,
+    then every later incremental one, in order. Rows keep their ids and
+    replace existing rows with the same id/key. Returns bulk_insert stats.
+    """
+    manifests = _read_manifests(root)
+    full = [i for i, m in enumerate(manifests) if not m.get("since")]
+    if not full:
+        raise ValueError(f"no full snapshot found under {root}")
+    chain = manifests[full[-1]:]
+
+    def rows():
+        for manifest in chain:
+            for table, info in manifest["tables"].items():
+                yield from iter_import_rows(Path(manifest["path"]) / info["file"], table)
+
+    stats = bulk_insert(conn, rows(), batch_size=batch_size, defer_fts=True, keep_ids=True,
+                        replace=True, progress=progress)
+    stats["snapshots"] = [m["path"] for m in chain]
+    return stats
+
+
 # ---------------------------------------------------------------------------
 # SEMANTIC / EMBEDDING SEARCH (optional — requires sentence-transformers)
 # ---------------------------------------------------------------------------
 
+class EmbeddingMatrix:
+    """
+    In-memory float32 matrix of every row in `embeddings` for one connection.
+
+    Loaded once, then kept in sync by embed_store / _embed_delete so that
+    top-k search is a single matrix-vector product plus argpartition.
+    Rows are keyed by (source_table, source_id); deletes swap in the last row.
+    If an IVF index file sits next to the database it is attached as `ann`
+    and kept in sync with the same upserts and removals.
+    """
+
+    def __init__(self, conn):
+        self.dim = 0
+        self.size = 0
+        self.ann = None
+        self._vecs = None
+        self._codes = None
+        self._keys = []
+        self._rows = {}
+        self._table_codes = {}
+        self.load(conn)
+
+    def load(self, conn):
+        """(Re)load the full matrix from the embeddings table."""
+        rows = conn.execute(
+            "SELECT source_table, source_id, text_hash, embedding FROM embeddings ORDER BY id"
+        ).fetchall()
+        self.dim = len(rows[0]["embedding"]) // 4 if rows else 0
+        self.size = 0
+        self.ann = None
+        self._vecs = np.empty((max(len(rows), 64), self.dim), dtype=np.float32)
+        self._codes = np.empty(self._vecs.shape[0], dtype=np.int16)
+        self._keys = []
+        self._rows = {}
+        for row in rows:
+            self.upsert(row["source_table"], row["source_id"], row["embedding"])
+
+        index_path = _ann_index_path(conn)
+        if index_path is not None and index_path.exists():
+            ann = IVFIndex.load(index_path)
+            if ann.centroids.shape[1] == self.dim:
+                hashes = {(r["source_table"], r["source_id"]): r["text_hash"] for r in rows}
+                ann.reconcile(self, hashes)
+                self.ann = ann
+        self._data_version = self._get_data_version(conn)
+        self._generation = _embedding_generation(conn)
+
+    @staticmethod
+    def _get_data_version(conn):
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self, conn):
+        """Reload if another connection has changed the embeddings table."""
+        data_version = self._get_data_version(conn)
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        # Another connection committed; reload only if it touched embeddings
+        generation = _embedding_generation(conn)
+        if generation is None or generation != self._generation:
+            self.load(conn)
+
+    def note_local_write(self, before, after):
+        """Adopt the generation after our own write, unless an unseen write preceded it."""
+        if before is not None and before == self._generation:
+            self._generation = after
+
+    def _table_code(self, source_table):
+        if source_table not in self._table_codes:
+            self._table_codes[source_table] = len(self._table_codes)
+        return self._table_codes[source_table]
+
+    def upsert(self, source_table, source_id, emb_bytes, text_hash=""):
+        """Insert or replace one vector. Vectors of a foreign dimension are skipped."""
+        vec = np.frombuffer(emb_bytes, dtype=np.float32)
+        if not self.dim:
+            self.dim = vec.shape[0]
+            self._vecs = np.empty((self._vecs.shape[0], self.dim), dtype=np.float32)
+        if vec.shape[0] != self.dim:
+            return
+        key = (source_table, str(source_id))
+        row = self._rows.get(key)
+        if row is None:
+            if self.size == self._vecs.shape[0]:
+                grow = self._vecs.shape[0] * 2
+                self._vecs = np.resize(self._vecs, (grow, self.dim))
+                self._codes = np.resize(self._codes, grow)
+            row = self.size
+            self.size += 1
+            self._rows[key] = row
+            self._keys.append(key)
+        self._vecs[row] = vec
+        self._codes[row] = self._table_code(source_table)
+        if self.ann is not None:
+            self.ann.add(key, vec, text_hash)
+
+    def remove(self, source_table, source_id):
+        """Drop one vector, moving the last row into its slot."""
+        key = (source_table, str(source_id))
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        if self.ann is not None:
+            self.ann.remove(key)
+        last = self.size - 1
+        if row != last:
+            moved = self._keys[last]
+            self._vecs[row] = self._vecs[last]
+            self._codes[row] = self._codes[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+        self.size -= 1
+
+    def search(self, query_vec, top_k=10, source_table=None, exact=False, nprobe=None):
+        """
+        Return [(source_table, source_id, similarity)] best-first.
+        Uses the IVF index when attached and large enough, unless exact=True.
+        """
+        if self.size == 0 or top_k <= 0:
+            return []
+        code = None
+        if source_table:
+            code = self._table_codes.get(source_table)
+            if code is None:
+                return []
+
+        candidates = None
+        if self.ann is not None and not exact and self.size >= ANN_MIN_ROWS:
+            candidates = self.ann.candidate_rows(query_vec, self._rows, nprobe or ANN_NPROBE)
+            if code is not None:
+                candidates = candidates[self._codes[candidates] == code]
+            if candidates.shape[0] < top_k:
+                candidates = None  # Too few probed rows; answer exactly instead
+        if candidates is None and code is not None:
+            candidates = np.flatnonzero(self._codes[:self.size] == code)
+
+        vecs = self._vecs[:self.size]
+        sims = vecs[candidates] @ query_vec if candidates is not None else vecs @ query_vec
+        k = min(top_k, sims.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        rows = candidates[top] if candidates is not None else top
+        return [(*self._keys[r], float(sims[i])) for r, i in zip(rows, top)]
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over the embedding matrix.
+
+    Spherical k-means centroids partition the vectors into posting lists;
+    a query only scores the rows in its `nprobe` nearest lists. The index
+    stores assignments, not vectors, and is persisted as <db>.ann.npz.
+    """
+
+    def __init__(self, centroids, built_rows=0):
+        self.centroids = centroids
+        self.built_rows = built_rows
+        self.dirty = False
+        self._lists = [set() for _ in range(centroids.shape[0])]
+        self._assign = {}
+        self._hashes = {}
+
+    @classmethod
+    def build(cls, keys, vecs, hashes, nlist=None, iters=10, seed=0):
+        """Train centroids with spherical k-means and assign every vector."""
+        n = vecs.shape[0]
+        nlist = max(1, min(n, nlist or int(4 * n ** 0.5)))
+        rng = np.random.default_rng(seed)
+        train = vecs if n <= nlist * 64 else vecs[rng.choice(n, nlist * 64, replace=False)]
+        centroids = train[rng.choice(train.shape[0], nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = cls._nearest(train, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            empty = np.bincount(assign, minlength=nlist) == 0
+            sums[empty] = train[rng.choice(train.shape[0], int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        index = cls(centroids.astype(np.float32), built_rows=n)
+        for key, list_id in zip(keys, cls._nearest(vecs, index.centroids)):
+            index._put(key, int(list_id), hashes.get(key, ""))
+        index.dirty = True
+        return index
+
+    @staticmethod
+    def _nearest(vecs, centroids, chunk=4096):
+        """Nearest-centroid id for each row, in bounded-memory chunks."""
+        out = np.empty(vecs.shape[0], dtype=np.int32)
+        for start in range(0, vecs.shape[0], chunk):
+            out[start:start + chunk] = np.argmax(vecs[start:start + chunk] @ centroids.T, axis=1)
+        return out
+
+    @property
+    def nlist(self):
+        return self.centroids.shape[0]
+
+    def _put(self, key, list_id, text_hash):
+        old = self._assign.get(key)
+        if old is not None:
+            self._lists[old].discard(key)
+        self._lists[list_id].add(key)
+        self._assign[key] = list_id
+        self._hashes[key] = text_hash or ""
+
+    def add(self, key, vec, text_hash=""):
+        """Assign one (new or changed) vector to its nearest list."""
+        self._put(key, int(np.argmax(self.centroids @ vec)), text_hash)
+        self.dirty = True
+
+    def remove(self, key):
+        list_id = self._assign.pop(key, None)
+        if list_id is not None:
+            self._lists[list_id].discard(key)
+            self._hashes.pop(key, None)
+            self.dirty = True
+
+    def reconcile(self, matrix, hashes):
+        """Bring a persisted index up to date with the loaded matrix."""
+        stale = [k for k in self._assign if k not in matrix._rows]
+        for key in stale:
+            self.remove(key)
+        changed = [k for k in matrix._keys if self._hashes.get(k) != hashes.get(k) or k not in self._assign]
+        if changed:
+            rows = np.fromiter((matrix._rows[k] for k in changed), dtype=np.int64, count=len(changed))
+            for key, list_id in zip(changed, self._nearest(matrix._vecs[rows], self.centroids)):
+                self._put(key, int(list_id), hashes.get(key, ""))
+            self.dirty = True
+
+    def candidate_rows(self, query_vec, rows, nprobe):
+        """Matrix rows in the `nprobe` lists closest to the query."""
+        nprobe = min(nprobe, self.nlist)
+        sims = self.centroids @ query_vec
+        probe = np.argpartition(-sims, nprobe - 1)[:nprobe]
+        return np.fromiter(
+            (rows[k] for list_id in probe for k in self._lists[list_id] if k in rows),
+            dtype=np.int64,
+        )
+
+    def save(self, path):
+        keys = list(self._assign)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                built_rows=np.array(self.built_rows),
+                tables=np.array([k[0] for k in keys], dtype=str),
+                ids=np.array([k[1] for k in keys], dtype=str),
+                hashes=np.array([self._hashes.get(k, "") for k in keys], dtype=str),
+                lists=np.array([self._assign[k] for k in keys], dtype=np.int32),
+            )
+        os.replace(tmp, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(data["centroids"], built_rows=int(data["built_rows"]))
+            for table, sid, text_hash, list_id in zip(
+                data["tables"].tolist(), data["ids"].tolist(),
+                data["hashes"].tolist(), data["lists"].tolist()
+            ):
+                index._put((table, sid), list_id, text_hash)
+        return index
+
+
+def _ann_index_path(conn):
+    """Path of the IVF index file next to the database, or None for :memory:."""
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not db_file:
+        return None
+    return Path(db_file).with_suffix(".ann.npz")
+
+
+def _flush_ann_index(conn):
+    """Persist incremental IVF index changes made on this connection."""
+    matrix = _get_embedding_matrix(conn, create=False)
+    if matrix is None or matrix.ann is None or not matrix.ann.dirty:
+        return
+    path = _ann_index_path(conn)
+    if path is not None:
+        matrix.ann.save(path)
+
+
+_EMBED_MATRICES = {}
+
+def _get_embedding_matrix(conn, create=True):
+    """Return the connection's EmbeddingMatrix, loading it on first use."""
+    if np is None:
+        return None
+    return _per_connection(_EMBED_MATRICES, conn, EmbeddingMatrix, create)
+
+
+def _embedding_generation(conn):
+    """Current embeddings write counter, or None on a database from before it existed."""
+    try:
+        row = conn.execute("SELECT generation FROM embedding_generation WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _text_hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
 def embed_store(conn, source_table, source_id, text):
     """Compute and store an embedding for a piece of text."""
     emb = _embed_text(text)
     if emb is None:
         return False
-    text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-    conn.execute("""
+    _embed_store_many(conn, source_table, [(source_id, _text_hash(text), emb)])
+    conn.commit()
+    return True
+
+
+def _embed_store_many(conn, source_table, items):
+    """Upsert (source_id, text_hash, embedding) tuples (caller commits)."""
+    matrix = _get_embedding_matrix(conn, create=False)
+    before = _embedding_generation(conn) if matrix is not None else None
+    conn.executemany("""
         INSERT INTO embeddings (source_table, source_id, text_hash, embedding)
         VALUES (?, ?, ?, ?)
         ON CONFLICT(source_table, source_id) DO UPDATE SET
             embedding=excluded.embedding, text_hash=excluded.text_hash, created_at=datetime('now')
-    """, (source_table, str(source_id), text_hash, emb))
-    conn.commit()
-    return True
+    """, [(source_table, str(sid), text_hash, emb) for sid, text_hash, emb in items])
+    _bump_generation("embeddings")
+    if matrix is not None:
+        for sid, text_hash, emb in items:
+            matrix.upsert(source_table, sid, emb, text_hash)
+        matrix.note_local_write(before, _embedding_generation(conn))
+
+
+def _embed_delete(conn, source_table, source_ids):
+    """Delete embeddings for the given source rows (caller commits)."""
+    matrix = _get_embedding_matrix(conn, create=False)
+    before = _embedding_generation(conn) if matrix is not None else None
+    conn.executemany(
+        "DELETE FROM embeddings WHERE source_table=? AND source_id=?",
+        [(source_table, str(sid)) for sid in source_ids]
+    )
+    _bump_generation("embeddings")
+    if matrix is not None:
+        for sid in source_ids:
+            matrix.remove(source_table, sid)
+        matrix.note_local_write(before, _embedding_generation(conn))
 
 
-def embed_search(conn, query, top_k=10, source_table=None):
+def embed_search(conn, query, top_k=10, source_table=None, exact=False):
     """
     Semantic search across stored embeddings.
     Returns top_k results ranked by cosine similarity.
+    Uses the IVF index if one was built (embed-reindex), unless exact=True.
     Requires sentence-transformers to be installed.
     """
-    query_emb = _embed_text(query)
+    query_emb = _embed_query(query)
     if query_emb is None:
         print("Embedding model not available. Install: pip install sentence-transformers")
         return []
+    return _embed_search_vector(conn, query_emb, top_k, source_table, exact)
+
+
+def _embed_search_vector(conn, query_emb, top_k=10, source_table=None, exact=False, nprobe=None):
+    """Rank stored embeddings against an already-embedded query."""
+    matrix = _get_embedding_matrix(conn)
+    if matrix is not None:
+        matrix.refresh(conn)
+        query_vec = np.frombuffer(query_emb, dtype=np.float32)
+        if matrix.dim in (0, query_vec.shape[0]):
+            return [
+                {"source_table": table, "source_id": sid, "similarity": round(sim, 4)}
+                for table, sid, sim in matrix.search(query_vec, top_k, source_table, exact, nprobe)
+            ]
+    return _embed_search_scan(conn, query_emb, top_k, source_table)
+
 
+def _embed_search_scan(conn, query_emb, top_k=10, source_table=None):
+    """Pure-Python row-by-row scan. Fallback when NumPy is unavailable."""
     sql = "SELECT * FROM embeddings"
     params = []
     if source_table:
@@ -905,69 +2079,226 @@ def embed_search(conn, query, top_k=10, source_table=None):
     return scored[:top_k]
 
 
-def embed_sync(conn):
+def _synthetic_embedding_db(rows, dim, clusters=0, seed=0):
     """
-    Sync embeddings for all facts, insights, and entities.
-    Skips entries that already have up-to-date embeddings.
+    In-memory database filled with random unit vectors spread over four
+    source tables. With clusters > 0 the vectors are drawn around that many
+    centres, which resembles real sentence embeddings more closely.
     """
-    if _get_embedder() is None:
-        print("Embedding model not available. Install: pip install sentence-transformers")
-        return
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((rows, dim)).astype(np.float32)
+    if clusters:
+        centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+        vecs = centres[rng.integers(0, clusters, rows)] + 0.6 * vecs
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    tables = ["facts", "insights", "entities", "interactions"]
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    init_db(conn)
+    conn.executemany(
+        "INSERT INTO embeddings (source_table, source_id, text_hash, embedding) VALUES (?, ?, '', ?)",
+        ((tables[i % len(tables)], str(i), vecs[i].tobytes()) for i in range(rows))
+    )
+    conn.commit()
+    return conn, vecs
 
-    synced = 0
-    # Facts
-    for row in conn.execute("SELECT id, content, category, entity, tags FROM facts").fetchall():
-        text = f"{row['content']} [{row['category']}] {row['entity']} {row['tags']}"
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        existing = conn.execute(
-            "SELECT text_hash FROM embeddings WHERE source_table='facts' AND source_id=?",
-            (str(row["id"]),)
-        ).fetchone()
-        if existing and existing["text_hash"] == text_hash:
-            continue
-        if embed_store(conn, "facts", row["id"], text):
-            synced += 1
-
-    # Insights
-    for row in conn.execute("SELECT id, content, category FROM insights").fetchall():
-        text = f"{row['content']} [{row['category']}]"
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        existing = conn.execute(
-            "SELECT text_hash FROM embeddings WHERE source_table='insights' AND source_id=?",
-            (str(row["id"]),)
-        ).fetchone()
-        if existing and existing["text_hash"] == text_hash:
-            continue
-        if embed_store(conn, "insights", row["id"], text):
-            synced += 1
-
-    # Entities
-    for row in conn.execute("SELECT id, name, type, details, tags FROM entities").fetchall():
-        text = f"{row['name']} ({row['type']}): {row['details']} {row['tags']}"
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        existing = conn.execute(
-            "SELECT text_hash FROM embeddings WHERE source_table='entities' AND source_id=?",
-            (str(row["id"]),)
-        ).fetchone()
-        if existing and existing["text_hash"] == text_hash:
-            continue
-        if embed_store(conn, "entities", row["id"], text):
-            synced += 1
-
-    # Interactions
-    for row in conn.execute("SELECT id, summary, topics FROM interactions").fetchall():
-        text = f"{row['summary']} {row['topics']}"
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        existing = conn.execute(
-            "SELECT text_hash FROM embeddings WHERE source_table='interactions' AND source_id=?",
-            (str(row["id"]),)
-        ).fetchone()
-        if existing and existing["text_hash"] == text_hash:
-            continue
-        if embed_store(conn, "interactions", row["id"], text):
-            synced += 1
 
-    print(f"Synced {synced} embeddings.")
+def benchmark_embed_search(rows=50000, dim=384, queries=20, top_k=10):
+    """
+    Compare the NumPy matrix against the pure-Python scan on a synthetic
+    in-memory database of random unit vectors. No embedding model needed.
+    """
+    if np is None:
+        print("NumPy not available. Install: pip install numpy")
+        return {}
+    rng = np.random.default_rng(0)
+    conn, vecs = _synthetic_embedding_db(rows, dim)
+    query_embs = [vecs[i].tobytes() for i in rng.integers(0, rows, queries)]
+
+    start = time.perf_counter()
+    matrix = _get_embedding_matrix(conn)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [_embed_search_vector(conn, q, top_k, exact=True) for q in query_embs]
+    matrix_s = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    slow = [_embed_search_scan(conn, q, top_k) for q in query_embs]
+    scan_s = (time.perf_counter() - start) / queries
+
+    agree = sum(
+        [r["source_id"] for r in a] == [r["source_id"] for r in b]
+        for a, b in zip(fast, slow)
+    )
+    conn.close()
+    return {
+        "rows": rows,
+        "dim": dim,
+        "queries": queries,
+        "matrix_load_ms": round(load_s * 1000, 2),
+        "matrix_query_ms": round(matrix_s * 1000, 3),
+        "scan_query_ms": round(scan_s * 1000, 3),
+        "speedup": round(scan_s / matrix_s, 1) if matrix_s else None,
+        "identical_top_k": f"{agree}/{queries}",
+        "matrix_rows": matrix.size,
+    }
+
+
+def embed_reindex(conn, nlist=None, iters=10):
+    """
+    (Re)build the IVF index from all stored embeddings and persist it next
+    to the database. Afterwards embed_store/embed_sync keep it up to date.
+    """
+    matrix = _get_embedding_matrix(conn)
+    if matrix is None:
+        print("NumPy not available. Install: pip install numpy")
+        return {}
+    matrix.refresh(conn)
+    if matrix.size == 0:
+        print("No embeddings to index. Run embed-sync first.")
+        return {}
+    hashes = {
+        (r["source_table"], r["source_id"]): r["text_hash"]
+        for r in conn.execute("SELECT source_table, source_id, text_hash FROM embeddings")
+    }
+    start = time.perf_counter()
+    matrix.ann = IVFIndex.build(matrix._keys, matrix._vecs[:matrix.size], hashes, nlist, iters)
+    build_s = time.perf_counter() - start
+    _flush_ann_index(conn)
+    sizes = [len(lst) for lst in matrix.ann._lists]
+    return {
+        "rows": matrix.size,
+        "nlist": matrix.ann.nlist,
+        "largest_list": max(sizes),
+        "build_s": round(build_s, 2),
+        "index_file": str(_ann_index_path(conn) or "(in-memory)"),
+    }
+
+
+def ann_recall_report(conn, top_k=10, queries=100, nprobes=(1, 2, 4, 8, 16, 32, 64)):
+    """
+    Recall@k and latency of IVF search at several nprobe settings, measured
+    against exact search. Queries are stored vectors with a little noise.
+    """
+    matrix = _get_embedding_matrix(conn)
+    if matrix is None or matrix.ann is None:
+        print("No IVF index. Run embed-reindex first.")
+        return []
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, matrix.size, queries)
+    noise = rng.standard_normal((queries, matrix.dim)).astype(np.float32) / (2 * matrix.dim ** 0.5)
+    qvecs = matrix._vecs[picks] + noise
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+
+    def timed(**kwargs):
+        start = time.perf_counter()
+        found = [{(t, i) for t, i, _ in matrix.search(q, top_k, **kwargs)} for q in qvecs]
+        return found, (time.perf_counter() - start) * 1000 / queries
+
+    # ANN_MIN_ROWS only gates automatic use; the report always exercises the index
+    global ANN_MIN_ROWS
+    saved_min_rows, ANN_MIN_ROWS = ANN_MIN_ROWS, 0
+    try:
+        truth, exact_ms = timed(exact=True)
+        report = [{"nprobe": "exact", "recall_at_k": 1.0, "query_ms": round(exact_ms, 3)}]
+        for nprobe in nprobes:
+            if nprobe > matrix.ann.nlist:
+                break
+            found, ms = timed(nprobe=nprobe)
+            recall = sum(len(f & t) for f, t in zip(found, truth)) / (top_k * queries)
+            report.append({"nprobe": nprobe, "recall_at_k": round(recall, 4), "query_ms": round(ms, 3)})
+    finally:
+        ANN_MIN_ROWS = saved_min_rows
+    return report
+
+
+# Source tables kept in sync by embed_sync: (SELECT, text builder)
+EMBED_SOURCES = {
+    "facts": (
+        "SELECT id, content, category, entity, tags FROM facts",
+        lambda r: f"{r['content']} [{r['category']}] {r['entity']} {r['tags']}",
+    ),
+    "insights": (
+        "SELECT id, content, category FROM insights",
+        lambda r: f"{r['content']} [{r['category']}]",
+    ),
+    "entities": (
+        "SELECT id, name, type, details, tags FROM entities",
+        lambda r: f"{r['name']} ({r['type']}): {r['details']} {r['tags']}",
+    ),
+    "interactions": (
+        "SELECT id, summary, topics FROM interactions",
+        lambda r: f"{r['summary']} {r['topics']}",
+    ),
+}
+
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "64"))
+
+
+def embed_sync(conn, batch_size=None, progress=True):
+    """
+    Sync embeddings for all facts, insights, entities and interactions.
+
+    Streams each table once, compares against a single bulk lookup of the
+    stored text hashes, and embeds only new/changed rows in batches: one
+    model.encode call and one transaction per batch.
+    Returns {"scanned", "embedded", "seconds", "rows_per_s", "tables"}.
+    """
+    if _get_embedder() is None:
+        print("Embedding model not available. Install: pip install sentence-transformers")
+        return {}
+
+    batch_size = batch_size or EMBED_BATCH_SIZE
+    stats = {"scanned": 0, "embedded": 0, "tables": {}}
+    start = last_report = time.perf_counter()
+
+    def flush(table, batch):
+        embs = _embed_texts([text for _, _, text in batch], batch_size)
+        with conn:
+            _embed_store_many(conn, table, [
+                (sid, text_hash, emb) for (sid, text_hash, _), emb in zip(batch, embs)
+            ])
+        stats["embedded"] += len(batch)
+        stats["tables"][table] += len(batch)
+
+    for table, (sql, build_text) in EMBED_SOURCES.items():
+        stats["tables"][table] = 0
+        stored = dict(conn.execute(
+            "SELECT source_id, text_hash FROM embeddings WHERE source_table = ?", (table,)
+        ).fetchall())
+        cur = conn.execute(sql)
+        batch = []
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                stats["scanned"] += 1
+                text = build_text(row)
+                text_hash = _text_hash(text)
+                if stored.get(str(row["id"])) == text_hash:
+                    continue
+                batch.append((row["id"], text_hash, text))
+                if len(batch) >= batch_size:
+                    flush(table, batch)
+                    batch = []
+            now = time.perf_counter()
+            if progress and now - last_report >= 2.0:
+                last_report = now
+                print(f"  embed-sync [{table}] scanned {stats['scanned']}, "
+                      f"embedded {stats['embedded']} ({stats['embedded'] / (now - start):.1f} rows/s)",
+                      file=sys.stderr)
+        if batch:
+            flush(table, batch)
+
+    _flush_ann_index(conn)
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_s"] = round(stats["embedded"] / elapsed, 1) if elapsed else 0.0
+    print(f"Synced {stats['embedded']} embeddings ({stats['rows_per_s']} rows/s).")
+    return stats
 
 
 def hybrid_search(conn, query, type_filter=None, after=None, before=None, limit=20, semantic_weight=0.3):
@@ -978,6 +2309,14 @@ def hybrid_search(conn, query, type_filter=None, after=None, before=None, limit=
     Args:
         semantic_weight: 0.0 = pure BM25, 1.0 = pure semantic, 0.3 = default blend
     """
+    tables = [type_filter] if type_filter and type_filter in SEARCH_TABLES else list(SEARCH_TABLES)
+    return _cached_result(
+        conn, ("hybrid", query, type_filter, after, before, limit, semantic_weight), tables + ["embeddings"],
+        lambda: _hybrid_search_uncached(conn, query, type_filter, after, before, limit, semantic_weight),
+    )
+
+
+def _hybrid_search_uncached(conn, query, type_filter, after, before, limit, semantic_weight):
     # Always get BM25 results
     bm25_results = search(conn, query, type_filter, after, before, limit)
 
@@ -988,12 +2327,12 @@ def hybrid_search(conn, query, type_filter=None, after=None, before=None, limit=
 
     # Build combined score map: key = (type, id)
     combined = {}
-    # Normalize BM25 scores (lower is better in BM25, invert to 0-1 where 1 is best)
+    # Normalize BM25 scores to 0-1 (search() scores are |bm25|, higher is better)
     if bm25_results:
         max_bm25 = max(r["score"] for r in bm25_results) or 1.0
         for r in bm25_results:
             key = (r["type"], str(r["id"]))
-            bm25_norm = 1.0 - (r["score"] / max_bm25) if max_bm25 > 0 else 1.0
+            bm25_norm = r["score"] / max_bm25 if max_bm25 > 0 else 1.0
             combined[key] = {
                 "bm25": bm25_norm,
                 "semantic": 0.0,
@@ -1043,6 +2382,7 @@ def consolidate_stm(conn, days_old=1):
     Low-access entries are discarded.
     """
     cutoff = (datetime.now() - timedelta(days=days_old)).isoformat()
+    stm_flush_access(conn)  # Promotion is decided on access_count, so include queued accesses
     old_entries = conn.execute(
         "SELECT * FROM short_term WHERE created_at < ?", (cutoff,)
     ).fetchall()
@@ -1058,75 +2398,144 @@ def consolidate_stm(conn, days_old=1):
         else:
             discarded += 1
         conn.execute("DELETE FROM short_term WHERE key = ?", (entry["key"],))
+        _stm_drop_pending(conn, [entry["key"]])
     conn.commit()
+    _bump_generation("short_term")
 
     print(f"Consolidated STM: {promoted} promoted to facts, {discarded} discarded")
     return {"promoted": promoted, "discarded": discarded}
 
 
-def deduplicate_facts(conn, similarity_threshold=0.95):
+# Fact sets up to this size are compared exhaustively in blocks; larger ones
+# use random-hyperplane LSH to generate candidate pairs in near-linear time.
+DEDUP_BLOCKED_MAX = int(os.environ.get("DEDUP_BLOCKED_MAX", "5000"))
+
+
+def deduplicate_facts(conn, similarity_threshold=0.95, dry_run=False):
     """
-    Find and merge near-duplicate facts.
+    Find and merge near-duplicate facts (the oldest fact of a cluster is kept).
     Uses embedding similarity if available, else exact content match.
+    With dry_run=True nothing is deleted; the clusters are only reported.
+    Returns {"removed", "clusters", "dry_run"}.
     """
-    if _get_embedder() is not None:
-        return _deduplicate_facts_semantic(conn, similarity_threshold)
+    if _get_embedder() is not None and np is not None:
+        return _deduplicate_facts_semantic(conn, similarity_threshold, dry_run)
     else:
-        return _deduplicate_facts_exact(conn)
+        return _deduplicate_facts_exact(conn, dry_run)
+
+
+def _delete_facts(conn, fact_ids):
+    """Delete facts and their embeddings in a single transaction."""
+    with conn:
+        conn.execute(
+            "DELETE FROM facts WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(fact_ids)),)
+        )
+        _embed_delete(conn, "facts", fact_ids)
+    _bump_generation("facts")
 
 
-def _deduplicate_facts_exact(conn):
+def _deduplicate_facts_exact(conn, dry_run=False):
     """Remove exact duplicate facts (same content, keep oldest)."""
-    dupes = conn.execute("""
-        SELECT content, COUNT(*) as cnt, MIN(id) as keep_id
-        FROM facts GROUP BY content HAVING cnt > 1
+    rows = conn.execute("""
+        SELECT id, content FROM facts
+        WHERE content IN (SELECT content FROM facts GROUP BY content HAVING COUNT(*) > 1)
+        ORDER BY content, id
     """).fetchall()
-    removed = 0
-    for dupe in dupes:
-        conn.execute("DELETE FROM facts WHERE content = ? AND id != ?",
-                     (dupe["content"], dupe["keep_id"]))
-        removed += conn.execute("SELECT changes()").fetchone()[0]
-    conn.commit()
-    if removed:
-        rebuild_fts(conn)
-    print(f"Deduplicated: removed {removed} exact duplicate facts")
-    return removed
+    clusters = {}
+    for row in rows:
+        clusters.setdefault(row["content"], []).append(row["id"])
+    clusters = [
+        {"keep": {"id": ids[0], "content": content},
+         "remove": [{"id": fid, "content": content, "similarity": 1.0} for fid in ids[1:]]}
+        for content, ids in clusters.items()
+    ]
+    to_remove = [r["id"] for c in clusters for r in c["remove"]]
+    if not dry_run and to_remove:
+        _delete_facts(conn, to_remove)
+    verb = "would remove" if dry_run else "removed"
+    print(f"Deduplicated: {verb} {len(to_remove)} exact duplicate facts")
+    return {"removed": 0 if dry_run else len(to_remove), "clusters": clusters, "dry_run": dry_run}
+
+
+def _near_duplicate_pairs(vecs, threshold, bits=16, tables=12, seed=0):
+    """
+    Pairs (i, j, sim) with i < j and vecs[i] . vecs[j] >= threshold.
+
+    Small inputs are compared exhaustively in row blocks. Larger inputs are
+    hashed into `tables` random-hyperplane LSH tables of `bits` bits each;
+    only rows sharing a bucket are compared, so cost grows with bucket sizes
+    rather than n^2. At 0.95 cosine the default settings find ~96% of pairs.
+    """
+    n = vecs.shape[0]
+    pairs = {}
+    if n <= DEDUP_BLOCKED_MAX:
+        for start in range(0, n, 1024):
+            sims = vecs[start:start + 1024] @ vecs[start:].T
+            for a, b in zip(*np.nonzero(sims >= threshold)):
+                i, j = start + int(a), start + int(b)
+                if i < j:
+                    pairs[(i, j)] = float(sims[a, b])
+        return pairs
+
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((vecs.shape[1], bits * tables)).astype(np.float32)
+    signs = (vecs @ planes) > 0
+    weights = 1 << np.arange(bits, dtype=np.int64)
+    for t in range(tables):
+        keys = signs[:, t * bits:(t + 1) * bits] @ weights
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for members in np.split(order, bounds):
+            if members.shape[0] < 2:
+                continue
+            members = np.sort(members)
+            sims = vecs[members] @ vecs[members].T
+            for a, b in zip(*np.nonzero(np.triu(sims >= threshold, k=1))):
+                pairs[(int(members[a]), int(members[b]))] = float(sims[a, b])
+    return pairs
 
 
-def _deduplicate_facts_semantic(conn, threshold):
+def _deduplicate_facts_semantic(conn, threshold, dry_run=False):
     """Remove semantically similar facts using embeddings."""
-    embed_sync(conn)  # Ensure embeddings are current
-
-    facts = conn.execute("SELECT id, content FROM facts ORDER BY id").fetchall()
-    embs = {}
-    for f in facts:
-        row = conn.execute(
-            "SELECT embedding FROM embeddings WHERE source_table='facts' AND source_id=?",
-            (str(f["id"]),)
-        ).fetchone()
-        if row:
-            embs[f["id"]] = row["embedding"]
-
-    to_remove = set()
-    fact_ids = list(embs.keys())
-    for i in range(len(fact_ids)):
-        if fact_ids[i] in to_remove:
+    embed_sync(conn, progress=False)  # Ensure embeddings are current
+
+    rows = conn.execute("""
+        SELECT f.id, f.content, e.embedding FROM facts f
+        JOIN embeddings e ON e.source_table = 'facts' AND e.source_id = CAST(f.id AS TEXT)
+        ORDER BY f.id
+    """).fetchall()
+    dim = len(rows[0]["embedding"]) // 4 if rows else 0
+    rows = [r for r in rows if len(r["embedding"]) == dim * 4]
+    vecs = np.frombuffer(b"".join(r["embedding"] for r in rows), dtype=np.float32).reshape(len(rows), dim)
+
+    # Same greedy rule as a full pairwise scan: walking facts oldest-first,
+    # each surviving fact absorbs every newer fact similar to it.
+    neighbours = {}
+    for (i, j), sim in _near_duplicate_pairs(vecs, threshold).items():
+        neighbours.setdefault(i, []).append((j, sim))
+    removed = set()
+    clusters = []
+    for i in sorted(neighbours):
+        if i in removed:
             continue
-        for j in range(i + 1, len(fact_ids)):
-            if fact_ids[j] in to_remove:
-                continue
-            sim = _cosine_similarity(embs[fact_ids[i]], embs[fact_ids[j]])
-            if sim >= threshold:
-                to_remove.add(fact_ids[j])  # Remove the newer one
+        members = [(j, sim) for j, sim in sorted(neighbours[i]) if j not in removed]
+        if not members:
+            continue
+        removed.update(j for j, _ in members)
+        clusters.append({
+            "keep": {"id": rows[i]["id"], "content": rows[i]["content"]},
+            "remove": [{"id": rows[j]["id"], "content": rows[j]["content"], "similarity": round(sim, 4)}
+                       for j, sim in members],
+        })
 
-    for fid in to_remove:
-        conn.execute("DELETE FROM facts WHERE id = ?", (fid,))
-        conn.execute("DELETE FROM embeddings WHERE source_table='facts' AND source_id=?", (str(fid),))
-    conn.commit()
-    if to_remove:
-        rebuild_fts(conn)
-    print(f"Deduplicated: removed {len(to_remove)} similar facts (threshold={threshold})")
-    return len(to_remove)
+    to_remove = [rows[j]["id"] for j in removed]
+    if not dry_run and to_remove:
+        _delete_facts(conn, to_remove)
+    verb = "would remove" if dry_run else "removed"
+    print(f"Deduplicated: {verb} {len(to_remove)} similar facts in {len(clusters)} clusters "
+          f"(threshold={threshold})")
+    return {"removed": 0 if dry_run else len(to_remove), "clusters": clusters, "dry_run": dry_run}
 
 
 def generate_consolidation_report(conn):
@@ -1355,6 +2764,110 @@ def get_evaluation_summary(conn, days=7):
     }
 
 
+# ---------------------------------------------------------------------------
+# SERVER MODE (persistent process; see memory_db_client.py)
+# ---------------------------------------------------------------------------
+# Protocol: one JSON object per line in each direction.
+#   request:  {"argv": ["search", "API rate limit", "--json"]}
+#   response: {"exit": 0, "stdout": "...", "stderr": "..."}
+# Every request runs the normal CLI verb on one long-lived connection, so
+# init_db, the statement cache and the embedding model are paid for once.
+
+def default_socket_path():
+    """Socket path shared by server and client: $MEMORY_DB_SOCKET or <db>.sock."""
+    env_path = os.environ.get("MEMORY_DB_SOCKET")
+    if env_path:
+        return Path(env_path)
+    path = DB_PATH.with_suffix(".sock")
+    if len(str(path)) > 100:  # AF_UNIX paths are limited to ~104 bytes
+        digest = hashlib.sha256(str(path).encode()).hexdigest()[:12]
+        path = Path(tempfile.gettempdir()) / f"memory_db-{digest}.sock"
+    return path
+
+
+def handle_request(conn, request):
+    """Run one CLI request on `conn` and capture its output."""
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+        return {"exit": 2, "stdout": "", "stderr": "request must be {\"argv\": [str, ...]}\n"}
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            main(argv, conn=conn)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    if conn.in_transaction:
+        conn.rollback()
+    return {"exit": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def serve(socket_path=None, stdio=False):
+    """Serve CLI requests until interrupted, on a Unix socket or stdin/stdout."""
+    conn = get_db(check_same_thread=False)
+    init_db(conn)
+    _get_embedder()  # Warm the model now rather than on the first semantic query
+    lock = threading.Lock()
+
+    def respond(line):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"exit": 2, "stdout": "", "stderr": f"invalid JSON: {e}\n"}
+        with lock:  # One request at a time on the shared connection
+            return handle_request(conn, request)
+
+    try:
+        if stdio or not hasattr(socket, "AF_UNIX"):
+            print("memory_db: serving JSON lines on stdin", file=sys.stderr)
+            out = sys.stdout
+            for line in sys.stdin:
+                if line.strip():
+                    out.write(json.dumps(respond(line)) + "\n")
+                    out.flush()
+            return
+
+        path = Path(socket_path) if socket_path else default_socket_path()
+        if path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(path))
+                print(f"memory_db: a server is already listening on {path}", file=sys.stderr)
+                return
+            except OSError:
+                path.unlink()  # Stale socket from a crashed server
+            finally:
+                probe.close()
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write((json.dumps(respond(line)) + "\n").encode())
+                        self.wfile.flush()
+
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, stop)  # `kill` removes the socket like Ctrl-C
+
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as server:
+            server.daemon_threads = True
+            print(f"memory_db: serving on {path}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                path.unlink(missing_ok=True)
+    finally:
+        stm_flush_access(conn)
+        _flush_ann_index(conn)
+        conn.close()
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -1374,7 +2887,9 @@ def print_search_results(results):
         print()
 
 
-def main():
+@lru_cache(maxsize=None)
+def build_parser():
+    """Build the CLI parser once; reused across calls in server mode."""
     parser = argparse.ArgumentParser(
         description="Memory Database — Searchable persistent memory for DOE Framework agents",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1396,8 +2911,16 @@ def main():
     p_search.add_argument("--after", help="Only after date (YYYY-MM-DD)")
     p_search.add_argument("--before", help="Only before date (YYYY-MM-DD)")
     p_search.add_argument("--limit", type=int, default=20)
+    p_search.add_argument("--workers", type=int, default=None,
+                          help="Query tables concurrently on N read-only connections")
     p_search.add_argument("--json", action="store_true", help="Output as JSON")
 
+    # --- search-bench ---
+    p_sbench = subparsers.add_parser("search-bench", help="Benchmark search() against the legacy implementation")
+    p_sbench.add_argument("--rows", type=int, default=100000)
+    p_sbench.add_argument("--queries", type=int, default=20)
+    p_sbench.add_argument("--workers", type=int, default=4)
+
     # --- stm (short-term memory) ---
     p_stm = subparsers.add_parser("stm", help="Short-term memory operations")
     stm_sub = p_stm.add_subparsers(dest="stm_command")
@@ -1485,8 +3008,30 @@ def main():
     p_exp = subparsers.add_parser("export", help="Export all memory")
     p_exp.add_argument("--format", default="json", choices=["json"])
 
+    # --- import ---
+    p_imp = subparsers.add_parser("import", help="Bulk-import export JSON, JSONL or memory_bank.py files")
+    p_imp.add_argument("paths", nargs="+", help="export .json, <table>.jsonl[.gz], or a memory_bank directory/file")
+    p_imp.add_argument("--table", default=None, help="Table for JSONL rows without a _table field")
+    p_imp.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+    p_imp.add_argument("--defer-fts", action="store_true", help="Suspend FTS triggers and rebuild once at the end")
+    p_imp.add_argument("--keep-ids", action="store_true", help="Keep source row ids (clashing ids are skipped)")
+
+    # --- snapshot / restore ---
+    p_snap = subparsers.add_parser("snapshot", help="Stream all tables to <dir>/<timestamp>/<table>.jsonl.gz")
+    p_snap.add_argument("dir", help="Snapshot root directory")
+    p_snap.add_argument("--incremental", action="store_true", help="Only rows changed since the newest snapshot in dir")
+    p_snap.add_argument("--since", default=None, help="Only rows changed since this datetime (UTC, YYYY-MM-DD HH:MM:SS)")
+    p_snap.add_argument("--no-gzip", action="store_true", help="Write plain .jsonl files")
+    p_snap.add_argument("--chunk-size", type=int, default=SNAPSHOT_CHUNK_SIZE, help="Rows fetched per cursor chunk")
+
+    p_rest = subparsers.add_parser("restore", help="Replay the newest full snapshot in dir plus later incrementals")
+    p_rest.add_argument("dir", help="Snapshot root (or a single full snapshot directory)")
+    p_rest.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+
     # --- embed-sync ---
-    subparsers.add_parser("embed-sync", help="Sync embeddings for semantic search (requires sentence-transformers)")
+    p_esync = subparsers.add_parser("embed-sync", help="Sync embeddings for semantic search (requires sentence-transformers)")
+    p_esync.add_argument("--batch-size", type=int, default=None,
+                         help=f"Rows per encode call / transaction (default: {EMBED_BATCH_SIZE})")
 
     # --- embed-search ---
     p_esearch = subparsers.add_parser("embed-search", help="Semantic search via embeddings")
@@ -1494,6 +3039,21 @@ def main():
     p_esearch.add_argument("--top-k", type=int, default=10)
     p_esearch.add_argument("--table", default=None, help="Limit to source table")
 
+    # --- embed-bench ---
+    p_ebench = subparsers.add_parser("embed-bench", help="Benchmark vectorized vs. scan embedding search")
+    p_ebench.add_argument("--rows", type=int, default=50000)
+    p_ebench.add_argument("--dim", type=int, default=384)
+    p_ebench.add_argument("--queries", type=int, default=20)
+
+    # --- embed-reindex ---
+    p_ereindex = subparsers.add_parser("embed-reindex", help="Rebuild the approximate (IVF) embedding index")
+    p_ereindex.add_argument("--nlist", type=int, default=None, help="Number of lists (default: 4*sqrt(rows))")
+    p_ereindex.add_argument("--iters", type=int, default=10, help="k-means iterations")
+    p_ereindex.add_argument("--report", action="store_true", help="Print recall@k vs latency afterwards")
+    p_ereindex.add_argument("--synthetic-rows", type=int, default=0,
+                            help="Index a synthetic in-memory DB of N vectors instead (no model needed)")
+    p_ereindex.add_argument("--top-k", type=int, default=10)
+
     # --- hybrid-search ---
     p_hsearch = subparsers.add_parser("hybrid-search", help="Hybrid BM25 + semantic search")
     p_hsearch.add_argument("query", help="Search query")
@@ -1508,7 +3068,10 @@ def main():
     p_consol = subparsers.add_parser("consolidate-stm", help="Promote old STM to LTM, discard stale")
     p_consol.add_argument("--days", type=int, default=1, help="Entries older than N days")
 
-    subparsers.add_parser("deduplicate-facts", help="Remove duplicate facts")
+    p_dedup = subparsers.add_parser("deduplicate-facts", help="Remove duplicate facts")
+    p_dedup.add_argument("--threshold", type=float, default=0.95, help="Cosine similarity for semantic duplicates")
+    p_dedup.add_argument("--dry-run", action="store_true", help="Print duplicate clusters without deleting")
+    p_dedup.add_argument("--json", action="store_true")
 
     p_reflect = subparsers.add_parser("reflect", help="Generate consolidation/reflection report")
     p_reflect.add_argument("--json", action="store_true")
@@ -1537,23 +3100,51 @@ def main():
     p_eval_sum.add_argument("--days", type=int, default=7)
     p_eval_sum.add_argument("--json", action="store_true")
 
-    args = parser.parse_args()
+    # --- serve ---
+    p_serve = subparsers.add_parser("serve", help="Run a persistent server (keeps DB and model warm)")
+    p_serve.add_argument("--socket", default=None, help="Unix socket path (default: <db>.sock or $MEMORY_DB_SOCKET)")
+    p_serve.add_argument("--stdio", action="store_true", help="Serve JSON lines on stdin/stdout instead of a socket")
+
+    return parser, {"stm": p_stm, "profile": p_profile, "context": p_ctx}
+
+
+def main(argv=None, conn=None):
+    """
+    Run one CLI command. `argv` defaults to sys.argv[1:]; an open `conn`
+    (server mode) is reused and left open instead of opening the DB.
+    """
+    parser, sub_parsers = build_parser()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
-    conn = get_db()
-    init_db(conn)
+    if args.command == "serve":
+        if conn is not None:
+            print("Already running in server mode.", file=sys.stderr)
+            sys.exit(2)
+        serve(args.socket, args.stdio)
+        return
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
+        init_db(conn)
 
     try:
         if args.command == "search":
-            results = search(conn, args.query, args.type_filter, args.after, args.before, args.limit)
+            results = search(conn, args.query, args.type_filter, args.after, args.before,
+                             args.limit, args.workers)
             if getattr(args, 'json', False):
                 print(json.dumps(results, indent=2, default=str))
             else:
                 print_search_results(results)
 
+        elif args.command == "search-bench":
+            stats = benchmark_search(args.rows, args.queries, workers=args.workers)
+            print(json.dumps(stats, indent=2))
+
         elif args.command == "stm":
             if args.stm_command == "set":
                 stm_set(conn, args.key, args.value, args.category, args.ttl)
@@ -1574,7 +3165,7 @@ def main():
             elif args.stm_command == "clear":
                 stm_clear(conn, getattr(args, 'all', False))
             else:
-                p_stm.print_help()
+                sub_parsers["stm"].print_help()
 
         elif args.command == "profile":
             if args.profile_command == "set":
@@ -1598,7 +3189,7 @@ def main():
                 else:
                     print("Profile is empty.")
             else:
-                p_profile.print_help()
+                sub_parsers["profile"].print_help()
 
         elif args.command == "context":
             if args.ctx_command == "set":
@@ -1618,7 +3209,7 @@ def main():
                 else:
                     print("Context is empty.")
             else:
-                p_ctx.print_help()
+                sub_parsers["context"].print_help()
 
         elif args.command == "log-interaction":
             log_interaction(conn, args.summary, args.topics, args.advice, getattr(args, 'follow_ups', ''))
@@ -1640,6 +3231,7 @@ def main():
 
         elif args.command == "status":
             status = get_status(conn)
+            cache = status.pop("cache")
             print(f"\n{'='*40}")
             print("MEMORY DATABASE STATUS")
             print(f"{'='*40}")
@@ -1651,6 +3243,8 @@ def main():
                 if isinstance(count, int):
                     total += count
             print(f"  {'TOTAL':15s}: {total:>5} rows")
+            print(f"  Result cache: {cache['result_hits']} hits / {cache['result_misses']} misses")
+            print(f"  Query embeddings: {cache['embed_query_hits']} hits / {cache['embed_query_misses']} misses")
             print(f"{'='*40}")
 
         elif args.command == "rebuild-fts":
@@ -1660,9 +3254,26 @@ def main():
             data = export_all(conn)
             print(json.dumps(data, indent=2, default=str))
 
+        elif args.command == "import":
+            stats = import_files(conn, args.paths, args.table, batch_size=args.batch_size,
+                                 defer_fts=args.defer_fts, keep_ids=args.keep_ids)
+            print(json.dumps(stats, indent=2))
+
+        elif args.command == "snapshot":
+            manifest = snapshot_export(conn, args.dir, since=args.since, incremental=args.incremental,
+                                       compress=not args.no_gzip, chunk_size=args.chunk_size)
+            total = sum(t["rows"] for t in manifest["tables"].values())
+            kind = f"incremental since {manifest['since']}" if manifest["since"] else "full"
+            print(f"Snapshot ({kind}): {total} rows -> {manifest['path']}")
+
+        elif args.command == "restore":
+            stats = snapshot_restore(conn, args.dir, batch_size=args.batch_size)
+            print(f"Restored {stats['rows']} rows from {len(stats['snapshots'])} snapshot(s) "
+                  f"in {stats['seconds']}s ({stats['rows_per_s']} rows/s).")
+
         # ── Embedding commands ──────────────────────────────────
         elif args.command == "embed-sync":
-            stats = embed_sync(conn)
+            stats = embed_sync(conn, batch_size=args.batch_size)
             print(json.dumps(stats, indent=2))
 
         elif args.command == "embed-search":
@@ -1673,6 +3284,23 @@ def main():
             else:
                 print("No embedding results (is sentence-transformers installed? Run embed-sync first.)")
 
+        elif args.command == "embed-bench":
+            stats = benchmark_embed_search(args.rows, args.dim, args.queries)
+            print(json.dumps(stats, indent=2))
+
+        elif args.command == "embed-reindex":
+            target = conn
+            if args.synthetic_rows:
+                target, _ = _synthetic_embedding_db(args.synthetic_rows, 384, clusters=256)
+            stats = embed_reindex(target, args.nlist, args.iters)
+            print(json.dumps(stats, indent=2))
+            if args.report or args.synthetic_rows:
+                print(f"\n{'nprobe':>8}  {'recall@' + str(args.top_k):>10}  {'ms/query':>9}")
+                for r in ann_recall_report(target, top_k=args.top_k):
+                    print(f"{r['nprobe']:>8}  {r['recall_at_k']:>10.4f}  {r['query_ms']:>9.3f}")
+            if target is not conn:
+                target.close()
+
         elif args.command == "hybrid-search":
             results = hybrid_search(
                 conn, args.query, args.type_filter, args.after, args.before,
@@ -1689,8 +3317,15 @@ def main():
             print(json.dumps(stats, indent=2))
 
         elif args.command == "deduplicate-facts":
-            stats = deduplicate_facts(conn)
-            print(json.dumps(stats, indent=2))
+            stats = deduplicate_facts(conn, args.threshold, args.dry_run)
+            if getattr(args, 'json', False):
+                print(json.dumps(stats, indent=2, default=str))
+            else:
+                for cluster in stats["clusters"]:
+                    keep = cluster["keep"]
+                    print(f"\n  keep   #{keep['id']}: {keep['content'][:100]}")
+                    for r in cluster["remove"]:
+                        print(f"  remove #{r['id']} (sim={r['similarity']:.3f}): {r['content'][:100]}")
 
         elif args.command == "reflect":
             report = generate_consolidation_report(conn)
@@ -1749,7 +3384,11 @@ def main():
                 print(f"{'='*40}")
 
     finally:
-        conn.close()
+        _flush_ann_index(conn)
+        if own_conn:
+            # A served connection flushes on its thresholds and at shutdown
+            stm_flush_access(conn)
+            conn.close()
 
 
 if __name__ == "__main__":
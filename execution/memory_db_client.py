@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Memory DB Client — thin client for a running `memory_db.py serve` process.
+
+Speaks exactly the same verbs as memory_db.py, but forwards them over the
+server's Unix socket instead of opening the database, running init_db and
+loading the embedding model on every call. Standard library only, so
+start-up stays cheap. If no server is listening, the command runs
+in-process through memory_db.py as usual.
+
+Usage:
+    python memory_db.py serve &                          # Once per session
+    python memory_db_client.py search "API rate limit"
+    python memory_db_client.py stm get "current_task"
+    python memory_db_client.py add-fact "..." --category api_limits
+
+From Python (keeps the socket open, single-digit ms per call):
+    from memory_db_client import MemoryClient
+    with MemoryClient() as mem:
+        print(mem.call(["search", "rate limit", "--json"])["stdout"])
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+PROJECT_ROOT = SCRIPT_DIR.parent
+DB_PATH = PROJECT_ROOT / "memory" / "agent_memory.db"
+
+
+def default_socket_path():
+    """Same resolution as memory_db.default_socket_path()."""
+    env_path = os.environ.get("MEMORY_DB_SOCKET")
+    if env_path:
+        return Path(env_path)
+    path = DB_PATH.with_suffix(".sock")
+    if len(str(path)) > 100:  # AF_UNIX paths are limited to ~104 bytes
+        digest = hashlib.sha256(str(path).encode()).hexdigest()[:12]
+        path = Path(tempfile.gettempdir()) / f"memory_db-{digest}.sock"
+    return path
+
+
+class MemoryClient:
+    """Persistent connection to a memory_db server."""
+
+    def __init__(self, socket_path=None, timeout=60):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(socket_path or default_socket_path()))
+        self._reader = self.sock.makefile("rb")
+
+    def call(self, argv):
+        """Run one CLI command. Returns {"exit", "stdout", "stderr"}."""
+        self.sock.sendall((json.dumps({"argv": list(argv)}) + "\n").encode())
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("memory_db server closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        client = MemoryClient()
+    except (OSError, AttributeError):
+        # No server (or no AF_UNIX on this platform): run in-process instead.
+        sys.path.insert(0, str(SCRIPT_DIR))
+        import memory_db
+        memory_db.main(argv)
+        return
+
+    # Connected: the server may already have run the command, so a failure
+    # from here on is reported rather than retried in-process.
+    try:
+        with client:
+            response = client.call(argv)
+    except (OSError, ValueError) as e:
+        print(f"memory_db server error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["exit"])
+
+
+if __name__ == "__main__":
+    main()
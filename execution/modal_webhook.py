@@ -15,13 +15,27 @@ Each slug maps to exactly ONE directive (security isolation).
 
 import modal
 import os
+import ast
+import atexit
+import fnmatch
 import json
 import base64
+import codecs
+import hashlib
 import logging
+import multiprocessing
+import queue
+import random
+import urllib.error
 import urllib.request
 import urllib.parse
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.text import MIMEText
+from html.parser import HTMLParser
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -382,10 +396,181 @@ def instantly_send_reply_impl(eaccount: str, reply_to_uuid: str, subject: str, h
     return {"status": "sent", "reply_to_uuid": reply_to_uuid}
 
 
-def web_search_impl(query: str) -> dict:
-    """Search the web using DuckDuckGo (no API key needed)."""
+# ----------------------------------------------------------------------------
+# Shared HTTP session + disk cache for web_search / web_fetch
+# ----------------------------------------------------------------------------
+# Entries hold the extracted result plus the response's ETag/Last-Modified.
+# Within the TTL (Cache-Control max-age, else the tool default) they are
+# served from disk; after it they are revalidated with If-None-Match /
+# If-Modified-Since, and a 304 just renews the entry. HTTP_CACHE_DIR can
+# point at a mounted Volume to share the cache across containers.
+
+HTTP_CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR", "/tmp/http_cache"))
+WEB_FETCH_TTL = int(os.getenv("WEB_FETCH_TTL", "3600"))
+WEB_SEARCH_TTL = int(os.getenv("WEB_SEARCH_TTL", "21600"))
+WEB_FETCH_MAX_CHARS = 15000
+WEB_FETCH_MAX_BYTES = 5 * 1024 * 1024  # Stop reading pages that are mostly markup/scripts
+BROWSER_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def http_session():
+    """Process-wide requests.Session with a connection pool shared by all tool threads."""
+    global _HTTP_SESSION
     import requests
+    from requests.adapters import HTTPAdapter
+
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def _http_cache_path(kind: str, key: str) -> Path:
+    digest = hashlib.sha256(f"{kind}\n{key}".encode("utf-8")).hexdigest()
+    return HTTP_CACHE_DIR / digest[:2] / f"{digest}.json"
+
+
+def http_cache_get(kind: str, key: str):
+    try:
+        return json.loads(_http_cache_path(kind, key).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def http_cache_put(kind: str, key: str, entry: dict) -> None:
+    path = _http_cache_path(kind, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)  # Atomic: concurrent readers never see a partial file
+    except OSError as e:
+        logger.warning(f"HTTP cache write failed: {e}")
+
+
+def _cache_ttl(headers, default_ttl: int):
+    """TTL from Cache-Control (None = do not store), else the default."""
+    cache_control = (headers.get("Cache-Control") or "").lower()
+    if "no-store" in cache_control:
+        return None
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match:
+        return min(int(match.group(1)), default_ttl)
+    return default_ttl
+
+
+def cached_http_get(kind: str, url: str, extract, default_ttl: int, params: dict = None,
+                    headers: dict = None, timeout: float = 15):
+    """
+    GET through the shared session and disk cache. extract(response) turns a
+    200 response into the JSON-serialisable result to cache; returns
+    (result, cache_state) with cache_state in {"hit", "revalidated", "miss"}.
+    """
+    key = url + ("?" + urllib.parse.urlencode(sorted(params.items())) if params else "")
+    entry = http_cache_get(kind, key)
+    now = time.time()
+    if entry and now - entry["stored_at"] < entry["ttl"]:
+        return entry["result"], "hit"
+
+    request_headers = dict(headers or {})
+    if entry and entry.get("etag"):
+        request_headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    with http_session().get(url, params=params, headers=request_headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and entry:
+            entry["stored_at"] = now
+            http_cache_put(kind, key, entry)
+            return entry["result"], "revalidated"
+        response.raise_for_status()
+        result = extract(response)
+        ttl = _cache_ttl(response.headers, default_ttl)
+        if ttl:
+            http_cache_put(kind, key, {
+                "url": url, "stored_at": now, "ttl": ttl, "result": result,
+                "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+            })
+    return result, "miss"
+
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text (whitespace-collapsed) until `limit` chars, skipping script/style."""
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.parts = []
+        self.length = 0
+        self._skip = 0
+
+    @property
+    def full(self) -> bool:
+        return self.length > self.limit
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if self._skip or self.full:
+            return
+        text = " ".join(data.split())
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+
+    def text(self) -> str:
+        return " ".join(self.parts)
+
+
+def stream_page_text(response, max_chars: int = WEB_FETCH_MAX_CHARS, max_bytes: int = WEB_FETCH_MAX_BYTES) -> str:
+    """
+    Decode and extract text from a streamed response chunk by chunk, and stop
+    reading as soon as `max_chars` of text (or `max_bytes` of body) is in.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    content_type = response.headers.get("Content-Type", "")
+    is_html = "html" in content_type or not content_type
+    extractor = _TextExtractor(max_chars) if is_html else None
+    plain, plain_len, read = [], 0, 0
+    for chunk in response.iter_content(chunk_size=16384):
+        read += len(chunk)
+        text = decoder.decode(chunk)
+        if extractor:
+            extractor.feed(text)
+            done = extractor.full
+        else:
+            plain.append(text)
+            plain_len += len(text)
+            done = plain_len > max_chars
+        if done or read >= max_bytes:
+            break
+    if extractor:
+        extractor.close()
+        text = extractor.text()
+    else:
+        text = " ".join("".join(plain).split())
+    if len(text) > max_chars:
+        text = text[:max_chars] + "... [truncated]"
+    return text
+
 
+def web_search_impl(query: str) -> dict:
+    """Search the web using DuckDuckGo (no API key needed). Cached for WEB_SEARCH_TTL."""
     # Use DuckDuckGo instant answer API
     url = "https://api.duckduckgo.com/"
     params = {
@@ -396,8 +581,9 @@ def web_search_impl(query: str) -> dict:
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
+        data, cache_state = cached_http_get(
+            "search", url, lambda response: response.json(), WEB_SEARCH_TTL, params=params, timeout=10
+        )
 
         results = []
 
@@ -428,7 +614,7 @@ def web_search_impl(query: str) -> dict:
                 "url": ""
             })
 
-        logger.info(f"🔍 Web search: {query} -> {len(results)} results")
+        logger.info(f"🔍 Web search: {query} -> {len(results)} results ({cache_state})")
         return {"query": query, "results": results}
 
     except Exception as e:
@@ -437,34 +623,13 @@ def web_search_impl(query: str) -> dict:
 
 
 def web_fetch_impl(url: str) -> dict:
-    """Fetch and extract text content from a URL."""
-    import requests
-
+    """Fetch and extract text content from a URL (streamed, pooled, cached for WEB_FETCH_TTL)."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        # Simple HTML to text conversion
-        html = response.text
-
-        # Remove script and style elements
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', html)
-
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-
-        # Truncate if too long
-        if len(text) > 15000:
-            text = text[:15000] + "... [truncated]"
+        text, cache_state = cached_http_get(
+            "fetch", url, stream_page_text, WEB_FETCH_TTL, headers={"User-Agent": BROWSER_USER_AGENT}
+        )
 
-        logger.info(f"🌐 Fetched {url} ({len(text)} chars)")
+        logger.info(f"🌐 Fetched {url} ({len(text)} chars, {cache_state})")
         return {"url": url, "content": text, "length": len(text)}
 
     except Exception as e:
@@ -566,24 +731,242 @@ TOOLS_NEEDING_TOKEN = {"send_email", "read_sheet", "update_sheet"}
 # SLACK NOTIFICATIONS
 # ============================================================================
 
-def slack_notify(message: str, blocks: list = None):
-    """Send notification to Slack."""
+# Notifications are posted by a background worker so a slow Slack endpoint
+# never stalls the agent loop. Set SLACK_ASYNC=0 to post inline.
+SLACK_ASYNC = os.getenv("SLACK_ASYNC", "1") != "0"
+SLACK_QUEUE_SIZE = int(os.getenv("SLACK_QUEUE_SIZE", "200"))
+SLACK_BATCH_WINDOW = float(os.getenv("SLACK_BATCH_WINDOW", "0.5"))
+SLACK_MAX_BLOCKS = 45  # Slack rejects messages with more than 50 blocks
+SLACK_PRIORITIES = {"low": 0, "normal": 1, "high": 2}
+
+
+def _slack_post(webhook_url: str, payload: dict, timeout: float = 5) -> None:
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(webhook_url, data=data, headers={"Content-Type": "application/json"})
+    urllib.request.urlopen(req, timeout=timeout).close()
+
+
+class SlackSink:
+    """
+    Background Slack poster. send() only enqueues; a worker thread coalesces
+    queued messages into one post (up to SLACK_MAX_BLOCKS blocks), retries
+    429s, 5xx and network errors with exponential backoff (honouring
+    Retry-After on 429; other 4xx are dropped straight away), and
+    sheds load: past 3/4 of max_queue, low-priority messages are dropped,
+    and a full queue evicts its oldest low-priority message.
+    """
+
+    def __init__(self, webhook_url: str, max_queue: int = SLACK_QUEUE_SIZE,
+                 batch_window: float = SLACK_BATCH_WINDOW, retries: int = 3, timeout: float = 5):
+        self.webhook_url = webhook_url
+        self.max_queue = max_queue
+        self.batch_window = batch_window
+        self.retries = retries
+        self.timeout = timeout
+        self.stats = {"queued": 0, "sent": 0, "posts": 0, "dropped": 0, "failed": 0, "retries": 0}
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._flushing = 0
+        self._thread = None
+
+    def send(self, message: str, blocks: list = None, priority: str = "normal") -> bool:
+        """Queue a message; returns False if it was dropped."""
+        level = SLACK_PRIORITIES.get(priority, 1)
+        with self._cond:
+            if level == 0 and len(self._items) >= self.max_queue * 3 // 4:
+                self.stats["dropped"] += 1
+                return False
+            if len(self._items) >= self.max_queue:
+                victim = next((item for item in self._items if item[2] == 0), None)
+                if victim is None:
+                    self.stats["dropped"] += 1
+                    return False
+                self._items.remove(victim)
+                self.stats["dropped"] += 1
+            self._items.append((message, blocks, level))
+            self.stats["queued"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="slack-sink", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 15) -> bool:
+        """Block until everything queued so far has been posted (or given up on)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1  # Worker skips the rest of its batch window
+            self._cond.notify_all()
+            try:
+                while self._items or self._busy:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flushing -= 1
+        return True
+
+    def _take_batch(self) -> list:
+        batch, n_blocks = [], 0
+        while self._items:
+            message, blocks, _ = self._items[0]
+            size = len(blocks) if blocks else 1
+            if batch and n_blocks + size > SLACK_MAX_BLOCKS:
+                break
+            batch.append(self._items.popleft())
+            n_blocks += size
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items:
+                    self._cond.wait()
+                # Give closely spaced messages a moment to arrive and coalesce
+                window_end = time.monotonic() + self.batch_window
+                while not self._flushing and len(self._items) < SLACK_MAX_BLOCKS:
+                    remaining = window_end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+                self._busy = True
+            try:
+                self._post(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _post(self, batch: list) -> None:
+        text = "\n".join(message for message, _, _ in batch)[:3000]
+        payload = {"text": text}
+        if any(blocks for _, blocks, _ in batch) or len(batch) > 1:
+            payload["blocks"] = [
+                block
+                for message, blocks, _ in batch
+                for block in (blocks or [{"type": "section", "text": {"type": "mrkdwn", "text": message[:3000]}}])
+            ]
+        for attempt in range(self.retries + 1):
+            try:
+                _slack_post(self.webhook_url, payload, self.timeout)
+                self.stats["posts"] += 1
+                self.stats["sent"] += len(batch)
+                return
+            except Exception as e:
+                delay = 2 ** attempt * 0.5
+                if isinstance(e, urllib.error.HTTPError):
+                    retryable = e.code == 429 or e.code >= 500
+                    retry_after = e.headers.get("Retry-After") if e.headers else None
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                else:
+                    retryable = isinstance(e, OSError)  # URLError, timeouts, resets
+                if not retryable or attempt == self.retries:
+                    logger.error(f"Slack failed after {attempt + 1} attempts: {e}")
+                    self.stats["failed"] += len(batch)
+                    return
+                self.stats["retries"] += 1
+                time.sleep(delay)
+
+
+_SLACK_SINKS = {}
+_SLACK_SINKS_LOCK = threading.Lock()
+
+
+def get_slack_sink(webhook_url: str) -> SlackSink:
+    with _SLACK_SINKS_LOCK:
+        sink = _SLACK_SINKS.get(webhook_url)
+        if sink is None:
+            sink = _SLACK_SINKS[webhook_url] = SlackSink(webhook_url)
+        return sink
+
+
+def slack_flush(timeout: float = 15) -> bool:
+    """Wait for queued Slack notifications to be delivered."""
+    return all(sink.flush(timeout) for sink in list(_SLACK_SINKS.values()))
+
+
+atexit.register(slack_flush)
+
+
+def slack_notify(message: str, blocks: list = None, priority: str = "normal"):
+    """Send notification to Slack (queued; low priority may be dropped under load)."""
     webhook_url = os.getenv("SLACK_WEBHOOK_URL")
     if not webhook_url:
         return
 
+    if SLACK_ASYNC:
+        get_slack_sink(webhook_url).send(message, blocks, priority)
+        return
+
     payload = {"text": message}
     if blocks:
         payload["blocks"] = blocks
 
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(webhook_url, data=data, headers={"Content-Type": "application/json"})
-        urllib.request.urlopen(req, timeout=5)
+        _slack_post(webhook_url, payload)
     except Exception as e:
         logger.error(f"Slack failed: {e}")
 
 
+def benchmark_slack_sink(messages: int = 30, server_delay: float = 0.2) -> dict:
+    """
+    Time notifications against a local stand-in webhook that sleeps
+    `server_delay` per POST: caller-side latency of inline vs queued
+    sends, and how many posts the sink needed after coalescing.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    received = {"posts": 0, "blocks": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(server_delay)
+            received["posts"] += 1
+            received["blocks"] += len(body.get("blocks", [])) or 1
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    blocks = lambda i: [{"type": "section", "text": {"type": "mrkdwn", "text": f"🔧 *Turn {i}*"}}]
+    try:
+        start = time.perf_counter()
+        for i in range(messages):
+            _slack_post(url, {"text": f"msg {i}", "blocks": blocks(i)})
+        inline_s = time.perf_counter() - start
+        inline_posts = received["posts"]
+
+        sink = SlackSink(url)
+        start = time.perf_counter()
+        for i in range(messages):
+            sink.send(f"msg {i}", blocks(i), priority="low")
+        enqueue_s = time.perf_counter() - start
+        sink.flush()
+        delivered_s = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    return {
+        "messages": messages,
+        "server_delay_s": server_delay,
+        "inline_caller_ms_per_msg": round(inline_s / messages * 1000, 3),
+        "queued_caller_ms_per_msg": round(enqueue_s / messages * 1000, 3),
+        "queued_delivery_s": round(delivered_s, 3),
+        "inline_posts": inline_posts,
+        "queued_posts": received["posts"] - inline_posts,
+        "sink_stats": sink.stats,
+    }
+
+
 def slack_directive_start(slug: str, directive: str, input_data: dict):
     """Notify Slack of directive execution."""
     input_str = json.dumps(input_data, indent=2)[:800] if input_data else "None"
@@ -602,20 +985,20 @@ def slack_directive_start(slug: str, directive: str, input_data: dict):
 def slack_thinking(turn, thinking: str):
     truncated = thinking[:2500] + "..." if len(thinking) > 2500 else thinking
     blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"🧠 *Turn {turn}:*\n```{truncated}```"}}]
-    slack_notify(f"Turn {turn} thinking", blocks=blocks)
+    slack_notify(f"Turn {turn} thinking", blocks=blocks, priority="low")
 
 
 def slack_tool_call(turn: int, tool_name: str, tool_input: dict):
     input_str = json.dumps(tool_input, indent=2)[:1500]
     blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"🔧 *Turn {turn} - {tool_name}:*\n```{input_str}```"}}]
-    slack_notify(f"Tool: {tool_name}", blocks=blocks)
+    slack_notify(f"Tool: {tool_name}", blocks=blocks, priority="low")
 
 
 def slack_tool_result(turn: int, tool_name: str, result: str, is_error: bool = False):
     emoji = "❌" if is_error else "✅"
     truncated = result[:1500] + "..." if len(result) > 1500 else result
     blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"{emoji} *Result:*\n```{truncated}```"}}]
-    slack_notify(f"Result: {tool_name}", blocks=blocks)
+    slack_notify(f"Result: {tool_name}", blocks=blocks, priority="low")
 
 
 def slack_complete(response: str, usage: dict):
@@ -624,7 +1007,8 @@ def slack_complete(response: str, usage: dict):
         {"type": "divider"},
         {"type": "header", "text": {"type": "plain_text", "text": "✨ Complete", "emoji": True}},
         {"type": "section", "fields": [
-            {"type": "mrkdwn", "text": f"*Tokens:* {usage['input_tokens']}→{usage['output_tokens']}"},
+            {"type": "mrkdwn", "text": f"*Tokens:* {usage['input_tokens']}→{usage['output_tokens']}"
+                                       f" (cached: {usage.get('cache_read_input_tokens', 0)})"},
             {"type": "mrkdwn", "text": f"*Turns:* {usage['turns']}"}
         ]},
         {"type": "section", "text": {"type": "mrkdwn", "text": f"*Response:*\n```{truncated}```"}}
@@ -634,7 +1018,7 @@ def slack_complete(response: str, usage: dict):
 
 def slack_error(error: str):
     blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"❌ *Error:*\n```{error[:2000]}```"}}]
-    slack_notify(f"Error", blocks=blocks)
+    slack_notify(f"Error", blocks=blocks, priority="high")
 
 
 # ============================================================================
@@ -691,12 +1075,198 @@ def load_webhook_config():
     return json.loads(config_path.read_text())
 
 
+DIRECTIVES_DIR = Path("/app/directives")
+EXECUTION_DIR = Path("/app/execution")
+CATALOG_RECHECK_SECONDS = float(os.getenv("CATALOG_RECHECK_SECONDS", "2"))
+
+
+class FileCatalog:
+    """
+    Per-container cache of parsed files in one directory, keyed by
+    (mtime_ns, size). Each file is parsed once; later listings only stat
+    the directory, and re-stat files at most every `recheck` seconds (or
+    when the directory itself changes), re-parsing just what changed.
+    """
+
+    def __init__(self, directory: Path, pattern: str, parse, recheck: float = CATALOG_RECHECK_SECONDS):
+        self.directory = directory
+        self.pattern = pattern
+        self.parse = parse
+        self.recheck = recheck
+        self._files = {}  # name -> (stamp, parsed value)
+        self._listing = None
+        self._dir_mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, path: str, stamp: tuple):
+        cached = self._files.get(name)
+        if cached and cached[0] == stamp:
+            return cached
+        return stamp, self.parse(Path(path))
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        try:
+            dir_mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._files, self._listing = {}, []
+            return
+        if self._listing is not None and dir_mtime == self._dir_mtime and now - self._checked < self.recheck:
+            return
+        files = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and fnmatch.fnmatch(entry.name, self.pattern):
+                    st = entry.stat()
+                    name = entry.name.rsplit(".", 1)[0]
+                    files[name] = self._load(name, entry.path, (st.st_mtime_ns, st.st_size))
+        if self._listing is None or files != self._files:
+            self._files = files
+            self._listing = [value for _, (_, value) in sorted(files.items())]
+        self._dir_mtime, self._checked = dir_mtime, now
+
+    def values(self) -> list:
+        """All parsed values, sorted by file name."""
+        with self._lock:
+            self._refresh()
+            return list(self._listing)
+
+    def get(self, name: str):
+        """Parsed value for one file (always re-stat'ed), or None if missing."""
+        path = self.directory / (name + self.pattern.lstrip("*"))
+        try:
+            st = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        with self._lock:
+            entry = self._load(name, str(path), (st.st_mtime_ns, st.st_size))
+            if Path(name).name == name:  # Top-level files only; nested paths are parsed but not stored
+                self._files[name] = entry
+            return entry[1]
+
+
+def _parse_directive(path: Path) -> dict:
+    """Title, first line under '## Goal'/'## Description', and full text of a directive."""
+    content = path.read_text()
+    desc = ""
+    lines = content.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("## Goal") or line.startswith("## Description"):
+            desc = next((l.strip() for l in lines[i + 1:] if l.strip()), "")
+            break
+    return {
+        "name": path.stem,
+        "title": path.stem.replace("_", " ").title(),
+        "description": desc[:200] if desc else "No description",
+        "content": content,
+    }
+
+
+def _parse_script(path: Path) -> dict:
+    """First line of a script's module docstring."""
+    try:
+        desc = ast.get_docstring(ast.parse(path.read_bytes())) or ""
+    except (SyntaxError, ValueError):
+        desc = ""
+    desc = desc.strip().split("\n")[0]
+    return {"name": path.stem, "description": desc[:150] if desc else "No description"}
+
+
+_DIRECTIVE_CATALOG = FileCatalog(DIRECTIVES_DIR, "*.md", _parse_directive)
+_SCRIPT_CATALOG = FileCatalog(EXECUTION_DIR, "*.py", _parse_script)
+
+
 def load_directive(directive_name: str) -> str:
     """Load a directive file. Returns content or raises error."""
-    directive_path = Path(f"/app/directives/{directive_name}.md")
-    if not directive_path.exists():
+    directive = _DIRECTIVE_CATALOG.get(directive_name)
+    if directive is None:
         raise FileNotFoundError(f"Directive not found: {directive_name}")
-    return directive_path.read_text()
+    return directive["content"]
+
+
+# Max tool_use blocks from one model turn executed at the same time
+MAX_PARALLEL_TOOLS = int(os.getenv("MAX_PARALLEL_TOOLS", "8"))
+
+
+def execute_tool_calls(tool_uses: list, run_tool, max_workers: int = MAX_PARALLEL_TOOLS) -> list:
+    """
+    Run every tool_use block of a turn concurrently on a bounded thread pool.
+    run_tool(block) -> (result_str, is_error). Returns (block, result_str,
+    is_error, seconds) tuples in the order the model requested them.
+    """
+    def timed(block):
+        start = time.perf_counter()
+        try:
+            result_str, is_error = run_tool(block)
+        except Exception as e:
+            logger.error(f"Tool error: {e}")
+            result_str, is_error = json.dumps({"error": str(e)}), True
+        return block, result_str, is_error, time.perf_counter() - start
+
+    if len(tool_uses) <= 1:
+        return [timed(block) for block in tool_uses]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tool_uses))) as pool:
+        return list(pool.map(timed, tool_uses))
+
+
+# Context compaction for long directive runs: once a request's prompt exceeds
+# the budget, older large tool_result payloads are cut down to a preview.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("DIRECTIVE_CONTEXT_TOKEN_BUDGET", "80000"))
+COMPACT_KEEP_RECENT_TURNS = int(os.getenv("DIRECTIVE_COMPACT_KEEP_RECENT", "2"))
+COMPACT_RESULT_CHARS = int(os.getenv("DIRECTIVE_COMPACT_RESULT_CHARS", "1500"))
+
+
+def with_cache_breakpoint(messages: list) -> list:
+    """
+    Copy of messages with a cache breakpoint on the last content block, so
+    the next turn reads the whole conversation so far from the prompt cache.
+    Only the copy is marked: at most one message breakpoint per request.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = list(content)
+    if content and isinstance(content[-1], dict):
+        content[-1] = {**content[-1], "cache_control": {"type": "ephemeral"}}
+    return messages[:-1] + [{**last, "content": content}]
+
+
+def compact_tool_results(messages: list, prompt_tokens: int, budget: int = CONTEXT_TOKEN_BUDGET,
+                         keep_recent: int = COMPACT_KEEP_RECENT_TURNS,
+                         max_chars: int = COMPACT_RESULT_CHARS) -> int:
+    """
+    Truncate old tool_result payloads in place (oldest first) until the
+    estimated prompt size is back under `budget` tokens. The newest
+    `keep_recent` tool-result messages are left intact. Compacted results
+    stay compacted, so the cached prefix only changes when this runs.
+    Returns the number of characters removed.
+    """
+    if budget <= 0 or prompt_tokens <= budget:
+        return 0
+    result_messages = [
+        m for m in messages
+        if m["role"] == "user" and isinstance(m["content"], list)
+        and any(isinstance(b, dict) and b.get("type") == "tool_result" for b in m["content"])
+    ]
+    excess_chars = (prompt_tokens - budget) * 4  # ~4 chars per token
+    removed = 0
+    for message in result_messages[:max(len(result_messages) - keep_recent, 0)]:
+        for block in message["content"]:
+            text = block.get("content")
+            if not isinstance(text, str) or len(text) <= max_chars:
+                continue
+            block["content"] = (
+                text[:max_chars]
+                + f"\n...[compacted: {len(text) - max_chars} more chars of this earlier tool result omitted]"
+            )
+            removed += len(text) - max_chars
+            if removed >= excess_chars:
+                return removed
+    return removed
 
 
 def run_directive(
@@ -712,46 +1282,67 @@ def run_directive(
 
     client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
-    # Build prompt with directive + input
-    prompt = f"""You are executing a specific directive. Follow it precisely.
+    # Static prefix (tools + directive) goes in the cached system prompt;
+    # only the per-request input data is in the first user message.
+    system = [{
+        "type": "text",
+        "text": f"""You are executing a specific directive. Follow it precisely.
 
 ## DIRECTIVE
 {directive_content}
 
-## INPUT DATA
-{json.dumps(input_data, indent=2) if input_data else "No input data provided."}
-
 ## INSTRUCTIONS
 1. Read and understand the directive above
 2. Use the available tools to accomplish the task
-3. Report your results clearly
+3. Report your results clearly""",
+        "cache_control": {"type": "ephemeral"},
+    }]
+    prompt = f"""## INPUT DATA
+{json.dumps(input_data, indent=2) if input_data else "No input data provided."}
 
 Execute the directive now."""
 
-    # Filter tools to only allowed ones
+    # Filter tools to only allowed ones; the breakpoint on the last one caches all tool schemas
     tools = [ALL_TOOLS[t] for t in allowed_tools if t in ALL_TOOLS]
+    if tools:
+        tools[-1] = {**tools[-1], "cache_control": {"type": "ephemeral"}}
 
     messages = [{"role": "user", "content": prompt}]
     conversation_log = []
     thinking_log = []
-    total_input_tokens = 0
-    total_output_tokens = 0
+    usage = {
+        "input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 0,
+        "output_tokens": 0,
+        "compacted_chars": 0,
+    }
     turn_count = 0
 
+    def record_usage(response) -> int:
+        """Accumulate usage; returns the size of the prompt just sent."""
+        prompt_tokens = 0
+        for key in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+            tokens = getattr(response.usage, key, 0) or 0
+            usage[key] += tokens
+            prompt_tokens += tokens
+        usage["output_tokens"] += response.usage.output_tokens
+        return prompt_tokens
+
     logger.info(f"🎯 Executing directive: {slug}")
     slack_directive_start(slug, slug, input_data)
 
     request_kwargs = {
         "model": "claude-opus-4-5-20251101",
         "max_tokens": 40000,
+        "system": system,
         "tools": tools,
         "messages": messages,
         "thinking": {"type": "enabled", "budget_tokens": 32000}
     }
 
     response = client.messages.create(**request_kwargs)
-    total_input_tokens += response.usage.input_tokens
-    total_output_tokens += response.usage.output_tokens
+    prompt_tokens = record_usage(response)
 
     while response.stop_reason == "tool_use" and turn_count < max_turns:
         turn_count += 1
@@ -762,48 +1353,52 @@ Execute the directive now."""
                 thinking_log.append({"turn": turn_count, "thinking": block.thinking})
                 slack_thinking(turn_count, block.thinking)
 
-        # Find tool call
-        tool_use = next((b for b in response.content if b.type == "tool_use"), None)
-        if not tool_use:
+        # Find all tool calls (the model may request several in one turn)
+        tool_uses = [b for b in response.content if b.type == "tool_use"]
+        if not tool_uses:
             break
 
-        # Security check: only execute allowed tools
-        if tool_use.name not in allowed_tools:
-            tool_result = json.dumps({"error": f"Tool '{tool_use.name}' not permitted for this directive"})
-            is_error = True
-        else:
-            slack_tool_call(turn_count, tool_use.name, tool_use.input)
-            conversation_log.append({"turn": turn_count, "tool": tool_use.name, "input": tool_use.input})
-
-            # Execute tool
-            is_error = False
-            try:
-                impl = TOOL_IMPLEMENTATIONS.get(tool_use.name)
-                if impl:
-                    # Add token_data for tools that need it
-                    if tool_use.name in TOOLS_NEEDING_TOKEN:
-                        result = impl(**tool_use.input, token_data=token_data)
-                    else:
-                        result = impl(**tool_use.input)
-                    tool_result = json.dumps(result)
-                else:
-                    tool_result = json.dumps({"error": f"No implementation for {tool_use.name}"})
-                    is_error = True
-            except Exception as e:
-                logger.error(f"Tool error: {e}")
-                tool_result = json.dumps({"error": str(e)})
-                is_error = True
-
-            conversation_log[-1]["result"] = tool_result
-            slack_tool_result(turn_count, tool_use.name, tool_result, is_error)
+        def run_tool(tool_use):
+            # Security check: only execute allowed tools
+            if tool_use.name not in allowed_tools:
+                return json.dumps({"error": f"Tool '{tool_use.name}' not permitted for this directive"}), True
+            impl = TOOL_IMPLEMENTATIONS.get(tool_use.name)
+            if not impl:
+                return json.dumps({"error": f"No implementation for {tool_use.name}"}), True
+            # Add token_data for tools that need it
+            if tool_use.name in TOOLS_NEEDING_TOKEN:
+                result = impl(**tool_use.input, token_data=token_data)
+            else:
+                result = impl(**tool_use.input)
+            return json.dumps(result), False
+
+        for tool_use in tool_uses:
+            if tool_use.name in allowed_tools:
+                slack_tool_call(turn_count, tool_use.name, tool_use.input)
+
+        # Execute tools concurrently; results go back in one message
+        tool_results = []
+        for tool_use, tool_result, is_error, seconds in execute_tool_calls(tool_uses, run_tool):
+            if tool_use.name in allowed_tools:
+                conversation_log.append({
+                    "turn": turn_count, "tool": tool_use.name, "input": tool_use.input,
+                    "result": tool_result, "duration_s": round(seconds, 3)
+                })
+                slack_tool_result(turn_count, tool_use.name, tool_result, is_error)
+            tool_results.append({"type": "tool_result", "tool_use_id": tool_use.id, "content": tool_result})
 
         # Continue conversation
         messages.append({"role": "assistant", "content": response.content})
-        messages.append({"role": "user", "content": [{"type": "tool_result", "tool_use_id": tool_use.id, "content": tool_result}]})
+        messages.append({"role": "user", "content": tool_results})
+
+        # Trim old tool output once the prompt outgrows the budget
+        compacted = compact_tool_results(messages, prompt_tokens)
+        if compacted:
+            usage["compacted_chars"] += compacted
+            logger.info(f"Compacted {compacted} chars of old tool results (prompt was {prompt_tokens} tokens)")
 
-        response = client.messages.create(**{**request_kwargs, "messages": messages})
-        total_input_tokens += response.usage.input_tokens
-        total_output_tokens += response.usage.output_tokens
+        response = client.messages.create(**{**request_kwargs, "messages": with_cache_breakpoint(messages)})
+        prompt_tokens = record_usage(response)
 
     # Extract final response
     final_text = ""
@@ -813,8 +1408,9 @@ Execute the directive now."""
         if block.type == "thinking":
             thinking_log.append({"turn": "final", "thinking": block.thinking})
 
-    usage = {"input_tokens": total_input_tokens, "output_tokens": total_output_tokens, "turns": turn_count}
+    usage["turns"] = turn_count
     slack_complete(final_text, usage)
+    slack_flush()
 
     return {
         "response": final_text,
@@ -951,56 +1547,16 @@ def list_webhooks():
 # ============================================================================
 
 def list_available_directives() -> list[dict]:
-    """List all available directives with their descriptions."""
-    directives_dir = Path("/app/directives")
-    directives = []
-
-    for f in directives_dir.glob("*.md"):
-        content = f.read_text()
-        # Extract first heading as title
-        title = f.stem.replace("_", " ").title()
-        # Extract goal/description from content
-        desc = ""
-        for line in content.split("\n"):
-            if line.startswith("## Goal") or line.startswith("## Description"):
-                # Get the next non-empty line
-                idx = content.find(line)
-                remaining = content[idx + len(line):].strip()
-                desc = remaining.split("\n")[0].strip()
-                break
-
-        directives.append({
-            "name": f.stem,
-            "title": title,
-            "description": desc[:200] if desc else "No description"
-        })
-
-    return directives
+    """List all available directives with their descriptions (cached, see FileCatalog)."""
+    return [
+        {"name": d["name"], "title": d["title"], "description": d["description"]}
+        for d in _DIRECTIVE_CATALOG.values()
+    ]
 
 
 def list_available_scripts() -> list[dict]:
-    """List all available execution scripts."""
-    scripts_dir = Path("/app/execution")
-    scripts = []
-
-    for f in scripts_dir.glob("*.py"):
-        if f.stem.startswith("_"):
-            continue
-        # Read first docstring
-        content = f.read_text()
-        desc = ""
-        if '"""' in content:
-            start = content.find('"""') + 3
-            end = content.find('"""', start)
-            if end > start:
-                desc = content[start:end].strip().split("\n")[0]
-
-        scripts.append({
-            "name": f.stem,
-            "description": desc[:150] if desc else "No description"
-        })
-
-    return scripts
+    """List all available execution scripts (cached, see FileCatalog)."""
+    return [dict(s) for s in _SCRIPT_CATALOG.values() if not s["name"].startswith("_")]
 
 
 AGENT_TOOLS = {
@@ -1049,6 +1605,271 @@ AGENT_TOOLS = {
 }
 
 
+# ----------------------------------------------------------------------------
+# Warm script workers for run_script
+# ----------------------------------------------------------------------------
+# Each worker is a spawned process that imports the heavy client libraries
+# up front, then waits for one job: it runs the script as __main__ with the
+# given argv, streams stdout/stderr chunks back over a pipe, and exits, so
+# scripts never see each other's state. fds 1/2 are redirected for the job,
+# so output from subprocesses the script starts is captured too. The pool
+# starts a replacement as soon as a worker is taken; if none is ready within
+# RUN_SCRIPT_WORKER_WAIT, run_script falls back to a plain subprocess.
+# RUN_SCRIPT_MODE=subprocess restores the old one-interpreter-per-call
+# behaviour.
+
+RUN_SCRIPT_MODE = os.getenv("RUN_SCRIPT_MODE", "pool")
+RUN_SCRIPT_POOL_SIZE = int(os.getenv("RUN_SCRIPT_POOL_SIZE", "2"))
+RUN_SCRIPT_TIMEOUT = 300
+RUN_SCRIPT_WORKER_WAIT = float(os.getenv("RUN_SCRIPT_WORKER_WAIT", "15"))
+RUN_SCRIPT_WARM_MODULES = (
+    "requests", "dotenv", "anthropic", "gspread", "pandas",
+    "googleapiclient.discovery", "google.oauth2.credentials", "apify_client",
+)
+
+
+def _script_worker(conn, cwd: str, warm_modules: tuple) -> None:
+    """Worker process body: warm imports, then run exactly one script."""
+    import importlib
+    import io
+    import runpy
+    import sys
+    import traceback
+
+    for module in warm_modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    conn.send(("ready", None))
+    try:
+        job = conn.recv()
+    except EOFError:
+        return
+    if job is None:
+        return
+    script_path, args = job
+
+    # Point fds 1/2 at pipes drained by reader threads, so subprocess and
+    # fd-level output is captured along with Python-level prints
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def drain(fd, kind):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = os.read(fd, 65536)
+            text = decoder.decode(data, final=not data)
+            if text:
+                send((kind, text))
+            if not data:
+                break
+        os.close(fd)
+
+    readers = []
+    for fd, kind in ((1, "stdout"), (2, "stderr")):
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, fd)
+        os.close(write_fd)
+        reader = threading.Thread(target=drain, args=(read_fd, kind), daemon=True)
+        reader.start()
+        readers.append(reader)
+    sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", closefd=False), write_through=True, line_buffering=True)
+    sys.stderr = io.TextIOWrapper(os.fdopen(2, "wb", closefd=False), write_through=True, line_buffering=True)
+
+    sys.argv = [script_path] + list(args)
+    sys.path.insert(0, os.path.dirname(script_path))
+    os.chdir(cwd)
+    code = 0
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+
+    # Close our write ends so the readers hit EOF (children still holding
+    # the pipe get a short grace period, then are left behind)
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+    for reader in readers:
+        reader.join(5)
+    send(("exit", code))
+
+
+class ScriptPoolUnavailable(RuntimeError):
+    """No warm worker became available; the caller should use a plain subprocess."""
+
+
+class ScriptWorkerPool:
+    """Pool of pre-warmed single-use script workers (see _script_worker)."""
+
+    def __init__(self, size: int = RUN_SCRIPT_POOL_SIZE, cwd: str = "/app",
+                 warm_modules: tuple = RUN_SCRIPT_WARM_MODULES):
+        # spawn, not fork: the parent already runs Slack/tool threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self.cwd = cwd
+        self.warm_modules = warm_modules
+        self._idle = queue.Queue()
+        self._procs = set()
+        self._procs_lock = threading.Lock()
+        self._spawn_error = None
+        self._closed = False
+        for _ in range(max(size, 1)):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        # Non-daemon: daemonic processes may not start children of their own,
+        # which scripts using multiprocessing/ProcessPoolExecutor need
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_script_worker, args=(child_conn, self.cwd, self.warm_modules)
+        )
+        proc.start()
+        child_conn.close()
+        with self._procs_lock:
+            self._procs.add(proc)
+        self._idle.put((proc, parent_conn))
+
+    def _spawn_replacement(self) -> None:
+        if self._closed:
+            return
+        try:
+            self._spawn()
+            self._spawn_error = None
+        except Exception as e:
+            self._spawn_error = e
+            logger.error(f"Script worker spawn failed: {e}")
+
+    def _reap(self, proc) -> None:
+        proc.join()
+        with self._procs_lock:
+            self._procs.discard(proc)
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """Stop idle workers and reap every worker process (kills stragglers)."""
+        self._closed = True
+        while True:
+            try:
+                proc, conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.send(None)
+            except Exception:
+                pass
+            conn.close()
+        with self._procs_lock:
+            procs = list(self._procs)
+        deadline = time.monotonic() + timeout
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join(1)
+        with self._procs_lock:
+            self._procs.clear()
+
+    def run(self, script_path: str, args: list, timeout: float = RUN_SCRIPT_TIMEOUT,
+            on_output=None, keep_chars: int = 20000) -> dict:
+        """
+        Run a script in a warm worker. on_output(kind, text) receives output
+        as it is produced; the last `keep_chars` of each stream are returned.
+        On timeout only that worker is killed.
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        if self._closed:
+            raise ScriptPoolUnavailable("Script worker pool is shut down")
+        try:
+            # A recent failed spawn means none may be coming: don't wait long
+            wait = 0.5 if self._spawn_error else RUN_SCRIPT_WORKER_WAIT
+            proc, conn = self._idle.get(timeout=wait)
+        except queue.Empty:
+            raise ScriptPoolUnavailable(
+                f"No script worker ready after {wait:g}s ({self._spawn_error or 'workers still starting'})"
+            )
+        threading.Thread(target=self._spawn_replacement, daemon=True).start()  # Warm a replacement meanwhile
+        output = {"stdout": [], "stderr": []}
+        sizes = {"stdout": 0, "stderr": 0}
+        code = None
+        try:
+            started = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not conn.poll(remaining):
+                    proc.kill()
+                    return {"error": f"Script timed out after {timeout:g} seconds"}
+                try:
+                    kind, data = conn.recv()
+                except EOFError:
+                    proc.join(1)
+                    if not started:
+                        return {"error": f"Script worker exited during start-up (exit code {proc.exitcode})"}
+                    code = proc.exitcode if proc.exitcode is not None else -1
+                    break
+                if kind == "ready" and not started:
+                    conn.send((script_path, list(args)))
+                    started = True
+                elif kind == "exit":
+                    code = data
+                    break
+                elif kind in output:
+                    if on_output:
+                        on_output(kind, data)
+                    chunks = output[kind]
+                    chunks.append(data)
+                    sizes[kind] += len(data)
+                    while len(chunks) > 1 and sizes[kind] - len(chunks[0]) >= keep_chars:
+                        sizes[kind] -= len(chunks.pop(0))
+        finally:
+            conn.close()
+            if code is None and proc.is_alive():
+                proc.kill()
+            threading.Thread(target=self._reap, args=(proc,), daemon=True).start()  # Reap without waiting for shutdown
+        return {
+            "stdout": "".join(output["stdout"])[-keep_chars:],
+            "stderr": "".join(output["stderr"])[-keep_chars:],
+            "returncode": code,
+            "duration_s": round(time.perf_counter() - start, 3),
+        }
+
+
+_SCRIPT_POOL = None
+_SCRIPT_POOL_LOCK = threading.Lock()
+
+
+def get_script_pool():
+    """Process-wide ScriptWorkerPool, started on first use (None in subprocess mode)."""
+    global _SCRIPT_POOL
+    if RUN_SCRIPT_MODE != "pool":
+        return None
+    with _SCRIPT_POOL_LOCK:
+        if _SCRIPT_POOL is None:
+            try:
+                _SCRIPT_POOL = ScriptWorkerPool(cwd=str(EXECUTION_DIR.parent))
+                atexit.register(_SCRIPT_POOL.shutdown)
+            except Exception as e:
+                logger.error(f"Script worker pool unavailable, using subprocesses: {e}")
+                return None
+        return _SCRIPT_POOL
+
+
 def run_agent_tool(tool_name: str, tool_input: dict, token_data: dict) -> dict:
     """Execute an agent tool and return result."""
 
@@ -1075,6 +1896,23 @@ def run_agent_tool(tool_name: str, tool_input: dict, token_data: dict) -> dict:
         if not Path(script_path).exists():
             return {"error": f"Script '{name}' not found"}
 
+        pool = get_script_pool()
+        if pool is not None:
+            try:
+                result = pool.run(
+                    script_path, args, on_output=lambda kind, text: logger.info(f"[{name}] {text.rstrip()}")
+                )
+            except ScriptPoolUnavailable as e:
+                logger.warning(f"{e}; running {name} in a subprocess")
+                result = None
+            except Exception as e:
+                return {"error": str(e)}
+            if result is not None:
+                if "error" not in result:
+                    result["stdout"] = result["stdout"][-5000:]
+                    result["stderr"] = result["stderr"][-2000:]
+                return result
+
         try:
             cmd = ["python3", script_path] + args
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300, cwd="/app")
@@ -1124,6 +1962,7 @@ def general_agent(query: str = "", format: str = "json"):
         })
 
     slack_notify(f"🤖 *Agent Request*\n```{query[:500]}```")
+    get_script_pool()  # Start warming script workers while the model thinks
 
     # Get API key
     api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -1168,28 +2007,30 @@ Be concise. Complete tasks fully."""
         turns = 0
         max_turns = 10
 
+        def run_tool(block):
+            result = run_agent_tool(block.name, block.input, token_data)
+            return json.dumps(result) if isinstance(result, (dict, list)) else str(result), False
+
         while response.stop_reason == "tool_use" and turns < max_turns:
             turns += 1
             tool_results = []
 
-            for block in response.content:
-                if block.type == "tool_use":
-                    slack_notify(f"🔧 *Tool: {block.name}*")
+            tool_uses = [b for b in response.content if b.type == "tool_use"]
+            for block in tool_uses:
+                slack_notify(f"🔧 *Tool: {block.name}*")
 
-                    try:
-                        result = run_agent_tool(block.name, block.input, token_data)
-                        result_str = json.dumps(result) if isinstance(result, (dict, list)) else str(result)
-                        slack_notify(f"✅ Success: {result_str[:200]}")
-                    except Exception as e:
-                        result_str = json.dumps({"error": str(e)})
-                        slack_notify(f"❌ Error: {str(e)}")
-
-                    conversation.append({"tool": block.name, "result": result_str[:500]})
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result_str[:10000]
-                    })
+            for block, result_str, is_error, seconds in execute_tool_calls(tool_uses, run_tool):
+                if is_error:
+                    slack_notify(f"❌ Error: {result_str[:200]}")
+                else:
+                    slack_notify(f"✅ Success: {result_str[:200]}")
+
+                conversation.append({"tool": block.name, "result": result_str[:500], "duration_s": round(seconds, 3)})
+                tool_results.append({
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": result_str[:10000]
+                })
 
             messages.append({"role": "assistant", "content": response.content})
             messages.append({"role": "user", "content": tool_results})
@@ -1209,6 +2050,7 @@ Be concise. Complete tasks fully."""
                 final += block.text
 
         slack_notify(f"🏁 *Done*\n{final[:500]}")
+        slack_flush()
 
         return JSONResponse({
             "status": "success",
@@ -1219,7 +2061,8 @@ Be concise. Complete tasks fully."""
         })
 
     except Exception as e:
-        slack_notify(f"💥 *Error*: {str(e)}")
+        slack_notify(f"💥 *Error*: {str(e)}", priority="high")
+        slack_flush()
         return JSONResponse({"error": str(e)}, status_code=500)
 
 
@@ -1427,6 +2270,149 @@ def hourly_lead_scraper():
 # EXECUTION-ONLY WEBHOOKS (No Claude orchestration - pure script execution)
 # ============================================================================
 
+AMF_URL = "https://api.anymailfinder.com/v5.1/find-email/person"
+AMF_CONCURRENCY = int(os.getenv("AMF_CONCURRENCY", "20"))
+AMF_RATE_PER_SEC = float(os.getenv("AMF_RATE_PER_SEC", "10"))
+AMF_FLUSH_EVERY = int(os.getenv("AMF_FLUSH_EVERY", "50"))
+SHEETS_WRITE_RETRIES = 5
+SHEETS_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Thread-safe token bucket; acquire() blocks until the next call is allowed."""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1  # Reserve a slot, possibly in the future
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def _amf_person_body(contact_name: str, website: str, company_name: str):
+    """AnyMailFinder person-search body for a lead, or None if it lacks a name or company."""
+    domain = ""
+    if website:
+        domain = website.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
+    name_parts = contact_name.split() if contact_name else []
+    first_name = name_parts[0] if name_parts else ""
+    last_name = name_parts[-1] if len(name_parts) > 1 else ""
+    if not ((first_name or contact_name) and (domain or company_name)):
+        return None
+    body = {}
+    if contact_name:
+        body["full_name"] = contact_name
+    if first_name:
+        body["first_name"] = first_name
+    if last_name:
+        body["last_name"] = last_name
+    if domain:
+        body["domain"] = domain
+    if company_name:
+        body["company_name"] = company_name
+    return body
+
+
+def enrich_sheet_emails(worksheet, all_data: list, api_key: str, concurrency: int = AMF_CONCURRENCY,
+                        rate_per_sec: float = AMF_RATE_PER_SEC, flush_every: int = AMF_FLUSH_EVERY) -> dict:
+    """
+    Find missing emails with AnyMailFinder and write them back to the sheet.
+
+    Rows that already have an email are skipped, so an interrupted run can
+    simply be repeated. Lookups run on `concurrency` threads sharing one
+    pooled requests.Session, throttled to `rate_per_sec` (429s back off
+    and retry), and found emails are written with one batch_update per
+    `flush_every` results instead of one update_acell per lead (429/5xx
+    from Sheets back off and retry).
+    """
+    import requests as http_requests
+    from requests.adapters import HTTPAdapter
+
+    header_row = all_data[0]
+    col = lambda name: header_row.index(name) if name in header_row else -1
+    email_col, company_col, contact_col, website_col = col("email"), col("company_name"), col("contact_name"), col("website")
+    if email_col < 0:
+        return {"enriched": 0, "looked_up": 0, "skipped": 0, "error": "no email column"}
+
+    cell = lambda row, idx: row[idx] if 0 <= idx < len(row) else ""
+    jobs, skipped = [], 0
+    for row_idx, row in enumerate(all_data[1:], start=2):  # Skip header, 1-indexed in sheets
+        if cell(row, email_col):  # Already has email (also makes reruns resume)
+            skipped += 1
+            continue
+        body = _amf_person_body(cell(row, contact_col), cell(row, website_col), cell(row, company_col))
+        if body:
+            jobs.append((row_idx, body))
+
+    session = http_requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrency))
+    session.headers.update({"Authorization": api_key, "Content-Type": "application/json"})
+    limiter = RateLimiter(rate_per_sec)
+
+    def find_email(job):
+        row_idx, body = job
+        for attempt in range(4):
+            limiter.acquire()
+            try:
+                resp = session.post(AMF_URL, json=body, timeout=30)
+            except Exception as e:
+                logger.warning(f"AMF error for {body.get('full_name', '')}: {e}")
+                return row_idx, ""
+            if resp.status_code == 429:
+                retry_after = resp.headers.get("Retry-After", "")
+                time.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+                continue
+            if resp.status_code == 200:
+                try:
+                    return row_idx, resp.json().get("email", "") or ""
+                except Exception as e:  # Non-JSON body or a JSON non-object
+                    logger.warning(f"AMF bad response for {body.get('full_name', '')}: {e}")
+            return row_idx, ""
+        return row_idx, ""
+
+    pending, enriched = [], 0
+
+    def flush():
+        nonlocal pending
+        if not pending:
+            return
+        for attempt in range(SHEETS_WRITE_RETRIES + 1):
+            try:
+                worksheet.batch_update(pending)
+                break
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status not in SHEETS_RETRYABLE_STATUS or attempt == SHEETS_WRITE_RETRIES:
+                    raise
+                delay = min(60, 2 ** attempt) * random.uniform(0.75, 1.25)
+                logger.warning(f"Sheets API {status}, retrying {len(pending)} email writes in {delay:.1f}s")
+                time.sleep(delay)
+        pending = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            for row_idx, email in pool.map(find_email, jobs):
+                if email:
+                    pending.append({"range": f"{column_letter(email_col)}{row_idx}", "values": [[email]]})
+                    enriched += 1
+                    if len(pending) >= flush_every:
+                        flush()
+    finally:
+        flush()  # Keep what was found even if the run is cut short
+        session.close()
+    return {"enriched": enriched, "looked_up": len(jobs), "skipped": skipped}
+
+
 # Background function for full lead scraping workflow
 @app.function(image=image, secrets=ALL_SECRETS, timeout=1800)  # 30 min timeout for full workflow
 def scrape_leads_background(query: str, location: str, limit: int, sheet_id: str, sheet_url: str):
@@ -1442,7 +2428,6 @@ def scrape_leads_background(query: str, location: str, limit: int, sheet_id: str
     import anthropic
     from google.oauth2.credentials import Credentials as UserCredentials
     from google.auth.transport.requests import Request
-    import requests as http_requests
 
     try:
         # ===== STEP 1: Scrape with Apify =====
@@ -1537,66 +2522,9 @@ def scrape_leads_background(query: str, location: str, limit: int, sheet_id: str
         if not amf_api_key:
             slack_notify("⚠️ ANYMAILFINDER_API_KEY not configured, skipping enrichment")
         else:
-            # Get rows that need enrichment (no email)
-            all_data = worksheet.get_all_values()
-            header_row = all_data[0]
-
-            # Find column indices
-            email_col = header_row.index("email") if "email" in header_row else -1
-            company_col = header_row.index("company_name") if "company_name" in header_row else -1
-            contact_col = header_row.index("contact_name") if "contact_name" in header_row else -1
-            website_col = header_row.index("website") if "website" in header_row else -1
-
-            enriched_count = 0
-            for row_idx, row in enumerate(all_data[1:], start=2):  # Skip header, 1-indexed in sheets
-                if email_col >= 0 and row[email_col]:  # Already has email
-                    continue
-
-                company_name = row[company_col] if company_col >= 0 else ""
-                contact_name = row[contact_col] if contact_col >= 0 else ""
-                website = row[website_col] if website_col >= 0 else ""
-
-                # Extract domain from website
-                domain = ""
-                if website:
-                    domain = website.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
-
-                # Parse contact name
-                name_parts = contact_name.split() if contact_name else []
-                first_name = name_parts[0] if name_parts else ""
-                last_name = name_parts[-1] if len(name_parts) > 1 else ""
-
-                # Call AnyMailFinder API
-                try:
-                    amf_url = "https://api.anymailfinder.com/v5.1/find-email/person"
-                    amf_headers = {"Authorization": amf_api_key, "Content-Type": "application/json"}
-                    amf_body = {}
-
-                    if contact_name:
-                        amf_body["full_name"] = contact_name
-                    if first_name:
-                        amf_body["first_name"] = first_name
-                    if last_name:
-                        amf_body["last_name"] = last_name
-                    if domain:
-                        amf_body["domain"] = domain
-                    if company_name:
-                        amf_body["company_name"] = company_name
-
-                    if (first_name or contact_name) and (domain or company_name):
-                        resp = http_requests.post(amf_url, json=amf_body, headers=amf_headers, timeout=30)
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            email = data.get("email", "")
-                            if email:
-                                # Update cell
-                                cell = f"{chr(65 + email_col)}{row_idx}"
-                                worksheet.update_acell(cell, email)
-                                enriched_count += 1
-                except Exception as e:
-                    logger.warning(f"AMF error for {contact_name}: {e}")
-
-            slack_notify(f"✅ Enriched {enriched_count} emails")
+            # Concurrent, rate-limited lookups; rows that already have emails are skipped
+            stats = enrich_sheet_emails(worksheet, worksheet.get_all_values(), amf_api_key)
+            slack_notify(f"✅ Enriched {stats['enriched']} emails ({stats['looked_up']} looked up, {stats['skipped']} already had one)")
 
         # ===== STEP 4: Casualize first names, company names, and cities =====
         slack_notify(f"✨ *Step 4/4: Casualizing names (first, company, city)*")
@@ -2175,68 +3103,88 @@ Return ONLY the JSON, no markdown code blocks or explanations."""
 # YOUTUBE OUTLIER DETECTION (Using Apify - more reliable in cloud)
 # ============================================================================
 
-def scrape_youtube_with_apify(keywords: list, max_per_keyword: int, days_back: int) -> list:
+YOUTUBE_SEARCH_WORKERS = int(os.getenv("YOUTUBE_SEARCH_WORKERS", "8"))
+YOUTUBE_SUMMARY_WORKERS = 5
+YOUTUBE_SUMMARY_CACHE = "youtube-outlier-summaries"  # modal.Dict: video_id -> summary
+YOUTUBE_SUMMARY_COLUMN = "H"
+
+
+def _youtube_video_id(item: dict) -> str:
+    """Video id from an Apify dataset item (id/videoId field or a watch URL)."""
+    video_id = item.get("id") or item.get("videoId")
+    if not video_id:
+        url = item.get("url") or item.get("videoUrl") or item.get("inputUrl") or ""
+        if "v=" in url:
+            video_id = url.split("v=")[-1].split("&")[0]
+        elif "youtu.be/" in url:
+            video_id = url.split("youtu.be/")[-1].split("?")[0]
+    return video_id or ""
+
+
+def _search_youtube_keyword(client, keyword: str, max_per_keyword: int) -> list:
+    """One streamers/youtube-scraper run for a single keyword."""
+    # streamers/youtube-scraper - exact input schema
+    run_input = {
+        "searchQueries": [keyword],
+        "maxResults": max_per_keyword,
+        "maxResultsShorts": 0,
+        "maxResultStreams": 0,
+    }
+
+    run = client.actor("streamers/youtube-scraper").call(run_input=run_input, timeout_secs=60)
+
+    videos = []
+    for item in client.dataset(run["defaultDatasetId"]).iterate_items():
+        video_id = _youtube_video_id(item)
+        video_data = {
+            "title": item.get("title"),
+            "url": item.get("url") or f"https://www.youtube.com/watch?v={video_id}",
+            "view_count": item.get("viewCount") or 0,
+            "channel_name": item.get("channelName"),
+            "channel_url": item.get("channelUrl"),
+            "thumbnail_url": item.get("thumbnailUrl"),
+            "date": item.get("date"),
+            "video_id": video_id,
+        }
+        if video_data["title"] and video_data["video_id"]:
+            videos.append(video_data)
+    return videos
+
+
+def scrape_youtube_with_apify(keywords: list, max_per_keyword: int, days_back: int, apify_client=None) -> list:
     """
     FAST YouTube search using streamers/youtube-scraper.
     ~15 seconds for 3 results. Pay-per-result pricing.
+    All keyword runs are submitted at once (up to YOUTUBE_SEARCH_WORKERS).
     """
-    from apify_client import ApifyClient
+    client = apify_client
+    if client is None:
+        from apify_client import ApifyClient
 
-    apify_token = os.getenv("APIFY_API_TOKEN")
-    if not apify_token:
-        slack_notify("Error: APIFY_API_TOKEN not set")
-        return []
+        apify_token = os.getenv("APIFY_API_TOKEN")
+        if not apify_token:
+            slack_notify("Error: APIFY_API_TOKEN not set")
+            return []
+        client = ApifyClient(apify_token)
 
-    client = ApifyClient(apify_token)
-    all_videos = []
+    slack_notify(f"Searching {len(keywords)} keywords in parallel")
 
-    for keyword in keywords:
+    def search(keyword):
         try:
-            slack_notify(f"Searching: {keyword}")
-
-            # streamers/youtube-scraper - exact input schema
-            run_input = {
-                "searchQueries": [keyword],
-                "maxResults": max_per_keyword,
-                "maxResultsShorts": 0,
-                "maxResultStreams": 0,
-            }
-
-            run = client.actor("streamers/youtube-scraper").call(run_input=run_input, timeout_secs=60)
-
-            count = 0
-            for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-                video_id = item.get("id") or item.get("videoId")
-                if not video_id:
-                    url = item.get("url") or ""
-                    if "v=" in url:
-                        video_id = url.split("v=")[-1].split("&")[0]
-
-                view_count = item.get("viewCount") or 0
-
-                video_data = {
-                    "title": item.get("title"),
-                    "url": item.get("url") or f"https://www.youtube.com/watch?v={video_id}",
-                    "view_count": view_count,
-                    "channel_name": item.get("channelName"),
-                    "channel_url": item.get("channelUrl"),
-                    "thumbnail_url": item.get("thumbnailUrl"),
-                    "date": item.get("date"),
-                    "video_id": video_id,
-                }
-
-                if video_data["title"] and video_data["video_id"]:
-                    all_videos.append(video_data)
-                    count += 1
-
-            slack_notify(f"Found {count} videos for '{keyword}'")
-
+            videos = _search_youtube_keyword(client, keyword, max_per_keyword)
+            slack_notify(f"Found {len(videos)} videos for '{keyword}'", priority="low")
+            return videos
         except Exception as e:
             error_msg = str(e)[:150]
             logger.error(f"Apify error for '{keyword}': {error_msg}")
             slack_notify(f"Apify error: {error_msg}")
+            return []
 
-    return all_videos
+    if not keywords:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(YOUTUBE_SEARCH_WORKERS, len(keywords)))) as pool:
+        results = list(pool.map(search, keywords))  # Keeps keyword order
+    return [video for videos in results for video in videos]
 
 
 def get_channel_average_apify(channel_url: str, apify_client) -> int:
@@ -2247,28 +3195,46 @@ def get_channel_average_apify(channel_url: str, apify_client) -> int:
     return 0
 
 
-def fetch_youtube_transcript(video_id, apify_client):
-    """Fetch transcript using Apify (karamelo/youtube-transcripts)."""
-    if not video_id:
-        return None
+def fetch_youtube_transcripts(video_ids: list, apify_client) -> dict:
+    """Fetch transcripts for many videos in ONE karamelo/youtube-transcripts run: {video_id: text}."""
+    video_ids = [v for v in dict.fromkeys(video_ids) if v]
+    if not video_ids:
+        return {}
 
     try:
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-        run_input = {"urls": [video_url]}
-        run = apify_client.actor("karamelo/youtube-transcripts").call(run_input=run_input, timeout_secs=120)
+        run_input = {"urls": [f"https://www.youtube.com/watch?v={v}" for v in video_ids]}
+        run = apify_client.actor("karamelo/youtube-transcripts").call(
+            run_input=run_input, timeout_secs=120 + 30 * len(video_ids)
+        )
 
-        dataset_items = list(apify_client.dataset(run["defaultDatasetId"]).iterate_items())
+        transcripts = {}
+        items = list(apify_client.dataset(run["defaultDatasetId"]).iterate_items())
+        for i, item in enumerate(items):
+            # Match by id/URL; fall back to input order for items without one
+            video_id = _youtube_video_id(item) or (video_ids[i] if len(items) == len(video_ids) else "")
+            captions = item.get("captions", [])
+            if video_id and captions and isinstance(captions, list):
+                transcripts[video_id] = " ".join(captions)
+        return transcripts
+    except Exception as e:
+        logger.warning(f"Transcript error for {len(video_ids)} videos: {str(e)[:100]}")
+        return {}
 
-        if dataset_items and len(dataset_items) > 0:
-            transcript_data = dataset_items[0]
-            captions = transcript_data.get("captions", [])
-            if captions and isinstance(captions, list):
-                return " ".join(captions)
 
+def fetch_youtube_transcript(video_id, apify_client):
+    """Fetch transcript using Apify (karamelo/youtube-transcripts)."""
+    if not video_id:
         return None
+    return fetch_youtube_transcripts([video_id], apify_client).get(video_id)
+
+
+def youtube_summary_cache():
+    """Persistent video_id -> summary cache shared by all runs (plain dict if Modal Dict is unavailable)."""
+    try:
+        return modal.Dict.from_name(YOUTUBE_SUMMARY_CACHE, create_if_missing=True)
     except Exception as e:
-        logger.warning(f"Transcript error for {video_id}: {str(e)[:100]}")
-        return None
+        logger.warning(f"Summary cache unavailable, summarising everything: {e}")
+        return {}
 
 
 def summarize_youtube_transcript(text, anthropic_client):
@@ -2298,6 +3264,104 @@ Do not use any markdown formatting (no asterisks, no bullet points, no headers w
         return f"Error summarizing: {e}"
 
 
+def _cache_get(cache, key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _outlier_row(v: dict, summary: str) -> list:
+    return [
+        v.get("outlier_score"),
+        v.get("title"),
+        v.get("url"),
+        v.get("view_count"),
+        v.get("channel_name"),
+        v.get("channel_avg"),
+        f'=IMAGE("{v.get("thumbnail_url")}")',
+        summary,
+        v.get("date")
+    ]
+
+
+def _first_appended_row(response) -> int:
+    """First sheet row written by ws.append_rows (from updates.updatedRange, e.g. 'Sheet1!A2:I11')."""
+    updated = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)", updated)
+    return int(match.group(1)) if match else 0
+
+
+def summarize_outliers_to_sheet(top_outliers: list, ws, apify_client, claude_client, cache) -> dict:
+    """
+    Write outlier rows to the sheet straight away, then stream in summaries.
+
+    Cached summaries (by video_id) are written with the rows; the remaining
+    transcripts come from one multi-URL Apify run, and each summary is
+    written to its row and cached as soon as Claude finishes it. If the
+    append response doesn't say where the rows landed, summaries are
+    written at the end with one batch_update, locating rows by URL.
+    """
+    for video in top_outliers:
+        video["summary"] = _cache_get(cache, video["video_id"]) if video.get("video_id") else None
+    pending = [v for v in top_outliers if not v["summary"]]
+
+    rows = [_outlier_row(v, v["summary"] or "Summarizing...") for v in top_outliers]
+    first_row = _first_appended_row(ws.append_rows(rows, value_input_option='USER_ENTERED'))
+    row_of = {id(v): first_row + i for i, v in enumerate(top_outliers)} if first_row else {}
+    if not first_row:
+        logger.warning("append_rows response has no updatedRange; writing summaries in one batch at the end")
+
+    def write_summary(video):
+        if id(video) in row_of:
+            ws.update(range_name=f"{YOUTUBE_SUMMARY_COLUMN}{row_of[id(video)]}", values=[[video["summary"]]])
+
+    stats = {"cached": len(top_outliers) - len(pending), "summarized": 0, "no_transcript": 0}
+    if not pending:
+        return stats
+
+    transcripts = fetch_youtube_transcripts([v["video_id"] for v in pending], apify_client)
+
+    def summarize(video):
+        transcript = transcripts.get(video["video_id"])
+        if not transcript:
+            return video, False
+        return video, summarize_youtube_transcript(transcript, claude_client)
+
+    with ThreadPoolExecutor(max_workers=YOUTUBE_SUMMARY_WORKERS) as executor:
+        futures = [executor.submit(summarize, v) for v in pending]
+        for future in as_completed(futures):
+            video, summary = future.result()
+            if not summary:
+                video["summary"] = "No transcript available."
+                stats["no_transcript"] += 1
+            else:
+                video["summary"] = summary
+                stats["summarized"] += 1
+                if not summary.startswith("Error summarizing"):
+                    try:
+                        cache[video["video_id"]] = summary
+                    except Exception as e:
+                        logger.warning(f"Summary cache write failed: {e}")
+            try:
+                write_summary(video)
+            except Exception as e:
+                logger.warning(f"Sheet update failed for {video.get('video_id')}: {e}")
+
+    if not first_row:
+        # URL is column C; the rows we just appended are the last ones with each URL
+        row_by_url = {url: i for i, url in enumerate(ws.col_values(3), start=1)}
+        updates = [
+            {"range": f"{YOUTUBE_SUMMARY_COLUMN}{row_by_url[v.get('url')]}", "values": [[v["summary"]]]}
+            for v in pending if v.get("url") in row_by_url
+        ]
+        if len(updates) < len(pending):
+            logger.warning(f"Could not locate {len(pending) - len(updates)} outlier rows for their summaries")
+        if updates:
+            ws.batch_update(updates)
+    return stats
+
+
 @app.function(image=image, secrets=ALL_SECRETS, timeout=1800)
 def youtube_outliers_background(
     keywords: list,
@@ -2311,7 +3375,6 @@ def youtube_outliers_background(
     """
     Background task: Full YouTube outlier detection workflow.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
     from apify_client import ApifyClient
     import anthropic
     import gspread
@@ -2357,34 +3420,10 @@ def youtube_outliers_background(
             slack_notify("No outliers found above threshold")
             return {"status": "no_outliers", "videos_found": len(videos)}
 
-        # Step 4: Fetch Transcripts & Summarize
-        slack_notify("Step 4/5: Fetching transcripts & summarizing")
-
-        apify_token = os.getenv("APIFY_API_TOKEN")
-        anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-
-        if apify_token and anthropic_key:
-            apify_client = ApifyClient(apify_token)
-            claude_client = anthropic.Anthropic(api_key=anthropic_key)
-
-            def process_outlier(video):
-                video_id = video.get("video_id")
-                transcript = fetch_youtube_transcript(video_id, apify_client)
-                video["summary"] = summarize_youtube_transcript(transcript, claude_client) if transcript else "No transcript available."
-                return video
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(process_outlier, v) for v in top_outliers]
-                processed = [future.result() for future in as_completed(futures)]
-            top_outliers = processed
-        else:
-            for video in top_outliers:
-                video["summary"] = "API keys not configured"
-
         top_outliers.sort(key=lambda x: x["outlier_score"], reverse=True)
 
-        # Step 5: Upload to Google Sheet
-        slack_notify(f"Step 5/5: Uploading {len(top_outliers)} outliers to Sheet")
+        # Step 4: Upload rows now; summaries are filled in as they finish
+        slack_notify(f"Step 4/5: Uploading {len(top_outliers)} outliers to Sheet")
 
         token_data = json.loads(os.getenv("GOOGLE_TOKEN_JSON"))
         creds = UserCredentials(
@@ -2405,21 +3444,22 @@ def youtube_outliers_background(
         headers = ["Outlier Score", "Title", "Video Link", "View Count", "Channel Name", "Channel Avg", "Thumbnail", "Summary", "Publish Date"]
         ws.append_row(headers)
 
-        rows = []
-        for v in top_outliers:
-            rows.append([
-                v.get("outlier_score"),
-                v.get("title"),
-                v.get("url"),
-                v.get("view_count"),
-                v.get("channel_name"),
-                v.get("channel_avg"),
-                f'=IMAGE("{v.get("thumbnail_url")}")',
-                v.get("summary"),
-                v.get("date")
-            ])
+        # Step 5: Transcripts (one Apify run) & streamed summaries, cached by video_id
+        slack_notify("Step 5/5: Fetching transcripts & summarizing")
 
-        ws.append_rows(rows, value_input_option='USER_ENTERED')
+        apify_token = os.getenv("APIFY_API_TOKEN")
+        anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+
+        if apify_token and anthropic_key:
+            stats = summarize_outliers_to_sheet(
+                top_outliers, ws, ApifyClient(apify_token), anthropic.Anthropic(api_key=anthropic_key),
+                youtube_summary_cache()
+            )
+            slack_notify(f"Summaries: {stats['summarized']} new, {stats['cached']} cached, {stats['no_transcript']} without transcript")
+        else:
+            for video in top_outliers:
+                video["summary"] = "API keys not configured"
+            ws.append_rows([_outlier_row(v, v["summary"]) for v in top_outliers], value_input_option='USER_ENTERED')
 
         slack_notify(f"YouTube Outliers Complete!\nOutliers: {len(top_outliers)}\nSheet: {sheet_url}")
 
@@ -2513,7 +3553,11 @@ def youtube_outliers(
 
 
 @app.local_entrypoint()
-def main():
+def main(slack_benchmark: bool = False, messages: int = 30, delay: float = 0.2):
+    if slack_benchmark:
+        # modal run execution/modal_webhook.py --slack-benchmark --messages 30 --delay 0.2
+        print(json.dumps(benchmark_slack_sink(messages, delay), indent=2))
+        return
     print("Modal Claude Orchestrator - Directive Edition")
     print("=" * 50)
     print("Deploy:  modal deploy execution/modal_webhook.py")
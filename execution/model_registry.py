@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Shared Model Registry
+
+Lazy, process-wide cache for the heavy models used by the video and
+transcription scripts (Silero VAD, OpenAI Whisper). The first call loads
+the model; every later call in the same process gets the same instance,
+so batch runs over a folder of clips load each model once.
+
+Usage:
+    from model_registry import get_silero_vad, get_whisper_model
+
+    model, utils = get_silero_vad()
+    whisper_model = get_whisper_model("base")
+
+Models are shared, not copied: run inference from one thread at a time
+(Silero keeps recurrent state between calls).
+"""
+
+import importlib.util
+import threading
+
+_models = {}
+_load_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_load(key: tuple, loader):
+    """Return the cached model for key, loading it once (other keys can load concurrently)."""
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _load_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _models:
+            _models[key] = loader()
+        return _models[key]
+
+
+def default_device() -> str:
+    """'cuda' if torch sees a GPU, else 'cpu'."""
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def whisper_available() -> bool:
+    """True if openai-whisper is installed (checked without importing it)."""
+    return importlib.util.find_spec("whisper") is not None
+
+
+def get_silero_vad():
+    """Silero VAD (model, utils) tuple from torch.hub, loaded once per process."""
+    def load():
+        import torch
+        return torch.hub.load(
+            repo_or_dir='snakers4/silero-vad',
+            model='silero_vad',
+            force_reload=False,
+            trust_repo=True
+        )
+
+    return _get_or_load(("silero_vad",), load)
+
+
+def get_whisper_model(model_name: str = "base", device: str = None):
+    """OpenAI Whisper model by name/device, loaded once per process."""
+    import whisper
+
+    device = device or default_device()
+
+    def load():
+        print(f"Loading Whisper model '{model_name}' on {device}...")
+        return whisper.load_model(model_name, device=device)
+
+    return _get_or_load(("whisper", model_name, device), load)
+
+
+def loaded_models() -> list[tuple]:
+    """Keys of the models currently held in memory."""
+    return list(_models)
+
+
+def clear_models():
+    """Drop every cached model (frees memory between unrelated batches)."""
+    with _registry_lock:
+        _models.clear()
+        _load_locks.clear()
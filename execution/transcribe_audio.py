@@ -16,19 +16,33 @@ Usage:
 
     # Force language
     python transcribe_audio.py --input recording.mp4 --method local --language en
+
+    # Long file on CPU: 5-minute windows, 2 worker processes, resumable checkpoint
+    python transcribe_audio.py --input lecture.mp4 --method local --model small --workers 2
+
+    # Batch: every audio/video file in a folder (model loaded once)
+    python transcribe_audio.py --input recordings/ --method local --output .tmp/transcripts
 """
 
 import os
 import sys
 import json
+import atexit
 import argparse
+import multiprocessing
+import wave
+import shutil
 import tempfile
 import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import timedelta
 
 from dotenv import load_dotenv
 
+from model_registry import get_whisper_model, default_device, whisper_available
+
 load_dotenv()
 
 # Supported file extensions
@@ -39,6 +53,21 @@ ALL_EXTENSIONS = AUDIO_EXTENSIONS | VIDEO_EXTENSIONS
 # Whisper API max file size (25MB)
 API_MAX_BYTES = 25 * 1024 * 1024
 
+# Chunked API transcription: one ffmpeg pass cuts 16 kHz mono WAV slices; each
+# request covers one slice plus the first API_OVERLAP_SECONDS of the next.
+# 16 kHz s16 mono is 32 KB/s, so (600 + 5)s stays under the 25MB limit.
+PCM_RATE = 16000
+API_CHUNK_SECONDS = 600
+API_OVERLAP_SECONDS = 5
+API_WORKERS = 4
+
+# Chunked local transcription: ffmpeg decodes one window at a time into a pipe;
+# windows overlap like API chunks and carry the previous window's text as prompt
+LOCAL_WINDOW_SECONDS = 300
+LOCAL_OVERLAP_SECONDS = 5
+LOCAL_WORKERS = 2  # Each worker process holds its own model copy
+LOCAL_CONTEXT_CHARS = 400
+
 # Tmp directory
 TMP_DIR = Path(".tmp")
 
@@ -86,55 +115,99 @@ def extract_audio_from_video(video_path: str, output_path: str = None) -> str:
     return output_path
 
 
-def split_audio_for_api(audio_path: str, max_size_bytes: int = API_MAX_BYTES) -> list:
+def get_audio_duration(audio_path: str) -> float:
+    """Duration in seconds via ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "quiet", "-show_entries",
+        "format=duration", "-of", "csv=p=0", audio_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+
+def split_audio_segments(audio_path: str, chunk_seconds: float = API_CHUNK_SECONDS) -> list[dict]:
     """
-    Split audio file into chunks under 25MB for Whisper API.
-    Returns list of chunk file paths.
+    Cut audio into ~chunk_seconds 16 kHz mono WAV slices with a single ffmpeg
+    segment-muxer pass (the source is decoded once).
+
+    Returns [{"path", "offset", "frames"}] in order. Offsets are the running
+    sum of the slices' frame counts, so they are exact to the sample.
     """
-    file_size = os.path.getsize(audio_path)
-    if file_size <= max_size_bytes:
-        return [audio_path]
-    
-    print(f"File is {file_size / (1024*1024):.1f} MB — splitting into chunks...")
     ensure_tmp_dir()
-    
-    # Get duration using ffprobe
+    out_dir = Path(tempfile.mkdtemp(prefix="whisper_slices_", dir=TMP_DIR))
     cmd = [
-        "ffprobe", "-v", "quiet", "-show_entries",
-        "format=duration", "-of", "csv=p=0", audio_path
+        "ffmpeg", "-i", audio_path,
+        "-vn", "-ac", "1", "-ar", str(PCM_RATE), "-c:a", "pcm_s16le",
+        "-f", "segment", "-segment_time", str(chunk_seconds), "-reset_timestamps", "1",
+        "-loglevel", "error", "-y",
+        str(out_dir / "slice_%04d.wav")
     ]
     result = subprocess.run(cmd, capture_output=True, text=True)
-    total_duration = float(result.stdout.strip())
-    
-    # Calculate chunk duration to stay under 25MB
-    # Aim for ~20MB chunks to be safe
-    target_chunk_size = 20 * 1024 * 1024
-    num_chunks = max(2, int(file_size / target_chunk_size) + 1)
-    chunk_duration = total_duration / num_chunks
-    
-    chunks = []
-    for i in range(num_chunks):
-        start = i * chunk_duration
-        chunk_path = str(TMP_DIR / f"chunk_{i:03d}.mp3")
-        
-        cmd = [
-            "ffmpeg", "-i", audio_path,
-            "-ss", str(start),
-            "-t", str(chunk_duration),
-            "-acodec", "libmp3lame",
-            "-ar", "16000",
-            "-ac", "1",
-            "-q:a", "4",
-            "-y",
-            chunk_path
-        ]
-        subprocess.run(cmd, capture_output=True, text=True)
-        
-        if os.path.exists(chunk_path) and os.path.getsize(chunk_path) > 0:
-            chunks.append(chunk_path)
-    
-    print(f"  Split into {len(chunks)} chunks")
-    return chunks
+    if result.returncode != 0:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise RuntimeError(f"ffmpeg segment failed: {result.stderr[-500:]}")
+
+    slices = []
+    offset_frames = 0
+    for path in sorted(out_dir.glob("slice_*.wav")):
+        with wave.open(str(path), "rb") as w:
+            frames = w.getnframes()
+        if frames == 0:
+            continue
+        slices.append({"path": str(path), "offset": offset_frames / PCM_RATE, "frames": frames})
+        offset_frames += frames
+    print(f"  Split into {len(slices)} slices of ~{chunk_seconds:.0f}s (one ffmpeg pass)")
+    return slices
+
+
+def build_overlap_chunk(slices: list[dict], index: int, overlap_seconds: float) -> str:
+    """Slice `index` followed by the first overlap_seconds of the next slice, as a new WAV."""
+    current = slices[index]
+    if overlap_seconds <= 0 or index + 1 >= len(slices):
+        return current["path"]
+
+    chunk_path = current["path"].replace("slice_", "chunk_")
+    with wave.open(chunk_path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(PCM_RATE)
+        with wave.open(current["path"], "rb") as w:
+            out.writeframes(w.readframes(current["frames"]))
+        with wave.open(slices[index + 1]["path"], "rb") as w:
+            out.writeframes(w.readframes(int(overlap_seconds * PCM_RATE)))
+    return chunk_path
+
+
+def stitch_chunk_segments(chunk_segments: list[list[dict]], slices: list[dict], overlap_seconds: float) -> list[dict]:
+    """
+    Merge per-chunk segments (already in absolute time) into one monotonic list.
+
+    Neighbouring chunks both cover the overlap after each slice boundary; the
+    cut sits in the middle of it and each segment is kept by the chunk whose
+    side its midpoint falls on, so overlap speech is not duplicated. A kept
+    segment that ends inside the previous kept segment of another chunk
+    repeats speech already covered there and is dropped.
+    """
+    cuts = [slices[i]["offset"] + overlap_seconds / 2 for i in range(1, len(slices))]
+    kept = []
+    for i, segments in enumerate(chunk_segments):
+        lo = cuts[i - 1] if i > 0 else float("-inf")
+        hi = cuts[i] if i < len(cuts) else float("inf")
+        for seg in segments:
+            if lo <= (seg["start"] + seg["end"]) / 2 < hi:
+                kept.append((seg["start"], i, seg))
+
+    kept.sort(key=lambda item: (item[0], item[1]))
+    merged = []
+    prev_end, prev_chunk = 0.0, 0
+    for _, chunk, seg in kept:
+        if merged and chunk != prev_chunk and seg["end"] <= prev_end:
+            continue
+        seg["start"] = max(seg["start"], prev_end)
+        seg["end"] = max(seg["end"], seg["start"])
+        prev_end, prev_chunk = seg["end"], chunk
+        merged.append(seg)
+    return merged
 
 
 def format_timestamp(seconds: float) -> str:
@@ -148,38 +221,46 @@ def format_timestamp(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
-def transcribe_local(audio_path: str, model_name: str = "medium", language: str = None) -> dict:
+def transcribe_local(audio_path: str, model_name: str = "medium", language: str = None,
+                     workers: int = LOCAL_WORKERS, window_seconds: float = LOCAL_WINDOW_SECONDS,
+                     checkpoint_path: str = None) -> dict:
     """
     Transcribe using local OpenAI Whisper model.
     Free, runs on CPU/GPU. Requires: pip install openai-whisper torch
     
+    Files longer than window_seconds are transcribed in windows (see
+    transcribe_local_chunked); window_seconds=0 passes the whole file to
+    Whisper in one call.
+    
     Returns dict with 'text' (full transcript) and 'segments' (timestamped).
     """
-    try:
-        import whisper
-    except ImportError:
+    if not whisper_available():
         print("ERROR: openai-whisper not installed.")
         print("  Install: pip install openai-whisper torch")
         print("  Note: This is different from the 'openai' package.")
         sys.exit(1)
     
-    print(f"Loading Whisper model '{model_name}'...")
-    print("  (First run downloads the model — may take a few minutes)")
-    
-    import torch
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    print(f"  Using device: {device}")
-    
-    model = whisper.load_model(model_name, device=device)
-    
-    print(f"Transcribing: {audio_path}")
-    print("  This may take a while depending on file length and model size...")
-    
-    options = {}
-    if language:
-        options["language"] = language
+    device = default_device()
+    print(f"Whisper model '{model_name}' on {device} (first run downloads the model)")
     
-    result = model.transcribe(audio_path, **options)
+    chunk_count = 1
+    if window_seconds and get_audio_duration(audio_path) > window_seconds:
+        result = transcribe_local_chunked(
+            audio_path, model_name, device, language, workers, window_seconds,
+            LOCAL_OVERLAP_SECONDS, checkpoint_path
+        )
+        chunk_count = result["chunks"]
+    else:
+        model = get_whisper_model(model_name, device=device)
+        
+        print(f"Transcribing: {audio_path}")
+        print("  This may take a while depending on file length and model size...")
+        
+        options = {}
+        if language:
+            options["language"] = language
+        
+        result = model.transcribe(audio_path, **options)
     
     # Format output
     segments = []
@@ -198,7 +279,8 @@ def transcribe_local(audio_path: str, model_name: str = "medium", language: str
         "language": result.get("language", language or "auto"),
         "text": result["text"].strip(),
         "segments": segments,
-        "segment_count": len(segments)
+        "segment_count": len(segments),
+        "chunks": chunk_count
     }
     
     duration_sec = segments[-1]["end"] if segments else 0
@@ -210,11 +292,202 @@ def transcribe_local(audio_path: str, model_name: str = "medium", language: str
     return output
 
 
-def transcribe_api(audio_path: str, language: str = None) -> dict:
+# Per-process model for chunked local transcription (set by _init_local_worker)
+_local_model = None
+_local_pools = {}
+
+
+def _init_local_worker(model_name: str, device: str, threads: int = 0):
+    """Pool initializer: load this worker's model once."""
+    global _local_model
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    _local_model = get_whisper_model(model_name, device=device)
+
+
+def _get_local_pool(model_name: str, device: str, workers: int):
+    """
+    Long-lived executor with the model loaded in each worker, reused across
+    files (batch mode). One worker runs in-process on a thread and shares the
+    registry model; more use spawned processes with a model each.
+    """
+    key = (model_name, device, workers)
+    if key not in _local_pools:
+        if workers <= 1:
+            pool = ThreadPoolExecutor(max_workers=1, initializer=_init_local_worker,
+                                      initargs=(model_name, device))
+        else:
+            threads = max(1, (os.cpu_count() or 1) // workers) if device == "cpu" else 0
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_local_worker, initargs=(model_name, device, threads)
+            )
+        atexit.register(pool.shutdown, cancel_futures=True)
+        _local_pools[key] = pool
+    return _local_pools[key]
+
+
+def read_pcm_window(audio_path: str, start: float, duration: float):
+    """Decode [start, start+duration) to 16 kHz mono float32 through an ffmpeg pipe."""
+    import numpy as np
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-ss", f"{start:.3f}", "-t", f"{duration:.3f}", "-i", audio_path,
+        "-vn", "-ac", "1", "-ar", str(PCM_RATE), "-f", "s16le", "-loglevel", "error", "pipe:1"
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed at {start:.0f}s: {result.stderr[-500:].decode(errors='replace')}")
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _transcribe_window(audio_path: str, index: int, start: float, duration: float,
+                       language: str = None, prompt: str = None) -> dict:
+    """Worker task: decode one window and transcribe it; segment times are absolute."""
+    audio = read_pcm_window(audio_path, start, duration)
+    options = {}
+    if language:
+        options["language"] = language
+    result = _local_model.transcribe(audio, initial_prompt=prompt or None, **options)
+    return {
+        "window": index,
+        "offset": start,
+        "language": result.get("language"),
+        "text": result["text"].strip(),
+        "segments": [
+            {"start": seg["start"] + start, "end": seg["end"] + start, "text": seg["text"]}
+            for seg in result.get("segments", [])
+        ],
+    }
+
+
+def plan_windows(duration: float, window_seconds: float, overlap_seconds: float) -> list[tuple]:
+    """(index, start, length) windows covering duration, each running overlap_seconds into the next."""
+    # A tail shorter than the overlap is already covered by the previous window
+    starts = [0.0]
+    while starts[-1] + window_seconds < duration - overlap_seconds:
+        starts.append(starts[-1] + window_seconds)
+    return [(i, start, min(window_seconds + overlap_seconds, duration - start)) for i, start in enumerate(starts)]
+
+
+def _load_checkpoint(checkpoint_path: Path, header: dict) -> dict:
+    """Completed windows from a JSONL checkpoint whose header matches this run."""
+    done = {}
+    if not checkpoint_path.exists():
+        return done
+    with open(checkpoint_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        first = json.loads(lines[0]) if lines else None
+    except json.JSONDecodeError:
+        return done  # Torn header from a run interrupted while starting: start over
+    if not isinstance(first, dict) or first.get("header") != header:
+        return done
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break  # Torn final line from an interrupted write
+        done[record["window"]] = record
+    return done
+
+
+def transcribe_local_chunked(audio_path: str, model_name: str, device: str, language: str = None,
+                             workers: int = LOCAL_WORKERS, window_seconds: float = LOCAL_WINDOW_SECONDS,
+                             overlap_seconds: float = LOCAL_OVERLAP_SECONDS, checkpoint_path: str = None) -> dict:
+    """
+    Memory-bounded local transcription of a long file.
+
+    The file is cut into window_seconds windows (plus overlap_seconds of the
+    next) that ffmpeg decodes one at a time into a pipe, so only a window of
+    PCM is ever in memory. Windows are split into `workers` contiguous spans;
+    each span runs in order on the pool, passing the tail of the previous
+    window's text as initial_prompt, while spans run in parallel. Every
+    finished window is appended to a JSONL checkpoint, and a rerun with the
+    same file and settings skips the windows already there.
+
+    Returns a Whisper-style {"text", "segments", "language", "chunks"} dict.
+    """
+    duration = get_audio_duration(audio_path)
+    windows = plan_windows(duration, window_seconds, overlap_seconds)
+
+    ensure_tmp_dir()
+    checkpoint = Path(checkpoint_path or TMP_DIR / f"{Path(audio_path).stem}.{model_name}.checkpoint.jsonl")
+    header = {
+        "size": os.path.getsize(audio_path), "duration": round(duration, 3), "model": model_name,
+        "language": language, "window": window_seconds, "overlap": overlap_seconds,
+    }
+    done = _load_checkpoint(checkpoint, header)
+    if done:
+        print(f"  Resuming from checkpoint: {len(done)}/{len(windows)} windows already done")
+    # Rewrite rather than append, so new records never follow a torn line
+    with open(checkpoint, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"header": header}) + "\n")
+        for i in sorted(done):
+            f.write(json.dumps(done[i], ensure_ascii=False) + "\n")
+
+    workers = max(1, min(workers, len(windows)))
+    span_size = -(-len(windows) // workers)
+    span_of = {i: i // span_size for i in range(len(windows))}
+    pool = _get_local_pool(model_name, device, workers)
+    print(f"  Transcribing {len(windows)} windows of {window_seconds:.0f}s with {workers} worker(s)...")
+
+    def submit(i: int):
+        previous = done.get(i - 1)
+        prompt = previous["text"][-LOCAL_CONTEXT_CHARS:] if previous else None
+        _, start, length = windows[i]
+        return pool.submit(_transcribe_window, audio_path, i, start, length, language, prompt)
+
+    def next_in_span(i: int):
+        for j in range(i, len(windows)):
+            if span_of[j] != span_of[i]:
+                return None
+            if j not in done:
+                return j
+        return None
+
+    pending = {}
+    for first in range(0, len(windows), span_size):
+        i = next_in_span(first)
+        if i is not None:
+            pending[submit(i)] = i
+
+    with open(checkpoint, "a", encoding="utf-8") as log:
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = pending.pop(future)
+                record = future.result()
+                done[i] = record
+                log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                log.flush()
+                print(f"  Window {i + 1}/{len(windows)} done ({len(done)}/{len(windows)})")
+                nxt = next_in_span(i)
+                if nxt is not None:
+                    pending[submit(nxt)] = nxt
+
+    records = [done[i] for i in range(len(windows))]
+    stitched = stitch_chunk_segments(
+        [record["segments"] for record in records], [{"offset": start} for _, start, _ in windows], overlap_seconds
+    )
+    checkpoint.unlink(missing_ok=True)
+    return {
+        "text": " ".join(seg["text"].strip() for seg in stitched if seg["text"].strip()),
+        "segments": stitched,
+        "language": language or next((r["language"] for r in records if r.get("language")), None),
+        "chunks": len(windows),
+    }
+
+
+def transcribe_api(audio_path: str, language: str = None, workers: int = API_WORKERS,
+                   chunk_seconds: float = API_CHUNK_SECONDS,
+                   overlap_seconds: float = API_OVERLAP_SECONDS) -> dict:
     """
     Transcribe using OpenAI Whisper API.
     Fast, ~$0.006/min. Requires OPENAI_API_KEY.
-    Auto-splits files > 25MB.
+    Files longer than chunk_seconds (or over 25MB) are split in one ffmpeg
+    pass and the overlapping chunks are transcribed `workers` at a time.
     
     Returns dict with 'text' (full transcript) and 'segments' (timestamped).
     """
@@ -232,47 +505,17 @@ def transcribe_api(audio_path: str, language: str = None) -> dict:
     
     client = OpenAI(api_key=api_key)
     
-    # Split if needed
-    chunks = split_audio_for_api(audio_path)
-    
-    all_text = []
-    all_segments = []
-    time_offset = 0.0
-    
-    for i, chunk_path in enumerate(chunks):
-        if len(chunks) > 1:
-            print(f"  Transcribing chunk {i+1}/{len(chunks)}: {chunk_path}")
-        else:
-            print(f"Transcribing via API: {chunk_path}")
-        
-        with open(chunk_path, "rb") as f:
-            kwargs = {
-                "model": "whisper-1",
-                "file": f,
-                "response_format": "verbose_json",
-                "timestamp_granularities": ["segment"]
-            }
-            if language:
-                kwargs["language"] = language
-            
-            response = client.audio.transcriptions.create(**kwargs)
-        
-        all_text.append(response.text)
-        
-        for seg in getattr(response, "segments", []) or []:
-            all_segments.append({
-                "start": seg.get("start", 0) + time_offset,
-                "end": seg.get("end", 0) + time_offset,
-                "start_formatted": format_timestamp(seg.get("start", 0) + time_offset),
-                "end_formatted": format_timestamp(seg.get("end", 0) + time_offset),
-                "text": seg.get("text", "").strip()
-            })
-        
-        # Update time offset for next chunk
-        if all_segments:
-            time_offset = all_segments[-1]["end"]
-    
-    full_text = " ".join(all_text)
+    duration = get_audio_duration(audio_path)
+    if os.path.getsize(audio_path) <= API_MAX_BYTES and duration <= chunk_seconds:
+        print(f"Transcribing via API: {audio_path}")
+        text, local_segments = _api_transcribe_file(client, audio_path, language)
+        all_segments = [_format_segment(seg["start"], seg["end"], seg["text"]) for seg in local_segments]
+        full_text = text.strip()
+        chunk_count = 1
+    else:
+        all_segments, full_text, chunk_count = _api_transcribe_chunked(
+            client, audio_path, language, workers, chunk_seconds, overlap_seconds
+        )
     
     output = {
         "method": "whisper_api",
@@ -280,29 +523,174 @@ def transcribe_api(audio_path: str, language: str = None) -> dict:
         "language": language or "auto",
         "text": full_text,
         "segments": all_segments,
-        "segment_count": len(all_segments)
+        "segment_count": len(all_segments),
+        "chunks": chunk_count
     }
     
-    duration_sec = all_segments[-1]["end"] if all_segments else 0
-    cost_estimate = (duration_sec / 60) * 0.006
+    cost_estimate = (duration / 60) * 0.006
     
     print(f"\n  Transcription complete!")
-    print(f"  Duration: {format_timestamp(duration_sec)}")
+    print(f"  Duration: {format_timestamp(duration)}")
     print(f"  Segments: {len(all_segments)}")
     print(f"  Estimated cost: ${cost_estimate:.3f}")
     
-    # Clean up chunks
-    if len(chunks) > 1:
-        for chunk in chunks:
-            if "chunk_" in str(chunk):
-                try:
-                    os.remove(chunk)
-                except OSError:
-                    pass
-    
     return output
 
 
+def _format_segment(start: float, end: float, text: str) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "start_formatted": format_timestamp(start),
+        "end_formatted": format_timestamp(end),
+        "text": text.strip()
+    }
+
+
+def _api_transcribe_file(client, path: str, language: str = None) -> tuple:
+    """One Whisper API request. Returns (text, [{"start", "end", "text"}]) in file-local time."""
+    with open(path, "rb") as f:
+        kwargs = {
+            "model": "whisper-1",
+            "file": f,
+            "response_format": "verbose_json",
+            "timestamp_granularities": ["segment"]
+        }
+        if language:
+            kwargs["language"] = language
+        
+        response = client.audio.transcriptions.create(**kwargs)
+    
+    segments = []
+    for seg in getattr(response, "segments", []) or []:
+        # SDK returns objects; older versions / raw JSON give dicts
+        get = seg.get if isinstance(seg, dict) else (lambda key, default=None, s=seg: getattr(s, key, default))
+        segments.append({"start": get("start", 0), "end": get("end", 0), "text": get("text", "")})
+    return response.text, segments
+
+
+def _api_transcribe_chunked(client, audio_path: str, language: str, workers: int,
+                            chunk_seconds: float, overlap_seconds: float) -> tuple:
+    """Split once, transcribe overlapping chunks concurrently, stitch. Returns (segments, text, chunks)."""
+    slices = split_audio_segments(audio_path, chunk_seconds)
+    slice_dir = Path(slices[0]["path"]).parent if slices else None
+    
+    def transcribe_chunk(index: int) -> tuple:
+        chunk_path = build_overlap_chunk(slices, index, overlap_seconds)
+        try:
+            text, segments = _api_transcribe_file(client, chunk_path, language)
+        finally:
+            if chunk_path != slices[index]["path"]:
+                os.remove(chunk_path)
+        offset = slices[index]["offset"]
+        return text, [
+            {"start": seg["start"] + offset, "end": seg["end"] + offset, "text": seg["text"]}
+            for seg in segments
+        ]
+    
+    texts = [""] * len(slices)
+    chunk_segments = [[] for _ in slices]
+    try:
+        print(f"  Transcribing {len(slices)} chunks with {workers} workers...")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(transcribe_chunk, i): i for i in range(len(slices))}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                texts[i], chunk_segments[i] = future.result()
+                print(f"  Chunk {i + 1}/{len(slices)} done ({done}/{len(slices)})")
+    finally:
+        if slice_dir:
+            shutil.rmtree(slice_dir, ignore_errors=True)
+    
+    stitched = stitch_chunk_segments(chunk_segments, slices, overlap_seconds)
+    all_segments = [_format_segment(seg["start"], seg["end"], seg["text"]) for seg in stitched]
+    if all_segments:
+        full_text = " ".join(seg["text"] for seg in all_segments if seg["text"])
+    else:
+        # No segment timings came back; overlap text can't be de-duplicated
+        full_text = " ".join(text.strip() for text in texts if text.strip())
+    return all_segments, full_text, len(slices)
+
+
+def save_outputs(result: dict, txt_path: str):
+    """Write the .txt, .json and .timestamped.txt versions of a transcript."""
+    json_path = str(Path(txt_path).with_suffix(".json"))
+    
+    # Save plain text transcript
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write(result["text"])
+    print(f"\n  Plain text saved: {txt_path}")
+    
+    # Save full JSON with segments
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"  JSON (with timestamps) saved: {json_path}")
+    
+    # Save timestamped text version (easier to read)
+    ts_path = str(Path(txt_path).with_suffix(".timestamped.txt"))
+    with open(ts_path, "w", encoding="utf-8") as f:
+        for seg in result.get("segments", []):
+            f.write(f"[{seg['start_formatted']} - {seg['end_formatted']}] {seg['text']}\n")
+    print(f"  Timestamped text saved: {ts_path}")
+
+
+def transcribe_directory(input_dir: Path, output_dir: Path, method: str = "local",
+                         model_name: str = "medium", language: str = None, workers: int = None,
+                         window_seconds: float = LOCAL_WINDOW_SECONDS) -> dict:
+    """
+    Transcribe every supported file in input_dir to output_dir/<stem>.txt/.json.
+
+    The Whisper model is loaded on the first file and reused (model_registry);
+    audio for the next video is extracted by ffmpeg in the background while
+    the current file is transcribed.
+    """
+    inputs = sorted(p for p in input_dir.iterdir() if p.suffix.lower() in ALL_EXTENSIONS)
+    stems = Counter(p.stem.lower() for p in inputs)
+    clashes = [p.name for p in inputs if stems[p.stem.lower()] > 1]
+    if clashes:  # Transcripts, checkpoints and temp audio are all named by stem
+        print(f"ERROR: Inputs share a file name and would overwrite each other's output: {', '.join(clashes)}")
+        sys.exit(1)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Batch transcription: {len(inputs)} files from {input_dir} -> {output_dir}")
+
+    def prepare(path: Path) -> str:
+        if path.suffix.lower() in VIDEO_EXTENSIONS:
+            return extract_audio_from_video(str(path), str(output_dir / f".{path.stem}.audio.mp3"))
+        return str(path)
+
+    results = {"transcribed": [], "failed": []}
+    with ThreadPoolExecutor(max_workers=1) as extractor:
+        upcoming = extractor.submit(prepare, inputs[0]) if inputs else None
+        for i, path in enumerate(inputs):
+            current = upcoming
+            upcoming = extractor.submit(prepare, inputs[i + 1]) if i + 1 < len(inputs) else None
+            print(f"\n[{i + 1}/{len(inputs)}] {path.name}")
+            audio_path = None
+            try:
+                audio_path = current.result()
+                if method == "local":
+                    result = transcribe_local(
+                        audio_path, model_name=model_name, language=language,
+                        workers=workers or LOCAL_WORKERS, window_seconds=window_seconds,
+                        checkpoint_path=str(output_dir / f".{path.stem}.checkpoint.jsonl")
+                    )
+                else:
+                    result = transcribe_api(audio_path, language=language, workers=workers or API_WORKERS)
+                save_outputs(result, str(output_dir / f"{path.stem}.txt"))
+                results["transcribed"].append(path.name)
+            except Exception as e:
+                print(f"  ERROR: {path.name}: {e}")
+                results["failed"].append(path.name)
+            finally:
+                if audio_path and audio_path != str(path) and os.path.exists(audio_path):
+                    os.remove(audio_path)
+
+    print(f"\nBatch complete: {len(results['transcribed'])}/{len(inputs)} transcribed")
+    if results["failed"]:
+        print(f"  Failed: {', '.join(results['failed'])}")
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Transcribe audio/video files using OpenAI Whisper (local or API)",
@@ -315,6 +703,9 @@ Examples:
   # Fast API transcription (~$0.006/min)
   python transcribe_audio.py --input meeting.mp4 --method api
 
+  # Long recording: 10-minute chunks, 8 in flight
+  python transcribe_audio.py --input webinar.mp4 --method api --workers 8
+
   # Quick local transcription (lower accuracy, fast)
   python transcribe_audio.py --input meeting.mp4 --method local --model base
 
@@ -323,7 +714,7 @@ Examples:
         """
     )
     
-    parser.add_argument("--input", "-i", required=True, help="Path to audio/video file")
+    parser.add_argument("--input", "-i", required=True, help="Path to audio/video file, or a directory of them")
     parser.add_argument("--method", "-m", choices=["local", "api"], default="local",
                         help="Transcription method: 'local' (free) or 'api' (paid, fast)")
     parser.add_argument("--model", default="medium",
@@ -331,13 +722,23 @@ Examples:
                         help="Whisper model size (local only). Default: medium")
     parser.add_argument("--language", "-l", default=None,
                         help="Language code (e.g., 'en', 'es', 'fr'). Auto-detected if not set")
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help=f"Chunks transcribed concurrently for long files. "
+                             f"Default: {API_WORKERS} (api), {LOCAL_WORKERS} model processes (local)")
+    parser.add_argument("--window", type=float, default=LOCAL_WINDOW_SECONDS,
+                        help=f"Local window length in seconds; 0 = whole file in one call. Default: {LOCAL_WINDOW_SECONDS}")
     parser.add_argument("--output", "-o", default=None,
-                        help="Output file path. Default: .tmp/transcript.txt + .tmp/transcript.json")
+                        help="Output file path (output directory for a batch). "
+                             "Default: .tmp/transcript.txt + .tmp/transcript.json (.tmp/transcripts/ for a batch)")
     
     args = parser.parse_args()
     
     # Validate input file
     input_path = Path(args.input)
+    if input_path.is_dir():
+        output_dir = Path(args.output) if args.output else TMP_DIR / "transcripts"
+        return transcribe_directory(input_path, output_dir, args.method, args.model, args.language,
+                                    args.workers, args.window)
     if not input_path.exists():
         print(f"ERROR: File not found: {args.input}")
         sys.exit(1)
@@ -357,34 +758,20 @@ Examples:
     
     # Transcribe
     if args.method == "local":
-        result = transcribe_local(audio_path, model_name=args.model, language=args.language)
+        result = transcribe_local(
+            audio_path, model_name=args.model, language=args.language,
+            workers=args.workers or LOCAL_WORKERS, window_seconds=args.window,
+            checkpoint_path=str(TMP_DIR / f"{input_path.stem}.{args.model}.checkpoint.jsonl")
+        )
     else:
-        result = transcribe_api(audio_path, language=args.language)
+        result = transcribe_api(audio_path, language=args.language, workers=args.workers or API_WORKERS)
     
     # Save outputs
     if args.output:
         txt_path = args.output
-        json_path = str(Path(args.output).with_suffix(".json"))
     else:
         txt_path = str(TMP_DIR / "transcript.txt")
-        json_path = str(TMP_DIR / "transcript.json")
-    
-    # Save plain text transcript
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(result["text"])
-    print(f"\n  Plain text saved: {txt_path}")
-    
-    # Save full JSON with segments
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-    print(f"  JSON (with timestamps) saved: {json_path}")
-    
-    # Save timestamped text version (easier to read)
-    ts_path = str(Path(txt_path).with_suffix(".timestamped.txt"))
-    with open(ts_path, "w", encoding="utf-8") as f:
-        for seg in result.get("segments", []):
-            f.write(f"[{seg['start_formatted']} - {seg['end_formatted']}] {seg['text']}\n")
-    print(f"  Timestamped text saved: {ts_path}")
+    save_outputs(result, txt_path)
     
     return result
 
@@ -13,8 +13,10 @@ Usage:
     python execution/video_editor_pipeline.py input.mp4
     python execution/video_editor_pipeline.py input.mp4 --output-dir .tmp/edited
     python execution/video_editor_pipeline.py input.mp4 --enhance-audio --add-transitions
+    python execution/video_editor_pipeline.py raw_clips/ --output-dir .tmp/edited   # batch
 """
 
+import importlib
 import subprocess
 import tempfile
 import os
@@ -22,9 +24,13 @@ import argparse
 import time
 import re
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from model_registry import get_silero_vad, get_whisper_model, whisper_available
+
 # Video encoding settings
 HARDWARE_ENCODER = "hevc_videotoolbox"
 SOFTWARE_ENCODER = "libx265"
@@ -32,6 +38,8 @@ HARDWARE_BITRATE = "17M"
 SOFTWARE_CRF = "18"
 TARGET_FPS = 30
 
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v"}
+
 _hardware_encoder_available = None
 
 
@@ -94,14 +102,12 @@ def transcribe_video(audio_path: str, model_name: str = "base") -> dict:
     """
     print(f"📝 Transcribing audio with Whisper ({model_name} model)...")
     
-    try:
-        import whisper
-    except ImportError:
+    if not whisper_available():
         print("   ⚠️  Whisper not installed. Installing...")
         subprocess.run(["pip", "install", "openai-whisper"], check=True)
-        import whisper
+        importlib.invalidate_caches()  # So get_whisper_model can import the new package
     
-    model = whisper.load_model(model_name)
+    model = get_whisper_model(model_name)
     result = model.transcribe(audio_path, verbose=False)
     
     print(f"   ✓ Transcription complete ({len(result['text'])} chars)")
@@ -171,13 +177,7 @@ def get_speech_timestamps_silero(audio_path: str, min_speech_duration: float = 0
     """Use Silero VAD to detect speech segments."""
     print(f"🎯 Running Silero VAD...")
     
-    import torch
-    model, utils = torch.hub.load(
-        repo_or_dir='snakers4/silero-vad',
-        model='silero_vad',
-        force_reload=False,
-        trust_repo=True
-    )
+    model, utils = get_silero_vad()
 
     (get_speech_timestamps, _, read_audio, _, _) = utils
 
@@ -383,60 +383,24 @@ def save_transcript(transcript_data: dict, output_path: str):
     print(f"   📄 Saved text: {txt_path}")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Complete video editing pipeline - removes silences, adds jump cuts, smart naming",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-    python video_editor_pipeline.py input.mp4
-    python video_editor_pipeline.py input.mp4 --output-dir ./edited
-    python video_editor_pipeline.py input.mp4 --enhance-audio --add-transitions
-    python video_editor_pipeline.py input.mp4 --min-silence 0.8 --padding 150
-        """
-    )
-    
-    parser.add_argument("input", help="Input video file")
-    parser.add_argument("--output", "-o", help="Output video file (auto-generated if not specified)")
-    parser.add_argument("--output-dir", default=".tmp", help="Output directory (default: .tmp)")
-    parser.add_argument("--min-silence", type=float, default=0.5,
-                        help="Minimum silence duration to cut (default: 0.5s)")
-    parser.add_argument("--min-speech", type=float, default=0.25,
-                        help="Minimum speech duration to keep (default: 0.25s)")
-    parser.add_argument("--padding", type=int, default=100,
-                        help="Padding around speech in ms (default: 100)")
-    parser.add_argument("--merge-gap", type=float, default=0.3,
-                        help="Merge segments closer than this (default: 0.3s)")
-    parser.add_argument("--keep-start", action="store_true", default=True,
-                        help="Always start from 0:00 (default: True)")
-    parser.add_argument("--no-keep-start", action="store_false", dest="keep_start")
-    parser.add_argument("--enhance-audio", action="store_true",
-                        help="Apply audio enhancement (EQ, compression, loudness)")
-    parser.add_argument("--add-transitions", action="store_true",
-                        help="Add crossfade transitions between jump cuts")
-    parser.add_argument("--whisper-model", default="base",
-                        choices=["tiny", "base", "small", "medium", "large"],
-                        help="Whisper model for transcription (default: base)")
-    parser.add_argument("--no-transcribe", action="store_true",
-                        help="Skip transcription (use generic filename)")
-    parser.add_argument("--save-transcript", action="store_true", default=True,
-                        help="Save transcript to file (default: True)")
-    parser.add_argument("--no-save-transcript", action="store_false", dest="save_transcript")
+def unique_output_path(path: str, taken: set) -> str:
+    """path, or path with _2, _3, ... before the suffix if it is already planned or on disk."""
+    candidate, n = Path(path), 1
+    while str(candidate) in taken or candidate.exists():
+        n += 1
+        candidate = Path(path).with_name(f"{Path(path).stem}_{n}{Path(path).suffix}")
+    return str(candidate)
 
-    args = parser.parse_args()
-    
-    input_path = args.input
-    if not os.path.exists(input_path):
-        print(f"❌ Input file not found: {input_path}")
-        return 1
 
-    print(f"🎬 Video Editor Pipeline")
-    print(f"=" * 50)
-    print(f"   Input: {input_path}")
-    print()
+def analyze_clip(input_path: str, args, output_path: str = None, taken: set = None) -> dict:
+    """
+    Model-bound half of the pipeline: extract audio, transcribe, name the
+    output, run VAD and shape the segments. Returns the render plan, or
+    None if no speech was found.
 
-    overall_start = time.time()
-    
+    Batch runs pass `taken`, the output paths planned so far: a generated
+    name that is already planned or on disk gets a _2, _3, ... suffix.
+    """
     # Get video duration
     duration = get_duration(input_path)
     print(f"📏 Video duration: {duration:.1f}s ({duration/60:.1f} min)")
@@ -463,14 +427,16 @@ Examples:
             print(f"   📛 Generated filename: {smart_name}")
         
         # Determine output path
-        if args.output:
-            output_path = args.output
-        else:
+        if not output_path:
             if smart_name:
                 output_path = str(output_dir / f"{smart_name}.mp4")
             else:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 output_path = str(output_dir / f"edited_{timestamp}.mp4")
+            if taken is not None:
+                output_path = unique_output_path(output_path, taken)
+        if taken is not None:
+            taken.add(output_path)
         
         print(f"   📁 Output: {output_path}")
         print()
@@ -484,7 +450,7 @@ Examples:
 
         if not speech_segments:
             print("⚠️  No speech detected in video!")
-            return 1
+            return None
 
         # Show first few segments
         print("   Sample segments:")
@@ -517,6 +483,23 @@ Examples:
     print(f"📊 Expected output: {total_speech:.1f}s ({total_speech/60:.1f} min)")
     print()
 
+    return {
+        "input_path": input_path,
+        "output_path": output_path,
+        "duration": duration,
+        "segments": speech_segments,
+        "transcript": transcript_data,
+    }
+
+
+def render_clip(plan: dict, args, overall_start: float) -> bool:
+    """FFmpeg half of the pipeline: render the plan, save the transcript, print stats."""
+    input_path = plan["input_path"]
+    output_path = plan["output_path"]
+    duration = plan["duration"]
+    speech_segments = plan["segments"]
+    transcript_data = plan["transcript"]
+
     # Process video
     success = process_video(
         input_path,
@@ -528,7 +511,7 @@ Examples:
 
     if not success:
         print("❌ Video processing failed!")
-        return 1
+        return False
 
     # Save transcript if requested
     if transcript_data and args.save_transcript:
@@ -552,7 +535,128 @@ Examples:
     if transcript_data:
         print(f"   📝 Transcript saved alongside video")
 
-    return 0
+    return True
+
+
+def process_directory(input_dir: str, args) -> dict:
+    """
+    Edit every video in input_dir into --output-dir.
+
+    Whisper and Silero are loaded once and reused for every clip; while
+    the next clip is being transcribed and VAD'd, a background thread
+    renders the previous one with ffmpeg.
+    """
+    inputs = sorted(p for p in Path(input_dir).iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+    if args.no_transcribe:
+        stems = Counter(p.stem.lower() for p in inputs)
+        clashes = [p.name for p in inputs if stems[p.stem.lower()] > 1]
+        if clashes:  # Outputs keep the source name, so clip.mov and clip.mp4 collide
+            raise SystemExit(f"❌ Inputs share a file name and would overwrite each other's output: {', '.join(clashes)}")
+    print(f"🎬 Video Editor Pipeline - batch of {len(inputs)} videos from {input_dir}")
+    print(f"=" * 50)
+    batch_start = time.time()
+
+    results = {"processed": 0, "failed": [], "no_speech": []}
+    renders = []
+    planned = set()  # Smart names can repeat across clips (same opening line)
+    with ThreadPoolExecutor(max_workers=1) as renderer:
+        for i, input_path in enumerate(inputs, 1):
+            print(f"\n[{i}/{len(inputs)}] {input_path.name}")
+            clip_start = time.time()
+            try:
+                # Without a transcript there is no smart name; keep the source name
+                output_path = None if not args.no_transcribe else str(Path(args.output_dir) / f"{input_path.stem}.mp4")
+                plan = analyze_clip(str(input_path), args, output_path=output_path, taken=planned)
+            except Exception as e:
+                print(f"   ❌ Analysis failed: {e}")
+                results["failed"].append(input_path.name)
+                continue
+            if plan is None:
+                results["no_speech"].append(input_path.name)
+                continue
+            renders.append((input_path.name, renderer.submit(render_clip, plan, args, clip_start)))
+
+        for name, future in renders:
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"   ❌ Render failed for {name}: {e}")
+                ok = False
+            if ok:
+                results["processed"] += 1
+            else:
+                results["failed"].append(name)
+
+    elapsed = time.time() - batch_start
+    print(f"\n✅ Batch complete: {results['processed']}/{len(inputs)} videos in {elapsed:.1f}s")
+    if results["failed"]:
+        print(f"   Failed: {', '.join(results['failed'])}")
+    if results["no_speech"]:
+        print(f"   No speech: {', '.join(results['no_speech'])}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Complete video editing pipeline - removes silences, adds jump cuts, smart naming",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python video_editor_pipeline.py input.mp4
+    python video_editor_pipeline.py input.mp4 --output-dir ./edited
+    python video_editor_pipeline.py input.mp4 --enhance-audio --add-transitions
+    python video_editor_pipeline.py input.mp4 --min-silence 0.8 --padding 150
+        """
+    )
+    
+    parser.add_argument("input", help="Input video file, or a directory of videos to edit in batch")
+    parser.add_argument("--output", "-o", help="Output video file (auto-generated if not specified)")
+    parser.add_argument("--output-dir", default=".tmp", help="Output directory (default: .tmp)")
+    parser.add_argument("--min-silence", type=float, default=0.5,
+                        help="Minimum silence duration to cut (default: 0.5s)")
+    parser.add_argument("--min-speech", type=float, default=0.25,
+                        help="Minimum speech duration to keep (default: 0.25s)")
+    parser.add_argument("--padding", type=int, default=100,
+                        help="Padding around speech in ms (default: 100)")
+    parser.add_argument("--merge-gap", type=float, default=0.3,
+                        help="Merge segments closer than this (default: 0.3s)")
+    parser.add_argument("--keep-start", action="store_true", default=True,
+                        help="Always start from 0:00 (default: True)")
+    parser.add_argument("--no-keep-start", action="store_false", dest="keep_start")
+    parser.add_argument("--enhance-audio", action="store_true",
+                        help="Apply audio enhancement (EQ, compression, loudness)")
+    parser.add_argument("--add-transitions", action="store_true",
+                        help="Add crossfade transitions between jump cuts")
+    parser.add_argument("--whisper-model", default="base",
+                        choices=["tiny", "base", "small", "medium", "large"],
+                        help="Whisper model for transcription (default: base)")
+    parser.add_argument("--no-transcribe", action="store_true",
+                        help="Skip transcription (use generic filename)")
+    parser.add_argument("--save-transcript", action="store_true", default=True,
+                        help="Save transcript to file (default: True)")
+    parser.add_argument("--no-save-transcript", action="store_false", dest="save_transcript")
+
+    args = parser.parse_args()
+    
+    if os.path.isdir(args.input):
+        results = process_directory(args.input, args)
+        return 0 if not results["failed"] else 1
+
+    input_path = args.input
+    if not os.path.exists(input_path):
+        print(f"❌ Input file not found: {input_path}")
+        return 1
+
+    print(f"🎬 Video Editor Pipeline")
+    print(f"=" * 50)
+    print(f"   Input: {input_path}")
+    print()
+
+    overall_start = time.time()
+    plan = analyze_clip(input_path, args, output_path=args.output)
+    if plan is None:
+        return 1
+    return 0 if render_clip(plan, args, overall_start) else 1
 
 
 if __name__ == "__main__":
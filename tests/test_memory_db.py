@@ -0,0 +1,170 @@
+"""memory_db: result cache, STM access counting, bulk import and embedding reloads."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "execution"))
+
+import memory_db  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "memory.db"
+    conn = memory_db.get_db(path)
+    memory_db.init_db(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = memory_db.get_db(db_path)
+    yield conn
+    conn.close()
+
+
+def test_search_cache_hits_until_a_write(conn):
+    """Repeated searches come from the cache; a write to a searched table invalidates it."""
+    memory_db.add_fact(conn, "the billing API rate limit is 100 per minute")
+    first = memory_db.search(conn, "rate limit")
+    hits = memory_db._CACHE_STATS["result_hits"]
+    assert memory_db.search(conn, "rate limit") == first
+    assert memory_db._CACHE_STATS["result_hits"] == hits + 1
+
+    memory_db.add_fact(conn, "the search API rate limit is 10 per second")
+    assert len(memory_db.search(conn, "rate limit")) == len(first) + 1
+
+
+def test_search_cache_sees_other_connections(conn, db_path):
+    """A commit from another connection (PRAGMA data_version) invalidates cached results."""
+    memory_db.add_fact(conn, "deploys happen on tuesday")
+    before = memory_db.search(conn, "deploys")
+
+    other = memory_db.get_db(db_path)
+    other.execute("INSERT INTO facts (content) VALUES ('deploys are frozen in december')")
+    other.commit()
+    other.close()
+
+    after = memory_db.search(conn, "deploys")
+    assert len(after) == len(before) + 1
+
+
+def test_stm_access_count_across_flushes(conn, monkeypatch):
+    """stm_get reports every access, including the one that triggered a flush."""
+    monkeypatch.setattr(memory_db, "STM_ACCESS_FLUSH_COUNT", 3)
+    memory_db.stm_set(conn, "task", "write tests")
+
+    counts = [memory_db.stm_get(conn, "task")["access_count"] for _ in range(7)]
+    assert counts == [1, 2, 3, 4, 5, 6, 7]
+
+    stored = conn.execute("SELECT access_count FROM short_term WHERE key = 'task'").fetchone()[0]
+    assert stored == 6  # Two flushes of three; the seventh is still queued
+    assert memory_db.stm_show(conn)[0]["access_count"] == 7
+
+    memory_db.stm_flush_access(conn)
+    stored = conn.execute("SELECT access_count FROM short_term WHERE key = 'task'").fetchone()[0]
+    assert stored == 7
+
+
+def test_stm_set_resets_access_count(conn):
+    """Accesses still queued for the old value are not carried over to the new one."""
+    memory_db.stm_set(conn, "task", "one")
+    memory_db.stm_get(conn, "task")
+    memory_db.stm_set(conn, "task", "two")
+    assert memory_db.stm_get(conn, "task")["access_count"] == 1
+
+    memory_db.stm_flush_access(conn)
+    stored = conn.execute("SELECT access_count FROM short_term WHERE key = 'task'").fetchone()[0]
+    assert stored == 1
+
+
+def test_stm_clear_all_drops_queued_accesses(conn):
+    memory_db.stm_set(conn, "task", "one")
+    memory_db.stm_get(conn, "task")
+    memory_db.stm_get(conn, "task")
+    memory_db.stm_clear(conn, clear_all=True)
+    memory_db.stm_set(conn, "task", "two")
+    assert memory_db.stm_get(conn, "task")["access_count"] == 1
+
+
+def test_stm_expiry_drops_queued_accesses(conn):
+    memory_db.stm_set(conn, "task", "one", ttl_seconds=60)
+    memory_db.stm_get(conn, "task")
+    conn.execute("UPDATE short_term SET expires_at = '2000-01-01T00:00:00' WHERE key = 'task'")
+    conn.commit()
+    memory_db.stm_clear(conn)  # Forced expiry
+    conn.execute("INSERT INTO short_term (key, value, access_count) VALUES ('task', 'two', 0)")
+    conn.commit()
+    memory_db.stm_flush_access(conn)
+    assert conn.execute("SELECT access_count FROM short_term WHERE key = 'task'").fetchone()[0] == 0
+
+
+def test_consolidate_stm_counts_queued_accesses(conn):
+    """Queued accesses count towards promotion and are not flushed into a later row."""
+    memory_db.stm_set(conn, "hot", "read twice")
+    memory_db.stm_get(conn, "hot")
+    memory_db.stm_get(conn, "hot")
+    conn.execute("UPDATE short_term SET created_at = '2000-01-01 00:00:00'")
+    conn.commit()
+
+    assert memory_db.consolidate_stm(conn) == {"promoted": 1, "discarded": 0}
+    memory_db.stm_set(conn, "hot", "new value")
+    assert memory_db.stm_get(conn, "hot")["access_count"] == 1
+
+
+def _trigger_names(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def test_bulk_insert_defer_fts(conn):
+    """Deferred FTS: triggers come back and the rebuilt index finds the imported rows."""
+    triggers = _trigger_names(conn)
+    rows = [("facts", {"content": f"imported fact number {i}", "category": "bulk"}) for i in range(25)]
+    rows.append(("profile", {"key": "timezone", "value": "Europe/Berlin", "category": "prefs"}))
+
+    stats = memory_db.bulk_insert(conn, rows, batch_size=10, defer_fts=True, progress=False)
+
+    assert stats["rows"] == 26
+    assert stats["tables"] == {"facts": 25, "profile": 1}
+    assert _trigger_names(conn) == triggers
+    assert len(memory_db.search(conn, "imported", type_filter="facts", limit=50)) == 25
+    assert len(memory_db.search(conn, "Berlin", type_filter="profile")) == 1
+
+    memory_db.add_fact(conn, "added after the import")  # Restored triggers keep FTS in sync
+    assert len(memory_db.search(conn, "after the import", type_filter="facts")) == 1
+
+
+def test_bulk_insert_defer_fts_survives_concurrent_init_db(conn, db_path):
+    """Triggers recreated by another connection's init_db mid-import don't abort the restore."""
+    def rows():
+        yield "facts", {"content": "before the reinit"}
+        memory_db.init_db(memory_db.get_db(db_path))
+        yield "facts", {"content": "after the reinit"}
+
+    memory_db.bulk_insert(conn, rows(), batch_size=1, defer_fts=True, progress=False)
+    assert len(memory_db.search(conn, "reinit", type_filter="facts")) == 2
+
+
+def test_embedding_matrix_reloads_on_external_reembed(conn, db_path):
+    """Re-embedding an existing row from another connection reaches the in-memory matrix."""
+    np = pytest.importorskip("numpy")
+    vec = lambda x: np.array([x, 1, 0, 0], dtype=np.float32).tobytes()
+    memory_db._embed_store_many(conn, "facts", [("1", "h1", vec(1)), ("2", "h2", vec(2))])
+    conn.commit()
+    matrix = memory_db._get_embedding_matrix(conn)
+
+    memory_db._embed_store_many(conn, "facts", [("3", "h3", vec(3))])  # Local write: no reload needed
+    conn.commit()
+    generation = matrix._generation
+    matrix.refresh(conn)
+    assert matrix.size == 3 and matrix._generation == generation
+
+    other = memory_db.get_db(db_path)
+    memory_db._embed_store_many(other, "facts", [("1", "h1b", vec(9))])  # Same row, same second
+    other.commit()
+    other.close()
+
+    matrix.refresh(conn)
+    assert matrix._vecs[matrix._rows[("facts", "1")]][0] == 9
@@ -0,0 +1,140 @@
+"""transcribe_audio: chunk stitching and checkpoint resume."""
+import json
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "execution"))
+
+import transcribe_audio as ta  # noqa: E402
+
+
+def _seg(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+def _assert_monotonic(segments):
+    prev_end = 0.0
+    for seg in segments:
+        assert prev_end <= seg["start"] <= seg["end"]
+        prev_end = seg["end"]
+
+
+def test_stitch_segment_straddling_a_boundary():
+    """Slices at 0s and 10s with 2s overlap: the cut is at 11s."""
+    slices = [{"offset": 0.0}, {"offset": 10.0}]
+    chunks = [
+        [_seg(0.0, 5.0, "a"), _seg(5.0, 11.8, "b runs past the cut")],
+        [_seg(10.0, 10.9, "b again"),        # Midpoint before the cut: chunk 0's side
+         _seg(11.2, 11.7, "end of b again"),  # Past the cut, but inside chunk 0's last segment
+         _seg(11.7, 15.0, "c")],
+    ]
+    stitched = ta.stitch_chunk_segments(chunks, slices, overlap_seconds=2.0)
+    assert [seg["text"] for seg in stitched] == ["a", "b runs past the cut", "c"]
+    assert stitched[2]["start"] == 11.8  # Clamped to the previous end
+    _assert_monotonic(stitched)
+
+
+def test_stitch_keeps_exact_offsets():
+    slices = [{"offset": 0.0}, {"offset": 30.0}]
+    chunks = [[_seg(1.25, 29.5, "x")], [_seg(32.5, 40.0, "y")]]
+    stitched = ta.stitch_chunk_segments(chunks, slices, overlap_seconds=2.0)
+    assert [(seg["start"], seg["end"]) for seg in stitched] == [(1.25, 29.5), (32.5, 40.0)]
+
+
+def test_stitch_empty_chunk():
+    slices = [{"offset": 0.0}, {"offset": 10.0}, {"offset": 20.0}]
+    chunks = [[_seg(0.0, 9.0, "first")], [], [_seg(21.5, 25.0, "third")]]
+    stitched = ta.stitch_chunk_segments(chunks, slices, overlap_seconds=2.0)
+    assert [seg["text"] for seg in stitched] == ["first", "third"]
+    assert ta.stitch_chunk_segments([[], []], slices[:2], overlap_seconds=2.0) == []
+
+
+def test_stitch_output_is_monotonic():
+    rng = random.Random(7)
+    slices = [{"offset": 10.0 * i} for i in range(6)]
+    chunks = []
+    for i in range(len(slices)):
+        t, segments = 10.0 * i, []
+        while t < 10.0 * i + 12.0:  # Each chunk runs 2s into the next slice
+            end = t + rng.uniform(0.2, 4.0)
+            segments.append(_seg(round(t, 2), round(end, 2), f"{i}:{t:.1f}"))
+            t = end + rng.uniform(-0.5, 0.5)
+        chunks.append(segments)
+    _assert_monotonic(ta.stitch_chunk_segments(chunks, slices, overlap_seconds=2.0))
+
+
+def test_plan_windows_covers_the_tail_with_the_overlap():
+    assert ta.plan_windows(25.0, 10.0, 2.0) == [(0, 0.0, 12.0), (1, 10.0, 12.0), (2, 20.0, 5.0)]
+    assert ta.plan_windows(21.0, 10.0, 2.0) == [(0, 0.0, 12.0), (1, 10.0, 11.0)]
+
+
+def test_load_checkpoint_torn_header_starts_over(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    path.write_text('{"header": {"size": 1', encoding="utf-8")
+    assert ta._load_checkpoint(path, {"size": 1}) == {}
+
+
+def _fake_window(audio_path, index, start, duration, language=None, prompt=None):
+    return {"window": index, "offset": start, "language": "en", "text": f"w{index}",
+            "segments": [{"start": start + 1.0, "end": start + 5.0, "text": f"w{index}"}]}
+
+
+def test_resume_from_partial_checkpoint(tmp_path, monkeypatch):
+    """Windows in the checkpoint are reused; a torn last line and missing windows are redone."""
+    audio = tmp_path / "talk.wav"
+    audio.write_bytes(b"\0" * 100)
+    duration, window, overlap = 35.0, 10.0, 2.0
+    monkeypatch.setattr(ta, "get_audio_duration", lambda path: duration)
+    monkeypatch.setattr(ta, "_get_local_pool", lambda *a: ThreadPoolExecutor(1))
+
+    windows = ta.plan_windows(duration, window, overlap)
+    assert len(windows) == 4
+    header = {"size": 100, "duration": duration, "model": "base", "language": None,
+              "window": window, "overlap": overlap}
+    checkpoint = tmp_path / "talk.checkpoint.jsonl"
+    done = [_fake_window(str(audio), i, start, length) for i, start, length in windows[:2]]
+    checkpoint.write_text(
+        "\n".join([json.dumps({"header": header})] + [json.dumps(r) for r in done]) + '\n{"window": 2, "te',
+        encoding="utf-8",
+    )
+    assert sorted(ta._load_checkpoint(checkpoint, header)) == [0, 1]
+
+    calls = []
+
+    def window_fn(audio_path, index, *args):
+        calls.append(index)
+        return _fake_window(audio_path, index, *args)
+
+    monkeypatch.setattr(ta, "_transcribe_window", window_fn)
+    result = ta.transcribe_local_chunked(str(audio), "base", "cpu", workers=1, window_seconds=window,
+                                         overlap_seconds=overlap, checkpoint_path=str(checkpoint))
+    assert sorted(calls) == [2, 3]
+    assert result["text"] == "w0 w1 w2 w3"
+    assert not checkpoint.exists()
+
+
+def test_interrupted_resume_keeps_a_loadable_checkpoint(tmp_path, monkeypatch):
+    """A resume that is itself interrupted leaves every finished window readable."""
+    audio = tmp_path / "talk.wav"
+    audio.write_bytes(b"\0" * 100)
+    monkeypatch.setattr(ta, "get_audio_duration", lambda path: 35.0)
+    monkeypatch.setattr(ta, "_get_local_pool", lambda *a: ThreadPoolExecutor(1))
+    header = {"size": 100, "duration": 35.0, "model": "base", "language": None, "window": 10.0, "overlap": 2.0}
+    checkpoint = tmp_path / "talk.checkpoint.jsonl"
+    checkpoint.write_text(json.dumps({"header": header}) + "\n" + json.dumps(_fake_window("", 0, 0.0, 12.0))
+                          + '\n{"window": 1', encoding="utf-8")
+
+    def window_fn(audio_path, index, *args):
+        if index == 3:
+            raise KeyboardInterrupt
+        return _fake_window(audio_path, index, *args)
+
+    monkeypatch.setattr(ta, "_transcribe_window", window_fn)
+    try:
+        ta.transcribe_local_chunked(str(audio), "base", "cpu", workers=1, window_seconds=10.0,
+                                    overlap_seconds=2.0, checkpoint_path=str(checkpoint))
+    except KeyboardInterrupt:
+        pass
+    assert sorted(ta._load_checkpoint(checkpoint, header)) == [0, 1, 2]
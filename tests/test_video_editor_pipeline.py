@@ -0,0 +1,31 @@
+"""video_editor_pipeline: batch output naming."""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "execution"))
+
+import video_editor_pipeline as vep  # noqa: E402
+
+
+def test_unique_output_path_skips_planned_and_existing(tmp_path):
+    (tmp_path / "intro.mp4").touch()
+    taken = {str(tmp_path / "intro_2.mp4")}
+    assert vep.unique_output_path(str(tmp_path / "intro.mp4"), taken) == str(tmp_path / "intro_3.mp4")
+    assert vep.unique_output_path(str(tmp_path / "other.mp4"), taken) == str(tmp_path / "other.mp4")
+
+
+def test_batch_clips_with_the_same_smart_name_get_distinct_outputs(tmp_path, monkeypatch):
+    """Two clips that open with the same sentence must not share an output path."""
+    monkeypatch.setattr(vep, "get_duration", lambda path: 10.0)
+    monkeypatch.setattr(vep, "extract_audio", lambda src, dst: None)
+    monkeypatch.setattr(vep, "transcribe_video", lambda audio, model: {"text": "hey guys welcome back"})
+    monkeypatch.setattr(vep, "generate_smart_filename", lambda text: "hey-guys-welcome-back")
+    monkeypatch.setattr(vep, "get_speech_timestamps_silero", lambda *a, **k: [])  # Stop after naming
+    args = argparse.Namespace(output_dir=str(tmp_path), no_transcribe=False, whisper_model="base",
+                              min_speech=0.25, min_silence=0.5)
+
+    taken = set()
+    vep.analyze_clip("a.mp4", args, taken=taken)
+    vep.analyze_clip("b.mp4", args, taken=taken)
+    assert taken == {str(tmp_path / "hey-guys-welcome-back.mp4"), str(tmp_path / "hey-guys-welcome-back_2.mp4")}
@@ -0,0 +1,122 @@
+"""modal_webhook YouTube outliers: parallel search, batched transcripts, summary cache."""
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("modal")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "execution"))
+
+import modal_webhook  # noqa: E402
+
+
+class FakeApify:
+    """Stand-in ApifyClient: search runs finish in random order; transcript runs are counted."""
+
+    def __init__(self):
+        self.calls = []
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def actor(self, name):
+        return SimpleNamespace(call=lambda run_input, timeout_secs: self._call(name, run_input))
+
+    def dataset(self, dataset_id):
+        return SimpleNamespace(iterate_items=lambda: iter(self._datasets[dataset_id]))
+
+    def _call(self, name, run_input):
+        with self._lock:
+            self.calls.append((name, run_input))
+            dataset_id = f"ds{len(self.calls)}"
+        if name == "streamers/youtube-scraper":
+            time.sleep(random.uniform(0, 0.05))
+            keyword = run_input["searchQueries"][0]
+            items = [{"id": f"{keyword}-{i}", "title": f"{keyword} video {i}", "viewCount": 100} for i in range(2)]
+        else:
+            items = [{"url": url, "captions": ["words", "from", url[-3:]]} for url in run_input["urls"]]
+        self._datasets[dataset_id] = items
+        return {"defaultDatasetId": dataset_id}
+
+    def runs(self, name):
+        return [run_input for actor, run_input in self.calls if actor == name]
+
+
+class FakeSheet:
+    def __init__(self, report_range=True):
+        self.rows = [["Score", "Title", "URL"]]
+        self.cells = {}
+        self.report_range = report_range
+
+    def append_rows(self, rows, value_input_option=None):
+        first = len(self.rows) + 1
+        self.rows.extend(rows)
+        if not self.report_range:
+            return {}
+        return {"updates": {"updatedRange": f"Sheet1!A{first}:I{len(self.rows)}"}}
+
+    def update(self, range_name, values):
+        self.cells[range_name] = values[0][0]
+
+    def batch_update(self, updates):
+        for update in updates:
+            self.update(update["range"], update["values"])
+
+    def col_values(self, col):
+        return [row[col - 1] for row in self.rows]
+
+
+class FakeClaude:
+    def __init__(self):
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, messages, **kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(text="summary of " + messages[0]["content"][-200:])])
+
+
+@pytest.fixture(autouse=True)
+def quiet_slack(monkeypatch):
+    monkeypatch.setattr(modal_webhook, "slack_notify", lambda *a, **k: None)
+
+
+def _outliers(n):
+    return [
+        {"video_id": f"vid{i:03d}", "url": f"https://www.youtube.com/watch?v=vid{i:03d}",
+         "title": f"Video {i}", "outlier_score": n - i}
+        for i in range(n)
+    ]
+
+
+def test_search_keeps_keyword_order():
+    keywords = [f"kw{i}" for i in range(6)]
+    videos = modal_webhook.scrape_youtube_with_apify(keywords, 2, 7, apify_client=FakeApify())
+    assert [v["video_id"] for v in videos] == [f"{k}-{i}" for k in keywords for i in range(2)]
+
+
+def test_one_transcript_run_then_cached_summaries():
+    apify, claude, cache = FakeApify(), FakeClaude(), {}
+
+    ws = FakeSheet()
+    stats = modal_webhook.summarize_outliers_to_sheet(_outliers(4), ws, apify, claude, cache)
+    assert stats == {"cached": 0, "summarized": 4, "no_transcript": 0}
+    transcript_runs = apify.runs("karamelo/youtube-transcripts")
+    assert len(transcript_runs) == 1 and len(transcript_runs[0]["urls"]) == 4
+    assert all(ws.cells[f"H{row}"].startswith("summary of") for row in range(2, 6))
+    assert set(cache) == {f"vid{i:03d}" for i in range(4)}
+
+    ws = FakeSheet()
+    stats = modal_webhook.summarize_outliers_to_sheet(_outliers(4), ws, apify, claude, cache)
+    assert stats == {"cached": 4, "summarized": 0, "no_transcript": 0}
+    assert len(apify.runs("karamelo/youtube-transcripts")) == 1
+    assert all(row[7].startswith("summary of") for row in ws.rows[1:])
+
+
+def test_summaries_written_without_updated_range():
+    """No updatedRange in the append response: summaries still land, in one final batch."""
+    ws = FakeSheet(report_range=False)
+    modal_webhook.summarize_outliers_to_sheet(_outliers(3), ws, FakeApify(), FakeClaude(), {})
+    assert sorted(ws.cells) == ["H2", "H3", "H4"]
+    assert all(value.startswith("summary of") for value in ws.cells.values())